@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Concurrent Page Fetcher for MitreShiled
+Fetches many technique pages with asyncio using bounded concurrency,
+a per-host in-flight limit and per-task retries; request pacing comes
+from the adaptive per-host rate limiter in the shared HTTP client
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+
+from http_client import RETRY_STATUS_CODES, pooled_get, retry_delay
+from rate_limiter import CircuitOpenError
+from run_metrics import record_retry
+
+
+class HostBudget:
+    """Politeness budget for a single host: max in-flight requests (pacing is the rate limiter's job)"""
+
+    def __init__(self, max_in_flight=4):
+        self.semaphore = asyncio.Semaphore(max_in_flight)
+
+    async def __aenter__(self):
+        await self.semaphore.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.semaphore.release()
+
+
+async def _fetch_one(key, url, parse, budgets, global_limit, options, stats):
+    """Fetch and parse a single page, retrying with non-blocking backoff"""
+    host = urlparse(url).netloc
+    if host not in budgets:
+        budgets[host] = HostBudget(options['per_host_limit'])
+    budget = budgets[host]
+    max_retries = options['max_retries']
+
+    for attempt in range(max_retries):
+        response = None
+        try:
+            async with global_limit, budget:
+                # One attempt per call; backoff happens here without holding a worker thread
+                response = await asyncio.to_thread(
+                    pooled_get, url, headers=options['headers'], timeout=options['timeout'], max_retries=1
+                )
+            stats['requests'] += 1
+            if response.status_code not in RETRY_STATUS_CODES:
+                response.raise_for_status()
+                break
+            print(f"⚠️ Attempt {attempt + 1}/{max_retries} for {key}: HTTP {response.status_code}")
+        except CircuitOpenError as e:
+            # The host keeps failing; leave this key for a later retry-failed pass
+            print(f"❌ Skipping {key}: {e}")
+            return key, ""
+        except requests.HTTPError as e:
+            # Non-retryable status such as 404
+            print(f"❌ Failed to fetch {key}: {e}")
+            return key, ""
+        except requests.RequestException as e:
+            print(f"⚠️ Attempt {attempt + 1}/{max_retries} failed for {key}: {e}")
+        except Exception as e:
+            print(f"❌ Error fetching {key}: {e}")
+            return key, ""
+
+        if attempt < max_retries - 1:
+            stats['retries'] += 1
+            record_retry()
+            delay = retry_delay(attempt, response, options['backoff_base'])
+            if delay:
+                await asyncio.sleep(delay)
+    else:
+        print(f"❌ Failed to fetch {key} after {max_retries} attempts")
+        return key, ""
+
+    if options['on_page']:
+        # A failing page hook (e.g. an archive write) is reported but does not cost the page
+        try:
+            await asyncio.to_thread(options['on_page'], key, response)
+        except Exception as e:
+            print(f"⚠️ Page hook failed for {key}: {e}")
+    try:
+        # Parse off the event loop so slow pages do not stall other tasks
+        return key, await asyncio.to_thread(parse, response.text)
+    except Exception as e:
+        print(f"❌ Error parsing {key}: {e}")
+        return key, ""
+
+
+async def fetch_all_async(keys, url_for, parse, concurrency=8, per_host_limit=4,
+                          max_retries=3, backoff_base=1.0, timeout=None, headers=None, progress=True, on_result=None,
+                          on_page=None):
+    """Fetch url_for(key) for every key concurrently and return {key: parse(html)} for non-empty results
+
+    on_page(key, response) sees every successful response before it is parsed (e.g. to archive it;
+    an exception there is reported and the page is still parsed);
+    on_result(key, value) is called as each page completes (value is empty on failure).
+    """
+    keys = list(keys)
+    options = {
+        'per_host_limit': per_host_limit,
+        'max_retries': max_retries,
+        'backoff_base': backoff_base,
+        'timeout': timeout,
+        'headers': headers,
+        'on_page': on_page,
+    }
+    stats = {'requests': 0, 'retries': 0}
+    budgets = {}
+    global_limit = asyncio.Semaphore(concurrency)
+
+    # Size the thread pool so blocking requests calls never cap concurrency below the limit
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=max(concurrency, 1))
+    loop.set_default_executor(executor)
+
+    results = {}
+    tasks = [
+        asyncio.create_task(_fetch_one(key, url_for(key), parse, budgets, global_limit, options, stats))
+        for key in keys
+    ]
+    try:
+        for done, task in enumerate(asyncio.as_completed(tasks), start=1):
+            key, value = await task
+            if value:
+                results[key] = value
+            if on_result:
+                on_result(key, value)
+            if progress:
+                size = f"{len(value)} chars" if isinstance(value, str) else "parsed"
+                status = f"✅ {size}" if value else "⚠️ empty"
+                print(f"📖 [{done}/{len(keys)}] {key}: {status}")
+    finally:
+        executor.shutdown(wait=False)
+
+    if progress:
+        print(f"📊 {stats['requests']} requests, {stats['retries']} retries, {len(results)}/{len(keys)} pages with content")
+    return results
+
+
+def fetch_all(keys, url_for, parse, **kwargs):
+    """Synchronous wrapper around fetch_all_async for use from the extraction scripts"""
+    return asyncio.run(fetch_all_async(keys, url_for, parse, **kwargs))
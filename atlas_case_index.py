@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+ATLAS Case-Study Index for MitreShiled
+Connects ATLAS case studies to the techniques their procedures use, so
+"which case studies use AML.T0043" and "which techniques appear together"
+are lookups instead of scans over every procedure step.
+
+The index holds the case-study x technique incidence (CSR arrays), an
+inverted index from technique ID to case-study IDs and a technique x
+technique co-occurrence matrix (how many case studies use both). It is
+built during ATLAS extraction and saved as a compact binary file; the
+co-occurrence matrix is a NumPy array when NumPy is installed (vectorized
+top-k queries) and a flat int32 array otherwise, with the same file format.
+
+Usage: python3 atlas_case_index.py <technique_id> [k]   (case studies and top-k related techniques)
+       python3 atlas_case_index.py                      (index summary)
+"""
+
+import heapq
+import os
+import pickle
+import sys
+from array import array
+
+from mitreshire_output import atomic_write
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+INDEX_PATH = os.environ.get('MITRE_ATLAS_CASE_INDEX', 'mitreshire_ai_case_index.pickle')
+
+# Bump when the saved layout changes so old index files are rebuilt
+INDEX_VERSION = 1
+
+
+def procedure_techniques(case_study):
+    """Distinct technique IDs a case study's procedure uses, in first-use order"""
+    seen = {}
+    for step in case_study.get('procedure') or []:
+        technique_id = step.get('technique') if isinstance(step, dict) else None
+        if isinstance(technique_id, str) and technique_id:
+            seen.setdefault(technique_id, None)
+    return list(seen)
+
+
+class CaseStudyIndex:
+    """Inverted case-study index and co-occurrence matrix over ATLAS techniques"""
+
+    def __init__(self, technique_ids, case_study_ids, indptr, indices, cooccurrence):
+        self.technique_ids = list(technique_ids)
+        self.case_study_ids = list(case_study_ids)
+        self._indptr = indptr
+        self._indices = indices
+        self._matrix = cooccurrence
+        self._position = {technique_id: i for i, technique_id in enumerate(self.technique_ids)}
+        self._row = {case_study_id: row for row, case_study_id in enumerate(self.case_study_ids)}
+
+        # Inverted index, rebuilt from the incidence in one pass over its entries
+        using = [[] for _ in self.technique_ids]
+        for row, case_study_id in enumerate(self.case_study_ids):
+            for column in indices[indptr[row]:indptr[row + 1]]:
+                using[column].append(case_study_id)
+        self._case_studies = {technique_id: tuple(using[i]) for i, technique_id in enumerate(self.technique_ids)}
+
+    @classmethod
+    def build(cls, case_studies, technique_ids=()):
+        """Index case studies; technique_ids (e.g. the matrix's techniques) come first, in their order"""
+        position = {}
+        for technique_id in technique_ids:
+            position.setdefault(technique_id, len(position))
+
+        case_study_ids, indptr, indices = [], array('i', [0]), array('i')
+        for case_study in case_studies:
+            case_study_ids.append(case_study.get('id', ''))
+            for technique_id in procedure_techniques(case_study):
+                indices.append(position.setdefault(technique_id, len(position)))
+            indptr.append(len(indices))
+
+        size = len(position)
+        if numpy is not None:
+            rows = numpy.repeat(numpy.arange(len(case_study_ids)), numpy.diff(numpy.asarray(indptr)))
+            incidence = numpy.zeros((len(case_study_ids), size), dtype=numpy.int32)
+            incidence[rows, numpy.asarray(indices)] = 1
+            matrix = incidence.T @ incidence
+        else:
+            matrix = array('i', bytes(4 * size * size))
+            for row in range(len(case_study_ids)):
+                columns = indices[indptr[row]:indptr[row + 1]]
+                for a in columns:
+                    for b in columns:
+                        matrix[a * size + b] += 1
+        return cls(position, case_study_ids, indptr, indices, matrix)
+
+    def case_studies_for(self, technique_id):
+        """IDs of the case studies whose procedure uses technique_id"""
+        return self._case_studies.get(technique_id, ())
+
+    def techniques_for(self, case_study_id):
+        """Technique IDs a case study uses"""
+        row = self._row.get(case_study_id)
+        if row is None:
+            return ()
+        return tuple(self.technique_ids[i] for i in self._indices[self._indptr[row]:self._indptr[row + 1]])
+
+    def cooccurrence(self, technique_a, technique_b):
+        """Number of case studies using both techniques"""
+        a, b = self._position.get(technique_a), self._position.get(technique_b)
+        if a is None or b is None:
+            return 0
+        if numpy is not None:
+            return int(self._matrix[a, b])
+        return self._matrix[a * len(self.technique_ids) + b]
+
+    def related_techniques(self, technique_id, k=10):
+        """The k techniques most often used in the same case studies: [(technique_id, count)]"""
+        i = self._position.get(technique_id)
+        size = len(self.technique_ids)
+        k = min(k, size - 1)
+        if i is None or k <= 0:
+            return []
+        if numpy is not None:
+            row = self._matrix[i].copy()
+            row[i] = 0
+            top = numpy.argpartition(-row, k - 1)[:k]
+            # Highest count first, ties in index order
+            top = top[numpy.lexsort((top, -row[top]))]
+            return [(self.technique_ids[j], int(row[j])) for j in top if row[j] > 0]
+        row = self._matrix[i * size:(i + 1) * size]
+        top = heapq.nsmallest(k, (j for j in range(size) if j != i and row[j] > 0), key=lambda j: (-row[j], j))
+        return [(self.technique_ids[j], row[j]) for j in top]
+
+    def most_used(self, k=10):
+        """The k techniques used by the most case studies: [(technique_id, case-study count)]"""
+        counts = ((technique_id, len(ids)) for technique_id, ids in self._case_studies.items() if ids)
+        return heapq.nlargest(k, counts, key=lambda item: item[1])
+
+    def save(self, path=INDEX_PATH):
+        """Write the index as arrays of machine integers (loads without rebuilding the matrix)"""
+        state = {
+            'version': INDEX_VERSION,
+            'technique_ids': self.technique_ids,
+            'case_study_ids': self.case_study_ids,
+            'indptr': bytes(array('i', self._indptr)),
+            'indices': bytes(array('i', self._indices)),
+            'cooccurrence': self._matrix.astype(numpy.int32).tobytes() if numpy is not None else self._matrix.tobytes(),
+        }
+        with atomic_write(path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        """Load a saved index; returns None if it is missing, unreadable or from an older layout"""
+        try:
+            with open(path, 'rb') as f:
+                state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        if not isinstance(state, dict) or state.get('version') != INDEX_VERSION:
+            return None
+
+        indptr, indices = array('i'), array('i')
+        indptr.frombytes(state['indptr'])
+        indices.frombytes(state['indices'])
+        size = len(state['technique_ids'])
+        if numpy is not None:
+            matrix = numpy.frombuffer(state['cooccurrence'], dtype=numpy.int32).reshape(size, size)
+        else:
+            matrix = array('i')
+            matrix.frombytes(state['cooccurrence'])
+        return cls(state['technique_ids'], state['case_study_ids'], indptr, indices, matrix)
+
+    def summary(self):
+        used = sum(1 for ids in self._case_studies.values() if ids)
+        return (f"🔗 Case-study index: {len(self.case_study_ids)} case studies, "
+                f"{used}/{len(self.technique_ids)} techniques used, {len(self._indices)} links "
+                f"({'NumPy' if numpy is not None else 'pure-Python'} co-occurrence)")
+
+
+def main():
+    index = CaseStudyIndex.load()
+    if index is None:
+        print(f"❌ No case-study index at {INDEX_PATH}; run atlas_data_extractor.py first")
+        sys.exit(1)
+    print(index.summary())
+    if len(sys.argv) < 2:
+        for technique_id, count in index.most_used():
+            print(f"  {technique_id}: {count} case studies")
+        return
+
+    technique_id = sys.argv[1]
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    case_studies = index.case_studies_for(technique_id)
+    print(f"\n📚 {technique_id} is used in {len(case_studies)} case studies:")
+    for case_study_id in case_studies:
+        print(f"  {case_study_id}")
+    print(f"\n🔗 Techniques most often used with {technique_id}:")
+    for related_id, count in index.related_techniques(technique_id, k):
+        print(f"  {related_id}: {count} case studies")
+
+
+if __name__ == "__main__":
+    main()
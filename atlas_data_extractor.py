@@ -2,7 +2,9 @@
 """
 ATLAS Framework Data Extractor for MitreShiled
 Extracts tactics, techniques, and case studies from the ATLAS (Adversarial Threat Landscape for Artificial-Intelligence Systems) framework
-Fetches data directly from the ATLAS GitHub data repository YAML file
+Fetches data directly from the ATLAS GitHub data repository YAML file and saves
+the techniques as mitreshire_ai_techniques.json / mitreshire_ai_tactics.json,
+with a content hash per record so a re-sync only reports changed techniques
 Based on https://github.com/mitre-atlas/atlas-data
 """
 
@@ -10,24 +12,27 @@ import requests
 import json
 import sys
 from datetime import datetime
-import urllib3
-import yaml
+from atlas_case_index import INDEX_PATH, CaseStudyIndex
+from atlas_tactics_techniques import TacticResolver
+from atlas_yaml import YAMLError, load_yaml, print_yaml_stats
+from http_cache import print_cache_stats
+from http_client import pooled_get
+from mitreshire_output import output_filename, write_json_atomic, write_records
+from record_fingerprint import RecordFingerprinter, manifest_filename, previous_fingerprints
+from technique_delta import changes_filename
+from technique_record import json_default
 
-# Disable SSL warnings for development/testing
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+# ATLAS techniques are saved as the 'ai' platform of the mitreshire files
+ATLAS_PLATFORM = 'ai'
 
 def fetch_atlas_data():
     """Fetch the ATLAS framework data from GitHub repository"""
     url = "https://raw.githubusercontent.com/mitre-atlas/atlas-data/main/dist/ATLAS.yaml"
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
     print(f"🔍 Fetching ATLAS data from {url}")
     
     try:
-        response = requests.get(url, headers=headers, timeout=30, verify=False)
+        response = pooled_get(url)
         response.raise_for_status()
         return response.text
     except requests.RequestException as e:
@@ -40,7 +45,7 @@ def parse_atlas_yaml(yaml_content):
     print(f"🔍 Parsing ATLAS YAML data...")
     
     try:
-        data = yaml.safe_load(yaml_content)
+        data = load_yaml(yaml_content)
         
         if not data:
             print("❌ Failed to parse YAML data")
@@ -56,6 +61,7 @@ def parse_atlas_yaml(yaml_content):
         matrices = data.get('matrices', [])
         print(f"  - Matrices: {len(matrices)}")
         
+        extraction_date = datetime.now().isoformat()
         techniques_data = []
         tactics_data = []
         case_studies_data = data.get('case-studies', [])
@@ -78,44 +84,77 @@ def parse_atlas_yaml(yaml_content):
                 }
                 tactics_data.append(tactic_data)
             
-            # Extract techniques
+            # Extract techniques in the mitreshire record shape (tactic names, parent links)
             matrix_techniques = matrix.get('techniques', [])
             print(f"  🎯 Techniques: {len(matrix_techniques)}")
             
+            resolver = TacticResolver(matrix_tactics)
+            tactic_names = {tactic.get('id', ''): tactic.get('name', '') for tactic in matrix_tactics}
+            techniques_by_id = {technique.get('id', ''): technique for technique in matrix_techniques}
+            parent_records = {}
+            matrix_records = []
+            
             for technique in matrix_techniques:
+                tech_id = technique.get('id', '')
+                # AML.T0043.001 is a sub-technique of AML.T0043
+                parent_id = technique.get('subtechnique-of') or (tech_id.rsplit('.', 1)[0] if tech_id.count('.') > 1 else '')
+                parent = techniques_by_id.get(parent_id, {})
+                
+                # Sub-techniques usually inherit their parent's tactics
+                tactic_ids = []
+                for tactic_ref in technique.get('tactics') or parent.get('tactics') or []:
+                    if isinstance(tactic_ref, dict):
+                        tactic_ref = tactic_ref.get('id', '')
+                    tactic_id = resolver.resolve(str(tactic_ref), tech_id)
+                    if tactic_id and tactic_id not in tactic_ids:
+                        tactic_ids.append(tactic_id)
+                tactics = [tactic_names[tactic_id] for tactic_id in tactic_ids]
+                
                 technique_data = {
-                    'technique_id': technique.get('id', ''),
+                    'technique_id': tech_id,
                     'name': technique.get('name', ''),
-                    'description': technique.get('description', ''),
-                    'tactics': [tactic.get('id', '') for tactic in technique.get('tactics', [])],
-                    'platforms': technique.get('platforms', []),
+                    'description': (technique.get('description') or '').strip(),
+                    'tactic': tactics[0] if tactics else '',
+                    'tactics': tactics,
+                    'platforms': ['AI'],
                     'data_sources': technique.get('data_sources', []),
-                    'is_subtechnique': '.' in technique.get('id', ''),
-                    'matrix': matrix_id,
-                    'framework': 'ATLAS',
+                    'is_subtechnique': bool(parent_id),
+                    'parent_technique': parent.get('name', ''),
+                    'parent_technique_id': parent_id,
+                    'mitre_version': '1.0',
                     'sync_source': 'atlas_yaml_extractor',
-                    'last_updated': datetime.now().isoformat()
+                    'last_updated': extraction_date,
+                    'tactic_ids': tactic_ids,
+                    'matrix': matrix_id,
+                    'framework': 'ATLAS'
                 }
+                if not parent_id:
+                    technique_data['subtechniques'] = []
+                    parent_records[tech_id] = technique_data
                 
-                # Handle sub-techniques
-                if technique_data['is_subtechnique']:
-                    parent_id = technique_data['technique_id'].split('.')[0]
-                    technique_data['parent_technique_id'] = parent_id
-                else:
-                    technique_data['parent_technique_id'] = ''
-                
-                techniques_data.append(technique_data)
+                matrix_records.append(technique_data)
+            
+            for technique_data in matrix_records:
+                parent_record = parent_records.get(technique_data['parent_technique_id'])
+                if parent_record is not None:
+                    parent_record['subtechniques'].append({'id': technique_data['technique_id'],
+                                                           'name': technique_data['name']})
+            techniques_data.extend(matrix_records)
+            resolver.report_unresolved()
         
         print(f"\n📚 Case Studies: {len(case_studies_data)}")
+        case_study_index = CaseStudyIndex.build(case_studies_data, [t['technique_id'] for t in techniques_data])
+        print(f"  {case_study_index.summary()}")
         
         return {
             'platform': 'ATLAS',
             'framework': 'ATLAS',
             'version': data.get('version', 'Unknown'),
-            'extraction_date': datetime.now().isoformat(),
+            'extraction_date': extraction_date,
             'tactics': tactics_data,
             'techniques': techniques_data,
             'case_studies': case_studies_data,
+            'case_study_index': case_study_index,
             'summary': {
                 'total_matrices': len(matrices),
                 'total_tactics': len(tactics_data),
@@ -126,13 +165,99 @@ def parse_atlas_yaml(yaml_content):
             }
         }
         
-    except yaml.YAMLError as e:
+    except YAMLError as e:
         print(f"❌ Error parsing YAML: {e}")
         return None
     except Exception as e:
         print(f"❌ Error processing data: {e}")
         return None
 
+def load_previous_summary(platform=ATLAS_PLATFORM):
+    """The tactics summary written by the previous sync (its ATLAS version and extraction date), or {}"""
+    try:
+        with open(f"mitreshire_{platform}_tactics.json", 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def same_summary(previous, current):
+    """Whether two tactics summaries differ at most in their extraction date"""
+    def canonical(summary):
+        return json.dumps({**summary, 'extraction_date': None}, sort_keys=True, default=json_default)
+    return canonical(previous) == canonical(current)
+
+def save_atlas_data(data, output_format="json", compression=None, platform=ATLAS_PLATFORM):
+    """Save ATLAS techniques and tactics in MitreShiled format, plus the techniques changed since the last sync
+    
+    Every record carries a content hash (see record_fingerprint.py); records
+    whose hash is unchanged keep their previous last_updated, and only added
+    or changed records go to mitreshire_ai_changed_techniques.json. A re-sync
+    that changes nothing keeps the previous extraction date, so every output
+    file is byte-identical to the last sync.
+    """
+    techniques_filename = output_filename(platform, 'techniques', output_format, compression)
+    changed_filename = output_filename(platform, 'changed_techniques', output_format, compression)
+    tactics_filename = f"mitreshire_{platform}_tactics.json"
+    
+    try:
+        previous_summary = load_previous_summary(platform)
+        previous_version = previous_summary.get('version')
+        fingerprinter = RecordFingerprinter(previous_fingerprints(platform))
+        
+        write_records(techniques_filename, fingerprinter.stamp_all(data['techniques']))
+        fingerprinter.save_manifest(platform, techniques_filename)
+        changed_ids = set(fingerprinter.added) | set(fingerprinter.changed)
+        changed_count = write_records(changed_filename, (t for t in data['techniques'] if t['technique_id'] in changed_ids))
+        
+        tactics_summary = {
+            'platform': 'AI',
+            'framework': data['framework'],
+            'version': data['version'],
+            'extraction_date': data['extraction_date'],
+            'tactics': [{'id': tactic['id'], 'name': tactic['name'],
+                         'technique_count': len([t for t in data['techniques']
+                                                 if tactic['name'] in t['tactics'] and not t['is_subtechnique']])}
+                        for tactic in data['tactics']],
+            'summary': data['summary']
+        }
+        if (fingerprinter.previous and not (changed_ids or fingerprinter.removed())
+                and same_summary(previous_summary, tactics_summary)):
+            tactics_summary['extraction_date'] = previous_summary.get('extraction_date', data['extraction_date'])
+        write_json_atomic(tactics_filename, tactics_summary)
+        
+        write_json_atomic(changes_filename(platform), {
+            'platform': platform,
+            'framework': data['framework'],
+            'version': data['version'],
+            'previous_version': previous_version,
+            'extraction_date': tactics_summary['extraction_date'],
+            'summary': {
+                'added': len(fingerprinter.added),
+                'removed': len(fingerprinter.removed()),
+                'changed': len(fingerprinter.changed),
+                'unchanged': fingerprinter.unchanged
+            },
+            'added': fingerprinter.added,
+            'removed': fingerprinter.removed(),
+            'changed': fingerprinter.changed
+        })
+        
+        print(f"\n💾 Saved MitreShiled format (ATLAS {data['version']}):")
+        print(f"  📄 Techniques: {techniques_filename}")
+        print(f"  📄 Tactics Summary: {tactics_filename}")
+        if not fingerprinter.previous:
+            print(f"  🆕 First sync: {changed_count} techniques in {changed_filename}")
+        else:
+            version_note = f" (ATLAS {previous_version} → {data['version']})" if previous_version != data['version'] else ""
+            print(f"  🔁 Re-sync{version_note}: {fingerprinter.summary()}")
+            print(f"  📄 Changed techniques: {changed_filename} ({changed_count})")
+        print(f"  📄 Change manifest: {changes_filename(platform)}")
+        print(f"  📄 Record manifest: {manifest_filename(platform)}")
+        return True
+    except Exception as e:
+        print(f"❌ Error saving MitreShiled format: {e}")
+        return False
+
 def print_atlas_summary(data):
     """Print ATLAS extraction summary"""
     if not data:
@@ -172,6 +297,11 @@ def print_atlas_summary(data):
         
         if len(data['case_studies']) > 5:
             print(f"  ... and {len(data['case_studies']) - 5} more case studies")
+        
+        print(f"\n🔗 Techniques used by the most case studies:")
+        for technique_id, count in data['case_study_index'].most_used(5):
+            related = ', '.join(related_id for related_id, _ in data['case_study_index'].related_techniques(technique_id, 3))
+            print(f"  {technique_id}: {count} case studies (often with {related or 'none'})")
     
     print("=" * 70)
 
@@ -179,6 +309,9 @@ def main():
     print("🚀 ATLAS Framework Data Extractor")
     print("=" * 50)
     
+    output_format = sys.argv[sys.argv.index('--output-format') + 1] if '--output-format' in sys.argv else "json"
+    compression = sys.argv[sys.argv.index('--compress') + 1] if '--compress' in sys.argv else None
+    
     # Fetch ATLAS data from GitHub
     yaml_content = fetch_atlas_data()
     if not yaml_content:
@@ -194,10 +327,22 @@ def main():
     # Print summary
     print_atlas_summary(data)
     
+    if not save_atlas_data(data, output_format, compression):
+        return False
+    
+    # Save the case-study index for instant lookups (atlas_case_index.py)
+    try:
+        data['case_study_index'].save(INDEX_PATH)
+        print(f"💾 Saved case-study index to {INDEX_PATH}")
+    except OSError as e:
+        print(f"⚠️ Could not save case-study index: {e}")
+    
     return True
 
 if __name__ == "__main__":
     success = main()
+    print_cache_stats()
+    print_yaml_stats()
     if success:
         print("\n✅ ATLAS extraction completed successfully!")
     else:
@@ -2,179 +2,89 @@
 """
 ATLAS Matrix Data Extractor
 Extracts ATLAS matrix data directly from GitHub repository source files
+(the whole data tree, case studies included, via atlas_repo)
 Source: https://github.com/mitre-atlas/atlas-data/tree/main/data
 """
 
-import requests
-import json
-import yaml
-import urllib3
+import os
+import sys
 from datetime import datetime
+from atlas_repo import ATLAS_DATA_DIR, ATLAS_REPO, CRAWL_CONCURRENCY, crawl_atlas_data
+from http_cache import print_cache_stats
 
-# Disable SSL warnings
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-def explore_github_directory(repo_url):
-    """Explore the GitHub data directory structure"""
-    api_url = repo_url.replace("github.com", "api.github.com/repos").replace("/tree/main", "/contents")
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept': 'application/vnd.github.v3+json'
-    }
-    
-    try:
-        response = requests.get(api_url, headers=headers, timeout=30, verify=False)
-        response.raise_for_status()
-        return response.json()
-    except requests.RequestException as e:
-        print(f"❌ Error exploring directory: {e}")
-        return None
-
-def fetch_file_content(download_url):
-    """Fetch content from a GitHub raw file URL"""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
-    try:
-        response = requests.get(download_url, headers=headers, timeout=30, verify=False)
-        response.raise_for_status()
-        return response.text
-    except requests.RequestException as e:
-        print(f"❌ Error fetching file: {e}")
-        return None
-
-def parse_yaml_file(content):
-    """Parse YAML content"""
-    try:
-        return yaml.safe_load(content)
-    except yaml.YAMLError as e:
-        print(f"❌ Error parsing YAML: {e}")
-        return None
+def categorize_file(path):
+    """Which kind of ATLAS data a file under the data directory holds"""
+    name = os.path.basename(path).lower()
+    if '/case-studies/' in path or 'case-stud' in name or 'case_stud' in name:
+        return 'case_studies'
+    if 'tactic' in name:
+        return 'tactics'
+    if 'technique' in name:
+        return 'techniques'
+    return 'other'
 
 def main():
     print("🚀 ATLAS Matrix Data Extractor")
     print("=" * 60)
     
-    # Explore the GitHub data directory
-    repo_url = "https://github.com/mitre-atlas/atlas-data/tree/main/data"
+    # List the whole data tree at once and crawl it
+    repo_url = f"https://github.com/{ATLAS_REPO}/tree/main/{ATLAS_DATA_DIR}"
     print(f"🔍 Exploring repository: {repo_url}")
     
-    directory_contents = explore_github_directory(repo_url)
+    concurrency = int(sys.argv[sys.argv.index('--concurrency') + 1]) if '--concurrency' in sys.argv else CRAWL_CONCURRENCY
+    crawl = crawl_atlas_data(concurrency=concurrency)
     
-    if not directory_contents:
+    if not crawl:
         print("❌ Failed to explore directory")
         return
     
-    print(f"✅ Found {len(directory_contents)} items in data directory")
+    files, documents, errors = crawl
+    print(f"✅ Found {len(files)} YAML files in data directory")
     
     # Categorize files
-    tactics_files = []
-    techniques_files = []
-    case_studies_files = []
-    other_files = []
+    categories = {'tactics': [], 'techniques': [], 'case_studies': [], 'other': []}
     
     print("\n📁 Directory Contents:")
     print("-" * 40)
     
-    for item in directory_contents:
-        name = item.get('name', '')
-        item_type = item.get('type', '')
-        download_url = item.get('download_url', '')
-        
-        print(f"  📄 {name} ({item_type})")
-        
-        if 'tactic' in name.lower():
-            tactics_files.append((name, download_url))
-        elif 'technique' in name.lower():
-            techniques_files.append((name, download_url))
-        elif 'case-stud' in name.lower() or 'case_stud' in name.lower():
-            case_studies_files.append((name, download_url))
-        else:
-            other_files.append((name, download_url))
+    for item in files:
+        path = item['path']
+        print(f"  📄 {path} ({item['size']} bytes)")
+        categories[categorize_file(path)].append(path)
     
     # Summary of file types
     print(f"\n📊 File Categories:")
-    print(f"  🎯 Tactics files: {len(tactics_files)}")
-    print(f"  🔧 Techniques files: {len(techniques_files)}")
-    print(f"  📚 Case studies files: {len(case_studies_files)}")
-    print(f"  📋 Other files: {len(other_files)}")
+    print(f"  🎯 Tactics files: {len(categories['tactics'])}")
+    print(f"  🔧 Techniques files: {len(categories['techniques'])}")
+    print(f"  📚 Case studies files: {len(categories['case_studies'])}")
+    print(f"  📋 Other files: {len(categories['other'])}")
     
     # Extract matrix data
-    all_tactics = []
-    all_techniques = []
-    all_case_studies = []
+    extracted = {'tactics': [], 'techniques': [], 'case_studies': []}
     
     print(f"\n🔄 Processing ATLAS Matrix Data...")
     print("-" * 40)
     
-    # Process tactics files
-    if tactics_files:
-        print(f"🎯 Processing {len(tactics_files)} tactics files...")
-        for name, url in tactics_files:
-            print(f"  📥 Fetching: {name}")
-            content = fetch_file_content(url)
-            if content:
-                data = parse_yaml_file(content)
-                if data:
-                    if isinstance(data, list):
-                        all_tactics.extend(data)
-                        print(f"    ✅ Loaded {len(data)} tactics from {name}")
-                    else:
-                        all_tactics.append(data)
-                        print(f"    ✅ Loaded tactic: {data.get('name', 'Unknown')}")
-    
-    # Process techniques files  
-    if techniques_files:
-        print(f"🔧 Processing {len(techniques_files)} techniques files...")
-        for name, url in techniques_files:
-            print(f"  📥 Fetching: {name}")
-            content = fetch_file_content(url)
-            if content:
-                data = parse_yaml_file(content)
-                if data:
-                    if isinstance(data, list):
-                        all_techniques.extend(data)
-                        print(f"    ✅ Loaded {len(data)} techniques from {name}")
-                    else:
-                        all_techniques.append(data)
-                        print(f"    ✅ Loaded technique: {data.get('name', 'Unknown')}")
-    
-    # Process case studies - handle directory case
-    if case_studies_files:
-        print(f"📚 Processing case studies...")
-        for name, url in case_studies_files:
-            if name == "case-studies" and url is None:
-                # This is a directory, need to explore it separately
-                cs_api_url = "https://api.github.com/repos/mitre-atlas/atlas-data/contents/data/case-studies"
-                print(f"  📁 Exploring case-studies directory...")
-                cs_directory = explore_github_directory("https://github.com/mitre-atlas/atlas-data/tree/main/data/case-studies")
-                if cs_directory:
-                    print(f"    ✅ Found {len(cs_directory)} case study files")
-                    # Process first 5 case study files
-                    for cs_item in cs_directory[:5]:
-                        cs_name = cs_item.get('name', '')
-                        cs_url = cs_item.get('download_url', '')
-                        if cs_url and cs_name.endswith('.yaml'):
-                            print(f"    📥 Fetching case study: {cs_name}")
-                            cs_content = fetch_file_content(cs_url)
-                            if cs_content:
-                                cs_data = parse_yaml_file(cs_content)
-                                if cs_data:
-                                    all_case_studies.append(cs_data)
-            else:
-                print(f"  📥 Fetching: {name}")
-                content = fetch_file_content(url)
-                if content:
-                    data = parse_yaml_file(content)
-                    if data:
-                        if isinstance(data, list):
-                            all_case_studies.extend(data)
-                            print(f"    ✅ Loaded {len(data)} case studies from {name}")
-                        else:
-                            all_case_studies.append(data)
-                            print(f"    ✅ Loaded case study: {data.get('name', 'Unknown')}")
+    for category in extracted:
+        for path in categories[category]:
+            data = documents.get(path)
+            if not data:
+                continue
+            if isinstance(data, list):
+                extracted[category].extend(item for item in data if isinstance(item, dict))
+                print(f"    ✅ Loaded {len(data)} {category.replace('_', ' ')} from {path}")
+            elif isinstance(data, dict):
+                extracted[category].append(data)
+                if category != 'case_studies':
+                    print(f"    ✅ Loaded {category[:-1]}: {data.get('name', 'Unknown')}")
+    
+    all_tactics = extracted['tactics']
+    all_techniques = extracted['techniques']
+    all_case_studies = extracted['case_studies']
+    if all_case_studies:
+        print(f"    ✅ Loaded {len(all_case_studies)} case studies")
+    if errors:
+        print(f"    ⚠️ {len(errors)} files could not be fetched or parsed")
     
     # Display results
     print(f"\n🚀 ATLAS MATRIX EXTRACTION RESULTS")
@@ -214,7 +124,7 @@ def main():
     # Final summary
     print(f"\n📊 EXTRACTION SUMMARY:")
     print("-" * 40)
-    print(f"  📁 Total files found: {len(directory_contents)}")
+    print(f"  📁 Total files found: {len(files)}")
     print(f"  🎯 Tactics extracted: {len(all_tactics)}")
     print(f"  🔧 Techniques extracted: {len(all_techniques)}")
     print(f"  📚 Case studies extracted: {len(all_case_studies)}")
@@ -224,4 +134,5 @@ def main():
     print(f"\n✅ ATLAS matrix extraction completed successfully!")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
+    print_cache_stats()
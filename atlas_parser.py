@@ -5,23 +5,18 @@ Parses the ATLAS YAML data and displays a comprehensive summary
 """
 
 import requests
-import yaml
-import urllib3
 from datetime import datetime
-
-# Disable SSL warnings
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from atlas_case_index import CaseStudyIndex
+from atlas_yaml import YAMLError, load_yaml, print_yaml_stats
+from http_cache import print_cache_stats
+from http_client import pooled_get
 
 def fetch_atlas_yaml():
     """Fetch ATLAS data from GitHub"""
     url = "https://raw.githubusercontent.com/mitre-atlas/atlas-data/main/dist/ATLAS.yaml"
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
     try:
-        response = requests.get(url, headers=headers, timeout=30, verify=False)
+        response = pooled_get(url)
         response.raise_for_status()
         return response.text
     except requests.RequestException as e:
@@ -31,9 +26,9 @@ def fetch_atlas_yaml():
 def parse_atlas_data(yaml_content):
     """Parse ATLAS YAML data and extract key information"""
     try:
-        data = yaml.safe_load(yaml_content)
+        data = load_yaml(yaml_content)
         return data
-    except yaml.YAMLError as e:
+    except YAMLError as e:
         print(f"❌ Error parsing YAML: {e}")
         return None
 
@@ -107,6 +102,8 @@ def display_atlas_summary(data):
     print(f"\n📚 CASE STUDIES ({len(case_studies)} total):")
     print("-" * 50)
     
+    case_study_index = CaseStudyIndex.build(case_studies, [technique.get('id', '') for technique in techniques])
+    
     # Show first 10 case studies
     for i, case_study in enumerate(case_studies[:10]):
         cs_id = case_study.get('id', 'Unknown')
@@ -115,11 +112,21 @@ def display_atlas_summary(data):
         cs_actor = case_study.get('actor', 'Unknown')
         cs_type = case_study.get('case-study-type', 'Unknown')
         print(f"  {cs_id}: {cs_name}")
-        print(f"    └─ Target: {cs_target} | Actor: {cs_actor} | Type: {cs_type}")
+        print(f"    └─ Target: {cs_target} | Actor: {cs_actor} | Type: {cs_type} | "
+              f"Techniques: {len(case_study_index.techniques_for(cs_id))}")
     
     if len(case_studies) > 10:
         print(f"    ... and {len(case_studies) - 10} more case studies")
     
+    # Techniques seen in the most case studies, with the ones they are used alongside
+    print(f"\n🔗 MOST USED TECHNIQUES IN CASE STUDIES:")
+    print("-" * 50)
+    for technique_id, count in case_study_index.most_used(10):
+        related = ', '.join(f"{related_id} ({together})"
+                            for related_id, together in case_study_index.related_techniques(technique_id, 3))
+        print(f"  {technique_id}: {count} case studies")
+        print(f"    └─ Often with: {related or 'none'}")
+    
     # Statistics
     print(f"\n📊 SUMMARY STATISTICS:")
     print("-" * 50)
@@ -168,4 +175,6 @@ def main():
     print(f"📅 Extracted on: {datetime.now()}")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
+    print_cache_stats()
+    print_yaml_stats()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+ATLAS Repository Crawler for MitreShiled
+Lists the whole atlas-data data directory with one recursive git tree call
+(instead of one contents-API call per directory), downloads the YAML files
+concurrently and parses them in a worker pool as they arrive.
+
+Downloaded files are kept in a blob cache keyed by their git blob SHA, which
+the tree listing reports for every file: a file whose SHA has not changed
+since the last crawl is never downloaded again, and every download is
+checked against its SHA before it is cached.
+
+Environment:
+  MITRE_GITHUB_API_URL / MITRE_GITHUB_RAW_URL  API and raw-content hosts (e.g. a local mock)
+  MITRE_ATLAS_BLOB_CACHE_PATH   blob cache file (default .http_cache/atlas_blobs.sqlite3)
+  MITRE_ATLAS_BLOB_CACHE=off    always download every file
+
+Usage: python3 atlas_repo.py   (list the data tree and crawl it)
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import requests
+
+from async_fetcher import fetch_all
+from atlas_yaml import YAMLError, parse_yaml
+from http_client import pooled_get
+
+ATLAS_REPO = 'mitre-atlas/atlas-data'
+ATLAS_REF = 'main'
+ATLAS_DATA_DIR = 'data'
+
+GITHUB_API_URL = os.environ.get('MITRE_GITHUB_API_URL', 'https://api.github.com')
+GITHUB_RAW_URL = os.environ.get('MITRE_GITHUB_RAW_URL', 'https://raw.githubusercontent.com')
+
+BLOB_CACHE_PATH = os.environ.get('MITRE_ATLAS_BLOB_CACHE_PATH', os.path.join('.http_cache', 'atlas_blobs.sqlite3'))
+BLOB_CACHE_ENABLED = os.environ.get('MITRE_ATLAS_BLOB_CACHE', 'on').lower() not in ('0', 'off', 'false', 'no')
+
+CRAWL_CONCURRENCY = 16
+YAML_SUFFIXES = ('.yaml', '.yml')
+
+
+def git_blob_sha(body):
+    """The SHA git (and the tree API) reports for a file with this content"""
+    return hashlib.sha1(b'blob %d\0' % len(body) + body).hexdigest()
+
+
+class BlobCache:
+    """Content-addressed store of downloaded repository files, keyed by git blob SHA"""
+
+    def __init__(self, path=BLOB_CACHE_PATH):
+        self.path = path
+        self.stats = {'hits': 0, 'stored': 0, 'mismatched': 0}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('''
+            CREATE TABLE IF NOT EXISTS blobs (
+                sha TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL
+            )
+        ''')
+        self._db.commit()
+
+    def get_many(self, shas):
+        """{sha: body} for the SHAs already in the cache"""
+        shas = list(shas)
+        found = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(shas), 500):
+                chunk = shas[start:start + 500]
+                rows = self._db.execute(
+                    f"SELECT sha, body FROM blobs WHERE sha IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                found.update((sha, zlib.decompress(body)) for sha, body in rows)
+            self.stats['hits'] += len(found)
+        return found
+
+    def put(self, sha, path, body):
+        """Store a downloaded file if its content matches sha; returns False on a mismatch"""
+        if git_blob_sha(body) != sha:
+            with self._lock:
+                self.stats['mismatched'] += 1
+            return False
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?)',
+                             (sha, path, zlib.compress(body), len(body), time.time()))
+            self._db.commit()
+            self.stats['stored'] += 1
+        return True
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def list_data_tree(repo=ATLAS_REPO, ref=ATLAS_REF, directory=ATLAS_DATA_DIR, api_url=GITHUB_API_URL):
+    """Every YAML file under directory as [{'path', 'sha', 'size'}], from one recursive tree call
+
+    Returns None if the listing fails.
+    """
+    url = f"{api_url}/repos/{repo}/git/trees/{ref}?recursive=1"
+    try:
+        response = pooled_get(url, headers={'Accept': 'application/vnd.github.v3+json'})
+        response.raise_for_status()
+        tree = response.json()
+    except (requests.RequestException, ValueError) as e:
+        print(f"❌ Error listing {repo} tree: {e}")
+        return None
+
+    if tree.get('truncated'):
+        print(f"⚠️ The {repo} tree listing was truncated; some files are missing")
+    prefix = directory.rstrip('/') + '/'
+    return [
+        {'path': item['path'], 'sha': item['sha'], 'size': item.get('size', 0)}
+        for item in tree.get('tree', [])
+        if item.get('type') == 'blob' and item['path'].startswith(prefix) and item['path'].endswith(YAML_SUFFIXES)
+    ]
+
+
+def _parse_file(path, body):
+    """Parse one downloaded file in a worker: (path, data, error message)"""
+    try:
+        return path, parse_yaml(body.decode('utf-8')), None
+    except (YAMLError, UnicodeDecodeError) as e:
+        return path, None, str(e)
+
+
+def crawl_atlas_data(repo=ATLAS_REPO, ref=ATLAS_REF, directory=ATLAS_DATA_DIR, concurrency=CRAWL_CONCURRENCY,
+                     workers=None, api_url=GITHUB_API_URL, raw_url=GITHUB_RAW_URL, progress=True):
+    """Download and parse every YAML file of the ATLAS data directory
+
+    Returns (files, documents, errors): the tree entries, {path: parsed data}
+    and {path: error} for files that failed to download or parse, or None if
+    the tree could not be listed.
+    """
+    files = list_data_tree(repo, ref, directory, api_url)
+    if files is None:
+        return None
+    sha_for = {item['path']: item['sha'] for item in files}
+
+    cache = BlobCache(BLOB_CACHE_PATH) if BLOB_CACHE_ENABLED else None
+    cached = cache.get_many(set(sha_for.values())) if cache else {}
+    bodies = {path: cached[sha] for path, sha in sha_for.items() if sha in cached}
+    missing = [path for path in sha_for if path not in bodies]
+    print(f"📦 {len(files)} files in {repo}/{directory}: {len(bodies)} unchanged (blob cache), "
+          f"{len(missing)} to download")
+
+    workers = min(workers or os.cpu_count() or 1, max(len(files), 1))
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    futures = []
+    errors = {}
+    start = time.perf_counter()
+
+    def submit(path, body):
+        if pool:
+            futures.append(pool.submit(_parse_file, path, body))
+        else:
+            futures.append(_parse_file(path, body))
+
+    def keep_download(path, response):
+        body = response.content
+        bodies[path] = body
+        if cache and not cache.put(sha_for[path], path, body):
+            print(f"⚠️ {path} does not match its tree SHA; not cached")
+
+    def on_result(path, ok):
+        # Parse each file while the rest are still downloading
+        if ok:
+            submit(path, bodies[path])
+        else:
+            errors[path] = 'download failed'
+
+    try:
+        if pool:
+            # Start the workers before the download threads exist (forking a threaded process is unsafe)
+            pool.submit(os.getpid).result()
+        for path, body in bodies.items():
+            submit(path, body)
+        if missing:
+            fetch_all(missing, lambda path: f"{raw_url}/{repo}/{ref}/{path}", lambda text: True,
+                      concurrency=concurrency, per_host_limit=concurrency, progress=progress,
+                      on_result=on_result, on_page=keep_download)
+        results = [future.result() for future in futures] if pool else futures
+    finally:
+        if pool:
+            pool.shutdown()
+        if cache:
+            cache.close()
+
+    documents = {}
+    for path, data, error in results:
+        if error:
+            print(f"❌ Error parsing {path}: {error}")
+            errors[path] = error
+        else:
+            documents[path] = data
+    print(f"✅ {len(documents)}/{len(files)} files parsed in {time.perf_counter() - start:.2f}s "
+          f"({workers} parse worker{'s' if workers > 1 else ''})")
+    return files, documents, errors
+
+
+def main():
+    crawl = crawl_atlas_data()
+    if crawl is None:
+        return
+    files, documents, errors = crawl
+    for item in files:
+        status = '✅' if item['path'] in documents else '❌'
+        print(f"  {status} {item['path']} ({item['size']} bytes, {item['sha'][:10]})")
+    if errors:
+        print(f"⚠️ {len(errors)} files failed")
+
+
+if __name__ == "__main__":
+    main()
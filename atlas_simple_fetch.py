@@ -5,16 +5,14 @@ Fetches and examines the content of the ATLAS matrices page
 """
 
 import requests
-import urllib3
 from datetime import datetime
-
-# Disable SSL warnings for development/testing
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from atlas_yaml import YAMLError, load_yaml, print_yaml_stats
+from http_cache import print_cache_stats
+from http_client import pooled_get
 
 def fetch_page_content(url):
     """Fetch page content and show details"""
     headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
         'Accept-Language': 'en-US,en;q=0.5',
         'Accept-Encoding': 'gzip, deflate',
@@ -26,7 +24,7 @@ def fetch_page_content(url):
     print(f"🕐 Time: {datetime.now()}")
     
     try:
-        response = requests.get(url, headers=headers, timeout=30, verify=False)
+        response = pooled_get(url, headers=headers)
         print(f"✅ Status Code: {response.status_code}")
         print(f"📏 Content Length: {len(response.text)} characters")
         print(f"📋 Content Type: {response.headers.get('content-type', 'Unknown')}")
@@ -60,8 +58,18 @@ def main():
         print(f"\n✅ Successfully fetched ATLAS data: {len(content)} characters")
         
         # Parse and display basic info about the YAML content
-        if 'matrices:' in content:
-            print(f"📊 YAML content appears to contain matrix data")
+        try:
+            data = load_yaml(content)
+        except YAMLError as e:
+            print(f"❌ Error parsing YAML: {e}")
+            data = None
+        
+        if isinstance(data, dict) and 'matrices' in data:
+            matrices = data['matrices'] or []
+            print(f"📊 ATLAS {data.get('version', 'Unknown')}: {len(matrices)} matrices, "
+                  f"{sum(len(m.get('tactics', [])) for m in matrices)} tactics, "
+                  f"{sum(len(m.get('techniques', [])) for m in matrices)} techniques, "
+                  f"{len(data.get('case-studies', []))} case studies")
             lines = content.split('\n')
             print(f"📏 Total lines: {len(lines)}")
             
@@ -78,4 +86,6 @@ def main():
         print(f"\n❌ Failed to fetch ATLAS data")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
+    print_cache_stats()
+    print_yaml_stats()
@@ -5,176 +5,174 @@ Extracts only tactics, techniques, and sub-techniques from ATLAS framework
 Focused extraction without case studies
 """
 
-import requests
-import yaml
-import urllib3
 from datetime import datetime
-
-# Disable SSL warnings
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from atlas_yaml import load_yaml, print_yaml_stats
+from http_cache import print_cache_stats
+from http_client import pooled_get
 
 def fetch_atlas_data():
     """Fetch ATLAS tactics and techniques data"""
     base_url = "https://raw.githubusercontent.com/mitre-atlas/atlas-data/main/data"
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
     # Fetch tactics
     tactics_url = f"{base_url}/tactics.yaml"
     techniques_url = f"{base_url}/techniques.yaml"
     
     print("🔍 Fetching ATLAS tactics...")
     try:
-        tactics_response = requests.get(tactics_url, headers=headers, timeout=30, verify=False)
+        tactics_response = pooled_get(tactics_url)
         tactics_response.raise_for_status()
-        tactics_data = yaml.safe_load(tactics_response.text)
+        tactics_data = load_yaml(tactics_response.text)
     except Exception as e:
         print(f"❌ Error fetching tactics: {e}")
         return None, None
     
     print("🔍 Fetching ATLAS techniques...")
     try:
-        techniques_response = requests.get(techniques_url, headers=headers, timeout=30, verify=False)
+        techniques_response = pooled_get(techniques_url)
         techniques_response.raise_for_status()
-        techniques_data = yaml.safe_load(techniques_response.text)
+        techniques_data = load_yaml(techniques_response.text)
     except Exception as e:
         print(f"❌ Error fetching techniques: {e}")
         return tactics_data, None
     
     return tactics_data, techniques_data
 
-def organize_techniques_by_tactic(tactics, techniques):
-    """Organize techniques and sub-techniques by tactic"""
+# Display order of the ATLAS matrix columns
+ATLAS_TACTIC_ORDER = [
+    "Reconnaissance",
+    "Resource Development", 
+    "Initial Access",
+    "AI Model Access",
+    "Execution",
+    "Persistence",
+    "Privilege Escalation",
+    "Defense Evasion",
+    "Credential Access",
+    "Discovery",
+    "Collection",
+    "AI Attack Staging",
+    "Command and Control",
+    "Exfiltration",
+    "Impact"
+]
+
+# Template names that no longer follow the tactic's display name (ATLAS renamed its "ML" tactics to "AI")
+TACTIC_ALIASES = {
+    'ml_model_access': "AI Model Access",
+    'ml_attack_staging': "AI Attack Staging",
+}
+
+def tactic_key(tactic_name):
+    """Template name for a tactic, e.g. 'Command and Control' -> 'command_and_control'"""
+    return tactic_name.lower().replace(' ', '_').replace('&', '_and_')
+
+class TacticResolver:
+    """Resolves a technique's tactic references with a single dictionary lookup each
+    
+    A reference may be a tactic ID ('AML.TA0002'), a template
+    ('{{reconnaissance.id}}'), a template name or alias ('ml_model_access')
+    or a tactic name ('Initial Access'); matching ignores case. References
+    that match nothing are collected in unresolved instead of being guessed.
+    """
+    
+    def __init__(self, tactics, aliases=TACTIC_ALIASES):
+        self._lookup = {}
+        self.unresolved = {}  # reference -> IDs of the techniques using it
+        keys_by_name = {}
+        for tactic in tactics:
+            tactic_id = tactic.get('id', '')
+            tactic_name = tactic.get('name', '')
+            key = tactic_key(tactic_name)
+            keys_by_name[tactic_name] = key
+            for ref in (tactic_id, tactic_name, key, f"{{{{{key}.id}}}}"):
+                self._lookup.setdefault(ref.lower(), tactic_id)
+        for alias, tactic_name in aliases.items():
+            if tactic_name in keys_by_name:
+                tactic_id = self._lookup[keys_by_name[tactic_name]]
+                for ref in (alias, f"{{{{{alias}.id}}}}"):
+                    self._lookup.setdefault(ref, tactic_id)
+    
+    def resolve(self, tactic_ref, technique_id=''):
+        """Return the tactic ID a reference points at, or None (recorded in unresolved)"""
+        tactic_id = self._lookup.get(tactic_ref.replace(' ', '').lower() if '{{' in tactic_ref else tactic_ref.strip().lower())
+        if tactic_id is None:
+            self.unresolved.setdefault(tactic_ref, []).append(technique_id)
+        return tactic_id
+    
+    def report_unresolved(self):
+        """Print every reference that matched no tactic"""
+        for tactic_ref, technique_ids in self.unresolved.items():
+            examples = ', '.join(technique_ids[:3]) + (' ...' if len(technique_ids) > 3 else '')
+            print(f"⚠️ Unresolved tactic reference '{tactic_ref}' in {len(technique_ids)} techniques ({examples})")
+
+def organize_techniques_by_tactic(tactics, techniques, resolver=None):
+    """Organize techniques and sub-techniques by tactic
+    
+    Tactic references are resolved through a TacticResolver built from
+    tactics (or the one given); unresolved references are reported, and
+    left in resolver.unresolved.
+    """
     # Create a mapping of tactics with their techniques
     tactic_technique_map = {}
-    
-    # Create name to ID mapping for tactics
-    tactic_name_map = {}
+    resolver = resolver or TacticResolver(tactics)
     
     # Initialize with tactics
     for tactic in tactics:
         tactic_id = tactic.get('id', '')
-        tactic_name = tactic.get('name', '')
         tactic_technique_map[tactic_id] = {
-            'name': tactic_name,
+            'name': tactic.get('name', ''),
             'id': tactic_id,
             'techniques': [],
             'subtechniques': []
         }
-        # Create simplified name mapping for template matching
-        simple_name = tactic_name.lower().replace(' ', '_').replace('&', '_and_')
-        tactic_name_map[simple_name] = tactic_id
-        
-        # Add specific mappings for known template references
-        if tactic_name == "AI Model Access":
-            tactic_name_map['ml_model_access'] = tactic_id
-        elif tactic_name == "AI Attack Staging":
-            tactic_name_map['ml_attack_staging'] = tactic_id
-        elif tactic_name == "Reconnaissance":
-            tactic_name_map['reconnaissance'] = tactic_id
-        elif tactic_name == "Resource Development":
-            tactic_name_map['resource_development'] = tactic_id
-        elif tactic_name == "Initial Access":
-            tactic_name_map['initial_access'] = tactic_id
-        elif tactic_name == "Execution":
-            tactic_name_map['execution'] = tactic_id
-        elif tactic_name == "Persistence":
-            tactic_name_map['persistence'] = tactic_id
-        elif tactic_name == "Privilege Escalation":
-            tactic_name_map['privilege_escalation'] = tactic_id
-        elif tactic_name == "Defense Evasion":
-            tactic_name_map['defense_evasion'] = tactic_id
-        elif tactic_name == "Credential Access":
-            tactic_name_map['credential_access'] = tactic_id
-        elif tactic_name == "Discovery":
-            tactic_name_map['discovery'] = tactic_id
-        elif tactic_name == "Collection":
-            tactic_name_map['collection'] = tactic_id
-        elif tactic_name == "Command and Control":
-            tactic_name_map['command_and_control'] = tactic_id
-        elif tactic_name == "Exfiltration":
-            tactic_name_map['exfiltration'] = tactic_id
-        elif tactic_name == "Impact":
-            tactic_name_map['impact'] = tactic_id
     
     # Process techniques
     for technique in techniques:
         tech_id = technique.get('id', '')
         tech_name = technique.get('name', '')
-        tech_tactics = technique.get('tactics', [])
+        description = technique.get('description', '')
+        technique_data = {
+            'id': tech_id,
+            'name': tech_name,
+            'description': description[:100] + '...' if description else ''
+        }
         
         # Determine if it's a sub-technique (contains additional dots after T)
-        tech_parts = tech_id.split('.')
-        is_subtechnique = len(tech_parts) > 2  # AML.T0000.000 has 3 parts
+        is_subtechnique = tech_id.count('.') > 1  # AML.T0000.000 has 3 parts
+        bucket = 'subtechniques' if is_subtechnique else 'techniques'
         
         # Add to appropriate tactics
-        for tactic_ref in tech_tactics:
-            matched_tactic_id = None
-            
-            # Handle different tactic reference formats
-            if tactic_ref.startswith('AML.TA'):
-                # Direct tactic ID reference
-                matched_tactic_id = tactic_ref
-            elif '{{' in tactic_ref:
-                # Template reference like {{reconnaissance.id}}
-                template_name = tactic_ref.replace('{{', '').replace('}}', '').replace('.id', '')
-                matched_tactic_id = tactic_name_map.get(template_name)
-            else:
-                # Try to match by name
-                for name_key, t_id in tactic_name_map.items():
-                    if tactic_ref.lower() in name_key or name_key in tactic_ref.lower():
-                        matched_tactic_id = t_id
-                        break
-            
-            # Add technique to matched tactic
-            if matched_tactic_id and matched_tactic_id in tactic_technique_map:
-                technique_data = {
-                    'id': tech_id,
-                    'name': tech_name,
-                    'description': technique.get('description', '')[:100] + '...' if technique.get('description', '') else ''
-                }
-                
-                if is_subtechnique:
-                    tactic_technique_map[matched_tactic_id]['subtechniques'].append(technique_data)
-                else:
-                    tactic_technique_map[matched_tactic_id]['techniques'].append(technique_data)
+        for tactic_ref in technique.get('tactics', []):
+            matched_tactic_id = resolver.resolve(tactic_ref, tech_id)
+            if matched_tactic_id is not None:
+                tactic_technique_map[matched_tactic_id][bucket].append(technique_data)
     
+    resolver.report_unresolved()
     return tactic_technique_map
 
+def order_tactics(tactic_technique_map, tactic_order=ATLAS_TACTIC_ORDER):
+    """[(tactic_id, tactic_data)] in display order, built in one pass over the map
+    
+    Tactics whose name is not in tactic_order are left out; if two tactics
+    share a name the first one wins.
+    """
+    position = {tactic_name: i for i, tactic_name in enumerate(tactic_order)}
+    slots = [None] * len(tactic_order)
+    for tactic_id, tactic_data in tactic_technique_map.items():
+        i = position.get(tactic_data['name'])
+        if i is not None and slots[i] is None:
+            slots[i] = (tactic_id, tactic_data)
+    return [slot for slot in slots if slot is not None]
+
 def display_atlas_matrix(tactic_technique_map):
     """Display the ATLAS matrix in the requested format"""
     
     print("🚀 ATLAS FRAMEWORK - AI/ML SECURITY MATRIX")
     print("=" * 80)
     
-    # Define the correct order of tactics as specified by user
-    tactic_order = [
-        "Reconnaissance",
-        "Resource Development", 
-        "Initial Access",
-        "AI Model Access",
-        "Execution",
-        "Persistence",
-        "Privilege Escalation",
-        "Defense Evasion",
-        "Credential Access",
-        "Discovery",
-        "Collection",
-        "AI Attack Staging",
-        "Command and Control",
-        "Exfiltration",
-        "Impact"
-    ]
-    
     # Sort tactics by the specified order
-    ordered_tactics = []
-    for tactic_name in tactic_order:
-        for tactic_id, tactic_data in tactic_technique_map.items():
-            if tactic_data['name'] == tactic_name:
-                ordered_tactics.append((tactic_id, tactic_data))
-                break
+    ordered_tactics = order_tactics(tactic_technique_map)
     
     # Display tactics header with technique counts
     print("\n🎯 TACTICS & TECHNIQUE COUNTS:")
@@ -261,4 +259,6 @@ def main():
     print(f"\n✅ ATLAS matrix extraction completed!")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
+    print_cache_stats()
+    print_yaml_stats()
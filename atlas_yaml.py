@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Shared ATLAS YAML Loader for MitreShiled
+Every ATLAS script parses the same few YAML documents (ATLAS.yaml and the
+atlas-data/data files) on every run. This loader parses with the libyaml C
+loader when PyYAML was built with it (pure-Python SafeLoader otherwise) and
+keeps a pickle snapshot of each parsed document keyed by the SHA-256 of its
+text, so an unchanged document loads from the snapshot in milliseconds.
+
+Snapshots live in .http_cache/atlas_snapshots (MITRE_ATLAS_SNAPSHOT_DIR);
+MITRE_ATLAS_SNAPSHOT=off always parses. Snapshots are local pickles and must
+only ever be written by this loader.
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+import time
+
+import yaml
+
+from mitreshire_output import atomic_write
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+    LIBYAML_AVAILABLE = True
+except ImportError:
+    from yaml import SafeLoader
+    LIBYAML_AVAILABLE = False
+
+# Callers catch parse errors as atlas_yaml.YAMLError
+YAMLError = yaml.YAMLError
+
+SNAPSHOT_DIR = os.environ.get('MITRE_ATLAS_SNAPSHOT_DIR', os.path.join('.http_cache', 'atlas_snapshots'))
+SNAPSHOT_ENABLED = os.environ.get('MITRE_ATLAS_SNAPSHOT', 'on').lower() not in ('0', 'off', 'false', 'no')
+
+# Bump when the snapshot layout changes so old snapshots are ignored
+SNAPSHOT_VERSION = 1
+MAX_SNAPSHOTS = 16
+
+_stats = {'parsed': 0, 'snapshot_hits': 0, 'parse_seconds': 0.0, 'snapshot_seconds': 0.0}
+_stats_lock = threading.Lock()
+
+
+def parse_yaml(text):
+    """Parse YAML text with the fastest available safe loader (no snapshot)"""
+    return yaml.load(text, Loader=SafeLoader)
+
+
+def snapshot_path(text):
+    """Snapshot file for a document's text"""
+    digest = hashlib.sha256(text.encode('utf-8') if isinstance(text, str) else text).hexdigest()
+    return os.path.join(SNAPSHOT_DIR, f"{digest}.v{SNAPSHOT_VERSION}.pickle")
+
+
+def _prune_snapshots():
+    """Keep only the MAX_SNAPSHOTS most recently used snapshots"""
+    snapshots = [os.path.join(SNAPSHOT_DIR, name) for name in os.listdir(SNAPSHOT_DIR) if name.endswith('.pickle')]
+    snapshots.sort(key=os.path.getmtime, reverse=True)
+    for path in snapshots[MAX_SNAPSHOTS:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def load_yaml(text):
+    """Parse a YAML document, reusing the snapshot of an identical document parsed before
+
+    Raises YAMLError for invalid YAML, like yaml.safe_load.
+    """
+    path = snapshot_path(text) if SNAPSHOT_ENABLED else None
+    if path and os.path.exists(path):
+        start = time.perf_counter()
+        try:
+            with open(path, 'rb') as f:
+                data = pickle.load(f)
+            # Mark as recently used for pruning
+            os.utime(path)
+            with _stats_lock:
+                _stats['snapshot_hits'] += 1
+                _stats['snapshot_seconds'] += time.perf_counter() - start
+            return data
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            print(f"⚠️ Ignoring unreadable ATLAS snapshot {path}: {e}")
+
+    start = time.perf_counter()
+    data = parse_yaml(text)
+    with _stats_lock:
+        _stats['parsed'] += 1
+        _stats['parse_seconds'] += time.perf_counter() - start
+
+    if path:
+        try:
+            os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+            with atomic_write(path, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            _prune_snapshots()
+        except (OSError, pickle.PicklingError) as e:
+            print(f"⚠️ Could not save ATLAS snapshot: {e}")
+    return data
+
+
+def print_yaml_stats():
+    """Print how the YAML documents of this run were loaded"""
+    s = _stats
+    if s['parsed'] or s['snapshot_hits']:
+        loader = 'libyaml' if LIBYAML_AVAILABLE else 'pure-Python'
+        print(f"📦 ATLAS YAML: {s['parsed']} parsed with {loader} ({s['parse_seconds'] * 1000:.0f} ms), "
+              f"{s['snapshot_hits']} from snapshots ({s['snapshot_seconds'] * 1000:.0f} ms)")
@@ -0,0 +1,853 @@
+#!/usr/bin/env python3
+"""
+Extraction Benchmarks for MitreShiled
+Runs the extractor components against local stand-ins so results are repeatable offline
+"""
+
+import glob
+import json
+import os
+import shutil
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+import urllib3
+
+import http_cache
+import http_client
+import mitre_data_extractor
+import parse_pool
+import rate_limiter
+import mitreshire_output
+from async_fetcher import fetch_all
+from mitre_data_extractor import get_technique_url, parse_technique_description, parse_technique_description_full
+from technique_merge import merge_technique_records
+from technique_record import RecordInterner
+from mitreshire_output import COMPRESSION_SUFFIXES, OUTPUT_FORMATS, iter_records, output_filename, write_records
+
+# Saved technique pages used as stand-in responses (see test_description_fetch.py)
+FIXTURE_PAGES = ['debug_T1078.html', 'debug_T1078_001.html', 'debug_T1613.html']
+
+
+def load_fixture_pages():
+    """Load the committed debug_*.html technique pages"""
+    pages = []
+    for filename in FIXTURE_PAGES:
+        with open(filename, 'rb') as f:
+            pages.append(f.read())
+    return pages
+
+
+def start_stand_in_server(latency=0.25, certfile=None):
+    """Start a local HTTP server that answers every technique URL with a saved page after a fixed latency
+
+    The server speaks HTTP/1.1 so clients can keep connections alive; with
+    certfile it serves HTTPS.
+    """
+    pages = load_fixture_pages()
+
+    class StandInHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Headers and body go out in separate writes; without TCP_NODELAY a kept-alive
+        # connection stalls on delayed ACKs
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            time.sleep(latency)
+            body = pages[hash(self.path) % len(pages)]
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.daemon_threads = True
+    if certfile:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certfile)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def benchmark_fetch(page_count=64, latency=0.25, levels=(1, 4, 16)):
+    """Measure pages/sec of the concurrent description fetcher at several concurrency levels"""
+    # Every level must hit the network, not the response cache, at the raw concurrency
+    http_cache.CACHE_ENABLED = False
+    rate_limiter.LIMITER_ENABLED = False
+    server = start_stand_in_server(latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    technique_ids = [f"T{1000 + i}" for i in range(page_count)]
+
+    print(f"🚀 Description fetch benchmark: {page_count} pages, {latency * 1000:.0f}ms simulated latency")
+    print("-" * 60)
+    try:
+        for concurrency in levels:
+            start = time.perf_counter()
+            results = fetch_all(
+                technique_ids,
+                lambda tech_id: get_technique_url(tech_id, base_url),
+                parse_technique_description,
+                concurrency=concurrency,
+                per_host_limit=concurrency,
+                progress=False
+            )
+            elapsed = time.perf_counter() - start
+            print(f"  concurrency {concurrency:>3}: {len(results):>4} pages in {elapsed:6.2f}s  "
+                  f"→ {len(results) / elapsed:7.1f} pages/sec")
+    finally:
+        server.shutdown()
+    print("-" * 60)
+
+
+def measure_parse(parse, html_content, repeat):
+    """Return (mean seconds, peak traced bytes, result) for parse(html_content)"""
+    tracemalloc.start()
+    result = parse(html_content)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse(html_content)
+    return (time.perf_counter() - start) / repeat, peak, result
+
+
+def benchmark_parse(repeat=20):
+    """Compare the full-tree and fast-path description parsers on the committed fixture pages"""
+    print(f"🚀 Description parse benchmark ({repeat} runs per page)")
+    print("-" * 78)
+    print(f"{'page':<24}{'full ms':>10}{'fast ms':>10}{'speedup':>9}{'full peak':>12}{'fast peak':>12}")
+    for filename in FIXTURE_PAGES:
+        with open(filename, 'r', encoding='utf-8') as f:
+            html_content = f.read()
+        full_time, full_peak, full_result = measure_parse(parse_technique_description_full, html_content, repeat)
+        fast_time, fast_peak, fast_result = measure_parse(parse_technique_description, html_content, repeat)
+        if fast_result != full_result:
+            print(f"❌ {filename}: fast path output differs from full parse")
+            sys.exit(1)
+        print(f"{filename:<24}{full_time * 1000:>10.2f}{fast_time * 1000:>10.2f}{full_time / fast_time:>8.1f}x"
+              f"{full_peak / 1024:>10.0f}KB{fast_peak / 1024:>10.0f}KB")
+    print("-" * 78)
+    print("✅ Fast path output is byte-identical to the full parse for every page")
+
+
+def benchmark_output():
+    """Rewrite the committed technique files in every output format and compare on-disk sizes"""
+    compressions = list(COMPRESSION_SUFFIXES)
+    if mitreshire_output.zstandard is None:
+        compressions.remove('zstd')
+        print("⚠️ zstandard not installed, skipping zstd")
+    variants = [(fmt, comp) for fmt in OUTPUT_FORMATS for comp in compressions]
+
+    print("🚀 Output format benchmark (committed mitreshire_*_techniques.json files)")
+    print("-" * 84)
+    print(f"{'platform':<20}" + ''.join(f"{fmt + COMPRESSION_SUFFIXES[comp]:>16}" for fmt, comp in variants))
+    with tempfile.TemporaryDirectory() as workdir:
+        for source in sorted(glob.glob('mitreshire_*_techniques.json')):
+            platform = source[len('mitreshire_'):-len('_techniques.json')]
+            records = list(iter_records(source))
+            sizes = []
+            for fmt, comp in variants:
+                target = os.path.join(workdir, f"out{OUTPUT_FORMATS[fmt]}{COMPRESSION_SUFFIXES[comp]}")
+                start = time.perf_counter()
+                write_records(target, records)
+                elapsed = time.perf_counter() - start
+                if list(iter_records(target)) != records:
+                    print(f"❌ {platform}: {fmt}/{comp} does not round-trip")
+                    sys.exit(1)
+                sizes.append(f"{os.path.getsize(target) / 1024:>9.0f}KB {elapsed * 1000:>3.0f}ms")
+            print(f"{platform:<20}" + ''.join(f"{size:>16}" for size in sizes))
+    print("-" * 84)
+    print("✅ Every format round-trips to the original records")
+
+
+def benchmark_merge():
+    """Report record and byte reductions from merging the committed per-tactic technique files"""
+    print("🚀 Per-tactic row merge (committed mitreshire_*_techniques.json files)")
+    print("-" * 78)
+    print(f"{'platform':<20}{'rows':>8}{'records':>9}{'rows KB':>10}{'merged KB':>11}{'saved':>8}{'merge ms':>10}")
+    totals = [0, 0, 0, 0]
+    for source in sorted(glob.glob('mitreshire_*_techniques.json')):
+        platform = source[len('mitreshire_'):-len('_techniques.json')]
+        rows = list(iter_records(source))
+        start = time.perf_counter()
+        merged = merge_technique_records(rows)
+        elapsed = time.perf_counter() - start
+        rows_bytes = len(json.dumps(rows, indent=2, ensure_ascii=False).encode('utf-8'))
+        merged_bytes = len(json.dumps(merged, indent=2, ensure_ascii=False).encode('utf-8'))
+        for i, value in enumerate((len(rows), len(merged), rows_bytes, merged_bytes)):
+            totals[i] += value
+        print(f"{platform:<20}{len(rows):>8}{len(merged):>9}{rows_bytes / 1024:>10.0f}{merged_bytes / 1024:>11.0f}"
+              f"{1 - merged_bytes / rows_bytes:>8.0%}{elapsed * 1000:>10.1f}")
+    print("-" * 78)
+    print(f"{'total':<20}{totals[0]:>8}{totals[1]:>9}{totals[2] / 1024:>10.0f}{totals[3] / 1024:>11.0f}"
+          f"{1 - totals[3] / totals[2]:>8.0%}")
+
+
+def make_self_signed_cert(directory):
+    """Create a throwaway localhost certificate with the openssl CLI; returns None if openssl is missing"""
+    if not shutil.which('openssl'):
+        return None
+    certfile = os.path.join(directory, 'localhost.pem')
+    subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1', '-subj', '/CN=localhost',
+                    '-keyout', certfile, '-out', certfile], check=True, capture_output=True)
+    return certfile
+
+
+def benchmark_connections(request_count=200):
+    """Compare a new connection per request (bare requests.get) with the pooled keep-alive session"""
+    http_cache.CACHE_ENABLED = False
+    # The throwaway certificate is self-signed
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    with tempfile.TemporaryDirectory() as workdir:
+        schemes = [('http', None)]
+        certfile = make_self_signed_cert(workdir)
+        if certfile:
+            schemes.append(('https', certfile))
+        else:
+            print("⚠️ openssl not found, skipping the HTTPS run")
+
+        print(f"🚀 Connection reuse benchmark: {request_count} sequential requests to a local server")
+        print("-" * 70)
+        print(f"{'scheme':<8}{'client':<26}{'ms/request':>12}{'saved/request':>16}")
+        for scheme, cert in schemes:
+            server = start_stand_in_server(latency=0, certfile=cert)
+            url = f"{scheme}://localhost:{server.server_address[1]}/techniques/T1078/"
+            try:
+                timings = []
+                for label, get in (('requests.get (no reuse)', requests.get),
+                                   ('http_client session', http_client.session_get)):
+                    get(url, verify=False)  # warm-up
+                    start = time.perf_counter()
+                    for _ in range(request_count):
+                        get(url, verify=False).raise_for_status()
+                    timings.append((label, (time.perf_counter() - start) / request_count))
+                baseline = timings[0][1]
+                for label, per_request in timings:
+                    saved = f"{(baseline - per_request) * 1000:.2f} ms" if per_request != baseline else '-'
+                    print(f"{scheme:<8}{label:<26}{per_request * 1000:>12.2f}{saved:>16}")
+            finally:
+                server.shutdown()
+        print("-" * 70)
+
+
+def start_throttling_server(tolerated_rate):
+    """Local server that answers 429 with Retry-After once more than tolerated_rate requests arrive in a second"""
+    pages = load_fixture_pages()
+    lock = threading.Lock()
+    window = []
+    counts = {'ok': 0, 'throttled': 0}
+
+    class ThrottlingHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            now = time.monotonic()
+            with lock:
+                while window and window[0] <= now - 1.0:
+                    window.pop(0)
+                allowed = len(window) < tolerated_rate
+                if allowed:
+                    window.append(now)
+                counts['ok' if allowed else 'throttled'] += 1
+            body = pages[hash(self.path) % len(pages)] if allowed else b'Too Many Requests'
+            self.send_response(200 if allowed else 429)
+            if not allowed:
+                self.send_header('Retry-After', '1')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ThrottlingHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, counts
+
+
+def benchmark_rate_limit(page_count=200, tolerated_rate=20, fixed_interval=0.25):
+    """Compare a fixed request spacing with the adaptive limiter against a server that throttles above a rate"""
+    http_cache.CACHE_ENABLED = False
+    rate_limiter.LIMITER_ENABLED = True
+    technique_ids = [f"T{1000 + i}" for i in range(page_count)]
+
+    print(f"🚀 Rate limit benchmark: {page_count} pages, server tolerates {tolerated_rate} requests/sec")
+    print("-" * 78)
+    print(f"{'pacing':<30}{'seconds':>9}{'pages/sec':>11}{'pages':>8}{'429s':>7}{'peak rate':>12}")
+    for label, fixed in ((f"fixed {fixed_interval}s spacing", True), ("adaptive AIMD", False)):
+        server, counts = start_throttling_server(tolerated_rate)
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        rate_limiter._limiters.clear()
+        if fixed:
+            rate = 1 / fixed_interval
+            rate_limiter._limiters[f"127.0.0.1:{server.server_address[1]}"] = rate_limiter.AdaptiveRateLimiter(
+                'fixed', rate=rate, min_rate=rate, max_rate=rate)
+        try:
+            start = time.perf_counter()
+            results = fetch_all(
+                technique_ids,
+                lambda tech_id: get_technique_url(tech_id, base_url),
+                parse_technique_description,
+                concurrency=8,
+                per_host_limit=8,
+                max_retries=5,
+                progress=False
+            )
+            elapsed = time.perf_counter() - start
+        finally:
+            server.shutdown()
+        limiter = rate_limiter.get_host_limiter(base_url)
+        print(f"{label:<30}{elapsed:>9.1f}{len(results) / elapsed:>11.1f}{len(results):>8}{counts['throttled']:>7}"
+              f"{limiter.stats['peak_rate']:>10.1f}/s")
+    print("-" * 78)
+
+
+def build_matrix_html(rows):
+    """Rebuild a matrix page (tactic header, counts and technique cells) from per-tactic technique rows"""
+    tactics = {}
+    for row in rows:
+        parents = tactics.setdefault(row['tactic'], {})
+        if row['is_subtechnique']:
+            parents.setdefault(row['parent_technique_id'], [row['parent_technique'], []])[1].append(row)
+        else:
+            parents.setdefault(row['technique_id'], [row['name'], []])[0] = row['name']
+
+    def href(tech_id):
+        return '/techniques/' + tech_id.replace('.', '/')
+
+    html = ['<html><body><table class="matrix side"><tr>']
+    html += [f'<td class="tactic name"><a href="/tactics/{name}">{name}</a></td>' for name in tactics]
+    html.append('</tr><tr>')
+    html += [f'<td class="tactic count">{len(parents)} techniques</td>' for parents in tactics.values()]
+    html.append('</tr><tr>')
+    for parents in tactics.values():
+        html.append('<td class="tactic">')
+        html += [f'<a href="{href(tech_id)}">{name}</a>' for tech_id, (name, _) in parents.items()]
+        html.append('</td><td class="subtechniques-td">')
+        html += [f'<a href="{href(sub["technique_id"])}">{sub["name"]}</a>'
+                 for _, subs in parents.values() for sub in subs]
+        html.append('</td>')
+    html.append('</tr></table></body></html>')
+    return ''.join(html)
+
+
+def benchmark_pipeline(latency=0.1, concurrency=16):
+    """Compare the old parse -> fetch -> write sequence with the pipelined extraction on the windows matrix"""
+    http_cache.CACHE_ENABLED = False
+    rate_limiter.LIMITER_ENABLED = False
+    mitre_data_extractor.STORE_ENABLED = False
+    html_content = build_matrix_html(list(iter_records('mitreshire_windows_techniques.json')))
+    server = start_stand_in_server(latency)
+    mitre_data_extractor.MITRE_BASE_URL = f"http://127.0.0.1:{server.server_address[1]}"
+    devnull = open(os.devnull, 'w')
+
+    def sequential():
+        data = mitre_data_extractor.parse_matrix_data(html_content, 'windows')
+        ids = [t['technique_id'] for t in data['techniques']]
+        descriptions = mitre_data_extractor.fetch_technique_descriptions(ids, concurrency)
+        for technique in data['techniques']:
+            technique['description'] = descriptions.get(technique['technique_id'], '')
+        first_record = time.perf_counter()
+        write_records(output_filename('windows', 'techniques'), data['techniques'])
+        return first_record
+
+    def pipelined():
+        # The real streaming path: parse_and_save writes each record through record_writer as it settles
+        first_record = []
+        open_writer = mitre_data_extractor.record_writer
+
+        def timed_writer(filename):
+            writer = open_writer(filename)
+            write = writer.write
+
+            def write_first(record):
+                if not first_record:
+                    first_record.append(time.perf_counter())
+                write(record)
+            writer.write = write_first
+            return writer
+
+        mitre_data_extractor.record_writer = timed_writer
+        try:
+            mitre_data_extractor.parse_and_save(html_content, 'windows', fetch_descriptions=True,
+                                                concurrency=concurrency)
+        finally:
+            mitre_data_extractor.record_writer = open_writer
+        return first_record[0]
+
+    print(f"🚀 Pipeline benchmark: windows matrix, {latency * 1000:.0f}ms latency, concurrency {concurrency}, "
+          f"{parse_pool.PARSE_WORKERS} parse worker{'s' if parse_pool.PARSE_WORKERS > 1 else ''}")
+    print("-" * 70)
+    print(f"{'mode':<14}{'first record':>14}{'total':>10}")
+    original_dir = os.getcwd()
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            os.chdir(workdir)
+            for label, run in (('sequential', sequential), ('pipelined', pipelined)):
+                start = time.perf_counter()
+                stdout, sys.stdout = sys.stdout, devnull
+                try:
+                    first_record = run()
+                finally:
+                    sys.stdout = stdout
+                total = time.perf_counter() - start
+                print(f"{label:<14}{first_record - start:>13.2f}s{total:>9.2f}s")
+    finally:
+        os.chdir(original_dir)
+        server.shutdown()
+        devnull.close()
+    print("-" * 70)
+
+
+def measure_retained(load):
+    """Return (traced bytes still held by load()'s result, result)"""
+    tracemalloc.start()
+    result = load()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return retained, result
+
+
+def benchmark_records():
+    """Memory held by every platform's technique file loaded at once: plain dicts vs interned TechniqueRecords"""
+    filenames = sorted(glob.glob('mitreshire_*_techniques.json'))
+
+    def load_dicts():
+        records = []
+        for filename in filenames:
+            with open(filename, 'r', encoding='utf-8') as f:
+                records.extend(json.load(f))
+        return records
+
+    def load_interned():
+        interner = RecordInterner()
+        return [interner.record(record) for filename in filenames for record in iter_records(filename)]
+
+    print(f"🚀 Record memory benchmark: {len(filenames)} platform files loaded together")
+    print("-" * 60)
+    baseline = None
+    for label, load in (('dicts', load_dicts), ('TechniqueRecord', load_interned)):
+        retained, records = measure_retained(load)
+        baseline = baseline or retained
+        print(f"  {label:<16} {len(records):>6} records  {retained / 1024 / 1024:6.1f}MB held  "
+              f"({retained / len(records):5.0f} bytes/record, {retained / baseline:4.0%} of dicts)")
+        del records
+    print("-" * 60)
+
+
+def build_atlas_document(technique_count=160, case_study_count=40, steps_per_case_study=12):
+    """A synthetic ATLAS.yaml structure (dist layout) at roughly the size of the real release"""
+    import datetime
+    tactic_ids = [f"AML.TA{i:04d}" for i in range(16)]
+    tactics = [{'id': tactic_id, 'object-type': 'tactic', 'name': f"Tactic {i}",
+                'description': f"Adversaries use tactic {i} against AI-enabled systems. " * 4}
+               for i, tactic_id in enumerate(tactic_ids)]
+    techniques = []
+    for i in range(technique_count):
+        parent_id = f"AML.T{i // 3:04d}"
+        technique = {
+            'id': parent_id if i % 3 == 0 else f"{parent_id}.{i % 3:03d}",
+            'object-type': 'technique',
+            'name': f"Technique {i}",
+            'description': f"Adversaries may abuse machine learning component {i} to reach their goal. " * 6,
+            'tactics': [tactic_ids[i % len(tactic_ids)], tactic_ids[(i * 7) % len(tactic_ids)]],
+            'created_date': datetime.date(2021, 1 + i % 12, 1 + i % 28),
+            'modified_date': datetime.date(2024, 1 + i % 12, 1 + i % 28),
+        }
+        if i % 3:
+            technique['subtechnique-of'] = parent_id
+        techniques.append(technique)
+    case_studies = []
+    for i in range(case_study_count):
+        case_studies.append({
+            'id': f"AML.CS{i:04d}",
+            'object-type': 'case-study',
+            'name': f"Case study {i}",
+            'summary': f"An incident in which an AI system was attacked, number {i}. " * 8,
+            'incident-date': datetime.date(2020 + i % 5, 1 + i % 12, 1),
+            'incident-date-granularity': 'MONTH',
+            'procedure': [
+                {'tactic': tactic_ids[(i + step) % len(tactic_ids)],
+                 'technique': techniques[(i * 13 + step * 7) % technique_count]['id'],
+                 'description': f"Step {step}: the actor used the technique against the target. " * 3}
+                for step in range(steps_per_case_study)
+            ],
+            'target': f"Target system {i}",
+            'actor': f"Actor {i % 9}",
+            'case-study-type': 'incident' if i % 2 else 'exercise',
+            'references': [{'title': f"Reference {i}", 'url': f"https://example.org/{i}"}],
+        })
+    return {
+        'id': 'ATLAS',
+        'name': 'Adversarial Threat Landscape for AI Systems',
+        'version': '4.9.0',
+        'matrices': [{'id': 'ATLAS', 'name': 'ATLAS Machine Learning Threat Matrix',
+                      'tactics': tactics, 'techniques': techniques}],
+        'case-studies': case_studies,
+    }
+
+
+def benchmark_atlas_yaml(repeat=3):
+    """Cold parse (pure-Python and libyaml) versus a warm snapshot load of a synthetic ATLAS.yaml"""
+    import yaml
+    import atlas_yaml
+
+    text = yaml.safe_dump(build_atlas_document(), sort_keys=False)
+    print(f"🚀 ATLAS YAML benchmark: {len(text) / 1024:.0f} KB document, best of {repeat}")
+    print("-" * 60)
+
+    def best(load):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            data = load()
+            times.append(time.perf_counter() - start)
+        return min(times), data
+
+    reference_time, reference = best(lambda: yaml.load(text, Loader=yaml.SafeLoader))
+    print(f"  {'yaml.safe_load (pure Python)':<32} {reference_time * 1000:8.1f} ms")
+    if atlas_yaml.LIBYAML_AVAILABLE:
+        c_time, c_data = best(lambda: yaml.load(text, Loader=yaml.CSafeLoader))
+        print(f"  {'CSafeLoader (libyaml)':<32} {c_time * 1000:8.1f} ms  "
+              f"({reference_time / c_time:4.1f}x){'' if c_data == reference else '  ⚠️ output differs'}")
+    else:
+        print("  CSafeLoader unavailable (PyYAML built without libyaml)")
+
+    snapshot_dir = tempfile.mkdtemp(prefix='atlas_snapshots_')
+    atlas_yaml.SNAPSHOT_DIR = snapshot_dir
+    try:
+        start = time.perf_counter()
+        atlas_yaml.load_yaml(text)
+        cold = time.perf_counter() - start
+        print(f"  {'load_yaml, cold (parse + save)':<32} {cold * 1000:8.1f} ms")
+        warm, warm_data = best(lambda: atlas_yaml.load_yaml(text))
+        print(f"  {'load_yaml, warm (snapshot)':<32} {warm * 1000:8.1f} ms  "
+              f"({reference_time / warm:4.0f}x){'' if warm_data == reference else '  ⚠️ output differs'}")
+    finally:
+        shutil.rmtree(snapshot_dir)
+    print("-" * 60)
+
+
+def build_atlas_data_files(technique_count=100):
+    """Synthetic atlas-data/data tactics and techniques lists, with every kind of tactic reference"""
+    from atlas_tactics_techniques import ATLAS_TACTIC_ORDER, TACTIC_ALIASES, tactic_key
+
+    template_names = {name: alias for alias, name in TACTIC_ALIASES.items()}
+    tactics = [{'id': f"AML.TA{i:04d}", 'object-type': 'tactic', 'name': name}
+               for i, name in enumerate(ATLAS_TACTIC_ORDER)]
+    techniques = []
+    for i in range(technique_count):
+        tactic = tactics[i % len(tactics)]
+        other = tactics[(i * 7) % len(tactics)]
+        references = [
+            f"{{{{{template_names.get(tactic['name'], tactic_key(tactic['name']))}.id}}}}",
+            other['id'] if i % 2 else other['name'],
+        ]
+        technique_id = f"AML.T{i // 3:04d}" + (f".{i % 3:03d}" if i % 3 else '')
+        techniques.append({'id': technique_id, 'object-type': 'technique', 'name': f"Technique {i}",
+                           'description': f"Technique {i} description. " * 8, 'tactics': references})
+    return tactics, techniques
+
+
+def benchmark_atlas_tactics(scales=(1, 10, 100), base_count=150, repeat=3):
+    """organize_techniques_by_tactic + order_tactics on 1x/10x/100x synthetic ATLAS technique lists"""
+    import contextlib
+    import io
+    from atlas_tactics_techniques import organize_techniques_by_tactic, order_tactics
+
+    print(f"🚀 ATLAS tactic resolver benchmark: {base_count} techniques x {', '.join(f'{s}x' for s in scales)}, "
+          f"best of {repeat}")
+    print("-" * 60)
+    for scale in scales:
+        tactics, techniques = build_atlas_data_files(base_count * scale)
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                ordered = order_tactics(organize_techniques_by_tactic(tactics, techniques))
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        placed = sum(len(data['techniques']) + len(data['subtechniques']) for _, data in ordered)
+        print(f"  {scale:>4}x {len(techniques):>7} techniques  {best * 1000:8.1f} ms  "
+              f"{best / len(techniques) * 1e6:5.2f} µs/technique  ({placed} placements)")
+    print("-" * 60)
+
+
+def build_atlas_repo_files(case_study_count=120):
+    """Synthetic atlas-data/data files ({path: bytes}): tactics, techniques and one file per case study"""
+    import yaml
+
+    document = build_atlas_document(case_study_count=case_study_count)
+    matrix = document['matrices'][0]
+    files = {
+        'data/tactics.yaml': yaml.safe_dump(matrix['tactics'], sort_keys=False).encode('utf-8'),
+        'data/techniques.yaml': yaml.safe_dump(matrix['techniques'], sort_keys=False).encode('utf-8'),
+        'data/matrix.yaml': yaml.safe_dump({'id': matrix['id'], 'name': matrix['name']}).encode('utf-8'),
+    }
+    for case_study in document['case-studies']:
+        files[f"data/case-studies/{case_study['id']}.yaml"] = yaml.safe_dump(case_study, sort_keys=False).encode('utf-8')
+    return files
+
+
+def start_github_stand_in(files, repo='mitre-atlas/atlas-data', latency=0.05):
+    """Local mock of the GitHub endpoints the ATLAS crawler uses, serving files ({path: bytes})
+
+    Answers the recursive git tree API, the per-directory contents API and
+    raw.githubusercontent.com-style file URLs; server.requests counts
+    requests by kind and server.downloaded lists the raw paths served.
+    Changing files afterwards changes what is served. server.listed
+    ({path: bytes}) adds or overrides tree entries without serving them:
+    an entry for a served file reports a SHA its download will not match,
+    one for any other path lists a file whose download fails (404).
+    """
+    from atlas_repo import git_blob_sha
+
+    class GitHubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def _send(self, status, body, content_type='application/json'):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            time.sleep(latency)
+            path = self.path.split('?')[0]
+            base = f"http://127.0.0.1:{self.server.server_address[1]}"
+            if path.startswith(f"/repos/{repo}/git/trees/"):
+                server.requests['tree'] += 1
+                listed = {**files, **server.listed}
+                tree = [{'path': name, 'mode': '100644', 'type': 'blob', 'sha': git_blob_sha(body), 'size': len(body)}
+                        for name, body in sorted(listed.items())]
+                directories = sorted({name.rsplit('/', 1)[0] for name in listed})
+                tree += [{'path': name, 'mode': '040000', 'type': 'tree', 'sha': '0' * 40} for name in directories]
+                self._send(200, json.dumps({'sha': '0' * 40, 'tree': tree, 'truncated': False}).encode('utf-8'))
+            elif path.startswith(f"/repos/{repo}/contents/"):
+                server.requests['contents'] += 1
+                directory = path[len(f"/repos/{repo}/contents/"):].strip('/')
+                entries = {}
+                for name in files:
+                    if name.startswith(directory + '/'):
+                        child = name[len(directory) + 1:].split('/')[0]
+                        is_file = '/' not in name[len(directory) + 1:]
+                        entries[child] = {
+                            'name': child, 'path': f"{directory}/{child}", 'type': 'file' if is_file else 'dir',
+                            'download_url': f"{base}/{repo}/main/{directory}/{child}" if is_file else None,
+                        }
+                self._send(200, json.dumps(list(entries.values())).encode('utf-8'))
+            elif path.startswith(f"/{repo}/"):
+                server.requests['raw'] += 1
+                name = path[len(f"/{repo}/"):].split('/', 1)[1]
+                server.downloaded.append(name)
+                if name in files:
+                    self._send(200, files[name], 'text/plain; charset=utf-8')
+                else:
+                    self._send(404, b'Not Found', 'text/plain')
+            else:
+                self._send(404, b'Not Found', 'text/plain')
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), GitHubHandler)
+    server.daemon_threads = True
+    server.requests = {'tree': 0, 'contents': 0, 'raw': 0}
+    server.downloaded = []
+    server.listed = {}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def benchmark_atlas_crawl(case_study_count=120, latency=0.05, changed=5):
+    """Per-directory listing + serial downloads versus the tree crawler, cold, warm and after a few edits"""
+    import contextlib
+    import io
+    import atlas_repo
+    from atlas_yaml import parse_yaml
+
+    http_cache.CACHE_ENABLED = False
+    rate_limiter.LIMITER_ENABLED = False
+    files = build_atlas_repo_files(case_study_count)
+    server = start_github_stand_in(files, latency=latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    blob_dir = tempfile.mkdtemp(prefix='atlas_blobs_')
+    atlas_repo.BLOB_CACHE_PATH = os.path.join(blob_dir, 'atlas_blobs.sqlite3')
+
+    print(f"🚀 ATLAS crawl benchmark: {len(files)} files ({case_study_count} case studies), "
+          f"{latency * 1000:.0f}ms simulated latency")
+    print("-" * 60)
+
+    def report(label, elapsed, parsed):
+        requests_made = sum(server.requests.values())
+        print(f"  {label:<34} {elapsed:6.2f}s  {requests_made:>4} requests  {parsed:>4} files parsed")
+        for kind in server.requests:
+            server.requests[kind] = 0
+        server.downloaded.clear()
+
+    def check(ok, message):
+        if not ok:
+            print(f"❌ {message}")
+            sys.exit(1)
+
+    def cached_shas(bodies):
+        cache = atlas_repo.BlobCache(atlas_repo.BLOB_CACHE_PATH)
+        try:
+            return set(cache.get_many({atlas_repo.git_blob_sha(body) for body in bodies}))
+        finally:
+            cache.close()
+
+    try:
+        # What atlas_matrix_extractor used to do: list each directory, fetch and parse every file in turn
+        start = time.perf_counter()
+        parsed = 0
+        pending = ['data']
+        while pending:
+            listing = http_client.pooled_get(f"{base_url}/repos/mitre-atlas/atlas-data/contents/{pending.pop()}").json()
+            for item in listing:
+                if item['type'] == 'dir':
+                    pending.append(item['path'])
+                else:
+                    parse_yaml(http_client.pooled_get(item['download_url']).text)
+                    parsed += 1
+        report('per-directory listing, serial', time.perf_counter() - start, parsed)
+
+        def crawl(label, downloads, failed=()):
+            """Crawl, report, and check that exactly downloads were fetched and failed failed"""
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                _, documents, errors = atlas_repo.crawl_atlas_data(api_url=base_url, raw_url=base_url, progress=False)
+            elapsed = time.perf_counter() - start
+            check(server.requests == {'tree': 1, 'contents': 0, 'raw': len(downloads)},
+                  f"{label}: expected 1 tree call and {len(downloads)} downloads, got {server.requests}")
+            check(sorted(server.downloaded) == sorted(downloads), f"{label}: downloaded files other than the changed ones")
+            check(errors == {path: 'download failed' for path in failed}, f"{label}: unexpected errors {errors}")
+            check(set(documents) == set(files), f"{label}: parsed {len(documents)}/{len(files)} files")
+            report(label, elapsed, len(documents))
+
+        crawl('tree crawl, cold blob cache', list(files))
+        check(cached_shas(files.values()) == {atlas_repo.git_blob_sha(body) for body in files.values()},
+              "cold crawl did not cache every downloaded file")
+        crawl('tree crawl, unchanged', [])
+        edited = sorted(files)[-changed:]
+        for name in edited:
+            files[name] += b'\n# edited\n'
+        crawl(f"tree crawl, {changed} files changed", edited)
+
+        # The tree lists one file at a SHA its download does not match, and one file that cannot be downloaded
+        stale, missing = sorted(files)[0], 'data/case-studies/AML.CS9999.yaml'
+        server.listed = {stale: files[stale] + b'# tree version\n', missing: b'id: AML.CS9999\n'}
+        crawl('tree crawl, stale + missing file', [stale, missing], failed=[missing])
+        check(not cached_shas([server.listed[stale]]), "a download that does not match its tree SHA was cached")
+        # Neither is cached, so the next crawl tries both again and nothing else
+        crawl('tree crawl, stale + missing again', [stale, missing], failed=[missing])
+    finally:
+        server.shutdown()
+        shutil.rmtree(blob_dir)
+    print("-" * 60)
+    print("✅ Only changed files were downloaded, mismatched blobs were not cached and failed downloads were reported")
+
+
+def benchmark_atlas_index(case_study_count=400, technique_count=300, query_count=2000, k=10):
+    """Procedure-step scans versus the case-study index for technique lookups and top-k related techniques"""
+    import random
+    from collections import Counter
+    import atlas_case_index
+    from atlas_case_index import CaseStudyIndex
+
+    document = build_atlas_document(technique_count=technique_count, case_study_count=case_study_count)
+    case_studies = document['case-studies']
+    technique_ids = [technique['id'] for technique in document['matrices'][0]['techniques']]
+    queries = [random.Random(i).choice(technique_ids) for i in range(query_count)]
+    backend = 'NumPy' if atlas_case_index.numpy is not None else 'pure-Python'
+
+    print(f"🚀 ATLAS case-study index benchmark: {case_study_count} case studies, {technique_count} techniques, "
+          f"{query_count} queries ({backend})")
+    print("-" * 60)
+
+    def scan_case_studies(technique_id):
+        return tuple(cs['id'] for cs in case_studies if any(step['technique'] == technique_id for step in cs['procedure']))
+
+    def scan_related(technique_id):
+        counts = Counter()
+        for cs in case_studies:
+            used = {step['technique'] for step in cs['procedure']}
+            if technique_id in used:
+                counts.update(used - {technique_id})
+        return counts
+
+    def timed(label, run, count):
+        start = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<34} {elapsed * 1000:9.1f} ms  ({elapsed / count * 1e6:8.1f} µs each)")
+        return result
+
+    scan_counts = timed('scan: case studies per technique', lambda: [scan_case_studies(q) for q in queries], query_count)
+    timed('scan: top-k related', lambda: [scan_related(q) for q in queries[:200]], 200)
+    index = timed('build index', lambda: CaseStudyIndex.build(case_studies, technique_ids), 1)
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'case_index.pickle')
+        index.save(path)
+        loaded = timed(f"load index ({os.path.getsize(path) / 1024:.0f} KB)", lambda: CaseStudyIndex.load(path), 1)
+    index_counts = timed('index: case studies per technique', lambda: [loaded.case_studies_for(q) for q in queries],
+                         query_count)
+    related = timed('index: top-k related', lambda: [loaded.related_techniques(q, k) for q in queries], query_count)
+    print("-" * 60)
+    if index_counts != scan_counts:
+        print("❌ Index lookups differ from the procedure scan")
+        sys.exit(1)
+    for query, top in zip(queries[:200], related):
+        expected = scan_related(query)
+        # Ties at the cut-off may pick different techniques; the counts must agree
+        if (any(expected[technique_id] != count for technique_id, count in top)
+                or [count for _, count in top] != [count for _, count in expected.most_common(k)]):
+            print(f"❌ Related techniques for {query} differ from the procedure scan")
+            sys.exit(1)
+    print("✅ Index results match the procedure scan")
+
+
+BENCHMARKS = {
+    'fetch': benchmark_fetch,
+    'parse': benchmark_parse,
+    'output': benchmark_output,
+    'merge': benchmark_merge,
+    'connections': benchmark_connections,
+    'ratelimit': benchmark_rate_limit,
+    'pipeline': benchmark_pipeline,
+    'records': benchmark_records,
+    'atlas-yaml': benchmark_atlas_yaml,
+    'atlas-tactics': benchmark_atlas_tactics,
+    'atlas-crawl': benchmark_atlas_crawl,
+    'atlas-index': benchmark_atlas_index,
+}
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in BENCHMARKS:
+        print("Usage: python3 benchmark_extraction.py <benchmark>")
+        print(f"Benchmarks: {', '.join(BENCHMARKS)}")
+        sys.exit(1)
+
+    BENCHMARKS[sys.argv[1]]()
+
+
+if __name__ == "__main__":
+    main()
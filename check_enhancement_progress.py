@@ -1,65 +1,260 @@
 #!/usr/bin/env python3
 """
 Progress checker for description enhancement
+Counts come from a streaming pass over each technique file (one record in
+memory at a time), run across files in parallel and cached by file mtime
+and size, so unchanged files are not read again.
+
+--watch tails the checkpoint journals the extractor and the enhancer write
+while they run and reports live progress, rate and ETA without reading the
+output files at all.
+
+Usage: python3 check_enhancement_progress.py
+       python3 check_enhancement_progress.py --watch [journal.jsonl ...] [--interval SECONDS]
 """
 
+import glob
 import json
 import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+from checkpoint_journal import JOURNAL_DIR
+from mitreshire_output import find_output_file, iter_records, write_json_atomic
+
+PLATFORMS = [
+    'windows', 'macos', 'linux', 'cloud', 'containers',
+    'officesuite', 'identity_provider', 'saas', 'iaas', 'network_devices', 'ai'
+]
+
+CACHE_PATH = os.environ.get('MITRE_PROGRESS_CACHE', os.path.join(JOURNAL_DIR, 'progress_cache.json'))
+
+WATCH_INTERVAL = 2.0
+RATE_WINDOW = 60  # seconds of journal entries the live rate is averaged over
+
+def progress_bar(percentage):
+    return "█" * (percentage // 5) + "░" * (20 - (percentage // 5))
+
+def count_descriptions(filename):
+    """Stream a technique file and return (total records, records with a description)"""
+    total = with_descriptions = 0
+    for technique in iter_records(filename):
+        total += 1
+        if (technique.get('description') or '').strip():
+            with_descriptions += 1
+    return total, with_descriptions
+
+def _file_signature(filename):
+    stat = os.stat(filename)
+    return [stat.st_mtime_ns, stat.st_size]
+
+def load_cache():
+    try:
+        with open(CACHE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache):
+    try:
+        directory = os.path.dirname(CACHE_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        write_json_atomic(CACHE_PATH, cache)
+    except OSError as e:
+        print(f"⚠️ Could not save progress cache {CACHE_PATH}: {e}")
+
 def check_platform_progress(platform):
     """Check description progress for a platform"""
-    filename = f"mitreshire_{platform}_techniques.json"
-    
-    if not os.path.exists(filename):
+    filename = find_output_file(platform)
+
+    if filename is None:
         return None, None, "File not found"
-    
+
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            techniques = json.load(f)
-        
-        total = len(techniques)
-        with_descriptions = len([t for t in techniques if t.get('description', '').strip()])
-        
+        total, with_descriptions = count_descriptions(filename)
         return total, with_descriptions, "OK"
     except Exception as e:
         return None, None, f"Error: {e}"
 
+def check_all_progress(platforms, workers=None):
+    """Return {platform: (total, with_descriptions, status)}, re-counting only files changed since the last check"""
+    cache = load_cache()
+    results = {}
+    stale = {}
+    for platform in platforms:
+        filename = find_output_file(platform)
+        if filename is None:
+            results[platform] = (None, None, "File not found")
+            continue
+        entry = cache.get(filename)
+        if entry and entry['signature'] == _file_signature(filename):
+            results[platform] = (entry['total'], entry['with_descriptions'], "OK")
+        else:
+            stale[platform] = filename
+
+    if stale:
+        workers = min(workers or os.cpu_count() or 1, len(stale))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                counted = dict(zip(stale, pool.map(check_platform_progress, stale)))
+        else:
+            counted = {platform: check_platform_progress(platform) for platform in stale}
+
+        for platform, filename in stale.items():
+            results[platform] = counted[platform]
+            total, with_descriptions, status = counted[platform]
+            if status == "OK":
+                cache[filename] = {'signature': _file_signature(filename), 'total': total,
+                                   'with_descriptions': with_descriptions}
+        save_cache(cache)
+
+    return {platform: results[platform] for platform in platforms}
+
+class JournalTail:
+    """Incrementally reads one checkpoint journal and keeps the current run's counters"""
+
+    def __init__(self, path):
+        self.path = path
+        self._offset = 0
+        self._partial = b''
+        self._reset()
+
+    def _reset(self):
+        self.queued = 0
+        self.done = 0
+        self.failed = 0
+        self.started = None
+        self.finished = False
+        self._recent = deque()  # timestamps of recent results, for the rate
+
+    def poll(self):
+        """Read whatever was appended since the last poll; returns True if anything changed"""
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return False
+        if size < self._offset:
+            # A fresh run truncated the journal
+            self._offset, self._partial = 0, b''
+            self._reset()
+        if size == self._offset:
+            return False
+
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            data = self._partial + f.read(size - self._offset)
+        self._offset = size
+        *lines, self._partial = data.split(b'\n')
+        for line in lines:
+            try:
+                self._apply(json.loads(line))
+            except ValueError:
+                continue
+        return True
+
+    def _apply(self, entry):
+        timestamp = datetime.fromisoformat(entry['timestamp']).timestamp() if 'timestamp' in entry else time.time()
+        event = entry.get('event')
+        if event == 'start':
+            self._reset()
+            self.started = timestamp
+        elif event == 'queued':
+            self.queued += entry['count']
+        elif event == 'end':
+            self.finished = True
+        elif 'technique_id' in entry:
+            if entry['status'] == 'done':
+                self.done += 1
+            else:
+                self.failed += 1
+            self._recent.append(timestamp)
+            if self.started is None:
+                self.started = timestamp
+
+    def rate(self, now=None):
+        """Results per second over the last RATE_WINDOW seconds"""
+        now = now or time.time()
+        while self._recent and self._recent[0] < now - RATE_WINDOW:
+            self._recent.popleft()
+        if not self._recent:
+            return 0.0
+        span = min(RATE_WINDOW, now - (self.started or self._recent[0]))
+        return len(self._recent) / span if span > 0 else 0.0
+
+    def status_line(self):
+        settled = self.done + self.failed
+        # Journals written before runs logged their queue have no total; count what settled
+        queued = max(self.queued, settled)
+        remaining = queued - settled
+        rate = self.rate()
+        percentage = int(settled / queued * 100) if queued else 0
+        if self.finished:
+            eta = "done"
+        elif remaining == 0:
+            # Everything queued so far has settled, but the run may still queue more
+            eta = "ETA --:--"
+        elif rate > 0:
+            eta = f"ETA {int(remaining / rate) // 60}:{int(remaining / rate) % 60:02d}"
+        else:
+            eta = "ETA --:--"
+        name = os.path.basename(self.path)
+        return (f"{name:<36} │{progress_bar(percentage)}│ {settled:>4}/{queued:<4} ({percentage:>3}%) "
+                f"⚠️ {self.failed:<3} {rate:5.1f}/s  {eta}")
+
+def watch_journals(paths=None, interval=WATCH_INTERVAL):
+    """Tail checkpoint journals (all of JOURNAL_DIR by default) and print live progress until interrupted"""
+    print(f"📡 Watching {'journals in ' + JOURNAL_DIR if not paths else ', '.join(paths)} (Ctrl+C to stop)")
+    tails = {}
+    try:
+        while True:
+            for path in paths or sorted(glob.glob(os.path.join(JOURNAL_DIR, '*.jsonl'))):
+                if path not in tails:
+                    tails[path] = JournalTail(path)
+            changed = [tail for tail in tails.values() if tail.poll()]
+            if changed:
+                print(f"🕐 {datetime.now().strftime('%H:%M:%S')}")
+                for tail in changed:
+                    print(f"  {tail.status_line()}")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+
 def main():
-    platforms = [
-        'windows', 'macos', 'linux', 'cloud', 'containers',
-        'officesuite', 'identity_provider', 'saas', 'iaas', 'network_devices', 'ai'
-    ]
-    
+    if '--watch' in sys.argv:
+        interval = float(sys.argv[sys.argv.index('--interval') + 1]) if '--interval' in sys.argv else WATCH_INTERVAL
+        paths = [arg for arg in sys.argv[1:] if arg.endswith('.jsonl')]
+        watch_journals(paths, interval)
+        return
+
     print("📊 DESCRIPTION ENHANCEMENT PROGRESS CHECK")
     print("=" * 60)
     print(f"🕐 Current time: {datetime.now().strftime('%H:%M:%S')}")
     print("")
-    
+
     total_techniques = 0
     total_with_descriptions = 0
-    
-    for platform in platforms:
-        total, with_desc, status = check_platform_progress(platform)
-        
+
+    for platform, (total, with_desc, status) in check_all_progress(PLATFORMS).items():
         if total is not None and with_desc is not None:
             percentage = int((with_desc / total) * 100) if total > 0 else 0
-            progress_bar = "█" * (percentage // 5) + "░" * (20 - (percentage // 5))
-            
-            print(f"{platform:<18} │{progress_bar}│ {with_desc:>3}/{total:<3} ({percentage:>3}%)")
-            
+
+            print(f"{platform:<18} │{progress_bar(percentage)}│ {with_desc:>3}/{total:<3} ({percentage:>3}%)")
+
             total_techniques += total
             total_with_descriptions += with_desc
         else:
             print(f"{platform:<18} │{'░' * 20}│ {status}")
-    
+
     print("-" * 60)
     overall_percentage = int((total_with_descriptions / total_techniques) * 100) if total_techniques > 0 else 0
-    overall_bar = "█" * (overall_percentage // 5) + "░" * (20 - (overall_percentage // 5))
-    
-    print(f"{'OVERALL':<18} │{overall_bar}│ {total_with_descriptions:>3}/{total_techniques:<3} ({overall_percentage:>3}%)")
+
+    print(f"{'OVERALL':<18} │{progress_bar(overall_percentage)}│ {total_with_descriptions:>3}/{total_techniques:<3} ({overall_percentage:>3}%)")
     print("=" * 60)
-    
+
     if overall_percentage == 100:
         print("🎉 All techniques have descriptions!")
     elif overall_percentage > 0:
@@ -68,4 +263,4 @@ def main():
         print("⏳ Enhancement not started yet")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
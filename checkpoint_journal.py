@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Checkpoint Journal for MitreShiled Description Runs
+Append-only JSON-lines journal with one fsync'd line per fetched technique,
+written by the extractor and the enhancer as results arrive. A crashed or
+interrupted run can be resumed by replaying the journal; techniques whose
+fetch failed form a retry queue for a follow-up pass.
+
+Runs also log how many techniques they queue for fetching ('queued'
+events) and when they have finished ('end'), so
+`check_enhancement_progress.py --watch` can tail a journal for live rate
+and ETA.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+
+JOURNAL_DIR = os.environ.get('MITRE_JOURNAL_DIR', '.checkpoints')
+
+
+def journal_filename(platform):
+    """Journal path for a platform (shared by the extractor and the enhancer)"""
+    return os.path.join(JOURNAL_DIR, f"descriptions_{platform.lower()}.jsonl")
+
+
+class CheckpointJournal:
+    """Durable per-technique progress log"""
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # A fresh run starts a new journal; a resumed run keeps appending to the old one
+        self._file = open(path, 'a' if resume else 'w', encoding='utf-8')
+        # Marks where this run's entries begin (progress watchers restart their counts here)
+        self._append({'event': 'start', 'resume': resume, 'timestamp': datetime.now().isoformat()})
+
+    def record(self, technique_id, description, details=None):
+        """Append one technique result (with its page details, if any) and force it to disk before returning"""
+        entry = {
+            'technique_id': technique_id,
+            'status': 'done' if description else 'failed',
+            'description': description or '',
+            'timestamp': datetime.now().isoformat()
+        }
+        if details:
+            entry['details'] = details
+        self._append(entry)
+
+    def queued(self, technique_ids):
+        """Log that technique_ids are about to be fetched (progress watchers add these up for the ETA)"""
+        count = len(technique_ids)
+        if count:
+            self._append({'event': 'queued', 'count': count, 'timestamp': datetime.now().isoformat()})
+
+    def finish(self):
+        """Log that the run has settled everything it will queue (watchers only report "done" after this)"""
+        self._append({'event': 'end', 'timestamp': datetime.now().isoformat()})
+
+    def _append(self, entry):
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def replay_journal(path, details=None):
+    """Return ({technique_id: description} for completed IDs, set of IDs whose latest attempt failed)
+
+    Page details journaled with completed IDs are added to details when given.
+    """
+    completed, failed = {}, set()
+    if not os.path.exists(path):
+        return completed, failed
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A torn final line from a crash mid-write; everything before it is intact
+                continue
+            if 'technique_id' not in entry:
+                continue
+            tech_id = entry['technique_id']
+            if entry['status'] == 'done':
+                completed[tech_id] = entry['description']
+                failed.discard(tech_id)
+                if details is not None and entry.get('details'):
+                    details[tech_id] = entry['details']
+            else:
+                failed.add(tech_id)
+                completed.pop(tech_id, None)
+    return completed, failed
+
+
+def plan_resume(path, technique_ids, mode, details=None):
+    """Apply a resume mode to the IDs a run would fetch
+
+    mode 'resume' skips every ID the journal already settled (failures are
+    queued for a retry pass); mode 'retry-failed' fetches only the queued
+    failures. Returns (carried {id: description}, ids still to fetch);
+    the carried IDs' page details are added to details when given.
+    """
+    journaled = {}
+    completed, failed = replay_journal(path, journaled)
+    carried = {tech_id: completed[tech_id] for tech_id in technique_ids if tech_id in completed}
+    if details is not None:
+        details.update((tech_id, journaled[tech_id]) for tech_id in carried if tech_id in journaled)
+    if mode == 'retry-failed':
+        to_fetch = set(technique_ids) & failed
+    else:
+        to_fetch = set(technique_ids) - set(completed) - failed
+    print(f"🔁 Journal {path}: {len(completed)} completed, {len(failed)} in retry queue → {len(to_fetch)} to fetch")
+    return carried, to_fetch
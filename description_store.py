@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Shared Technique Description Store for MitreShiled
+Cross-platform cache of technique descriptions keyed by technique_id,
+stored with the other fields parsed from the same page (see technique_page.py)
+Concurrent platform runs coordinate through claim rows (single-flight),
+so each technique page is fetched at most once no matter how many
+platform matrices it appears on
+
+Usage: python3 description_store.py   (prints the fetch savings report)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+DEFAULT_STORE_PATH = os.environ.get('MITRE_DESCRIPTION_STORE_PATH', os.path.join('.http_cache', 'descriptions.sqlite3'))
+DEFAULT_MAX_AGE = int(os.environ.get('MITRE_DESCRIPTION_MAX_AGE', 7 * 24 * 3600))  # seconds before a refetch
+STORE_ENABLED = os.environ.get('MITRE_DESCRIPTION_STORE', 'on').lower() not in ('0', 'off', 'false', 'no')
+
+# A claim not completed within this many seconds is assumed abandoned and may be taken over
+CLAIM_LEASE = 300
+CLAIM_CHUNK_SIZE = 32
+# Claimed chunks being fetched at once (the next chunk is claimed while the previous one finishes)
+CLAIM_PIPELINE_DEPTH = 2
+POLL_INTERVAL = 0.5
+
+
+class DescriptionStore:
+    """SQLite-backed description store with single-flight fetch claims"""
+
+    def __init__(self, path=DEFAULT_STORE_PATH, max_age=DEFAULT_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self.stats = {'requested': 0, 'from_store': 0, 'fetched': 0, 'from_other_runs': 0, 'failed': 0}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript('''
+            CREATE TABLE IF NOT EXISTS descriptions (
+                technique_id TEXT PRIMARY KEY,
+                description TEXT NOT NULL DEFAULT '',
+                details TEXT NOT NULL DEFAULT '',
+                status TEXT NOT NULL,
+                owner TEXT,
+                fetch_count INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS usage (
+                technique_id TEXT NOT NULL,
+                platform TEXT NOT NULL,
+                PRIMARY KEY (technique_id, platform)
+            );
+        ''')
+        columns = {row[1] for row in self._db.execute('PRAGMA table_info(descriptions)')}
+        if 'details' not in columns:
+            # Stores created before page details were kept
+            self._db.execute("ALTER TABLE descriptions ADD COLUMN details TEXT NOT NULL DEFAULT ''")
+        self._db.commit()
+        self._owner = f"{os.getpid()}-{id(self)}"
+
+    def _is_fresh(self, tech_id, updated_at, now, run_started, refresh):
+        """A stored description is usable if it is young enough (and, for refresh IDs, fetched during this run)"""
+        if tech_id in refresh:
+            return updated_at >= run_started
+        return now - updated_at < self.max_age
+
+    def _claim(self, technique_ids, run_started, refresh):
+        """Atomically take ownership of up to CLAIM_CHUNK_SIZE IDs that nobody is fetching"""
+        now = time.time()
+        claimed = []
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            for tech_id in technique_ids:
+                row = self._db.execute(
+                    'SELECT status, updated_at FROM descriptions WHERE technique_id = ?', (tech_id,)
+                ).fetchone()
+                if row is None:
+                    self._db.execute(
+                        "INSERT INTO descriptions (technique_id, status, owner, updated_at) VALUES (?, 'pending', ?, ?)",
+                        (tech_id, self._owner, now)
+                    )
+                else:
+                    status, updated_at = row
+                    claimable = (
+                        (status == 'done' and not self._is_fresh(tech_id, updated_at, now, run_started, refresh))
+                        or (status == 'failed' and updated_at < run_started)
+                        or (status == 'pending' and now - updated_at >= CLAIM_LEASE)
+                    )
+                    if not claimable:
+                        continue
+                    self._db.execute(
+                        "UPDATE descriptions SET status = 'pending', owner = ?, updated_at = ? WHERE technique_id = ?",
+                        (self._owner, now, tech_id)
+                    )
+                claimed.append(tech_id)
+                if len(claimed) >= CLAIM_CHUNK_SIZE:
+                    break
+            self._db.commit()
+        return claimed
+
+    def _complete(self, technique_ids, results, details):
+        """Record fetched descriptions (and page details); IDs without a result are marked failed for this run"""
+        now = time.time()
+        with self._lock:
+            for tech_id in technique_ids:
+                description = results.get(tech_id, '')
+                fields = details.get(tech_id)
+                self._db.execute(
+                    'UPDATE descriptions SET description = ?, details = ?, status = ?, fetch_count = fetch_count + 1, '
+                    'updated_at = ? WHERE technique_id = ? AND owner = ?',
+                    (description, json.dumps(fields, ensure_ascii=False) if fields else '',
+                     'done' if description else 'failed', now, tech_id, self._owner)
+                )
+            self._db.commit()
+
+    def _settled(self, technique_ids, run_started, refresh, details):
+        """Return {technique_id: description} for IDs that are done, plus the set that failed this run
+
+        The stored page details of done IDs are added to details.
+        """
+        done, failed = {}, set()
+        now = time.time()
+        with self._lock:
+            for tech_id in technique_ids:
+                row = self._db.execute(
+                    'SELECT description, details, status, updated_at FROM descriptions WHERE technique_id = ?',
+                    (tech_id,)
+                ).fetchone()
+                if not row:
+                    continue
+                description, fields, status, updated_at = row
+                if status == 'done' and self._is_fresh(tech_id, updated_at, now, run_started, refresh):
+                    done[tech_id] = description
+                    if fields and tech_id not in details:
+                        details[tech_id] = json.loads(fields)
+                elif status == 'failed' and updated_at >= run_started:
+                    failed.add(tech_id)
+        return done, failed
+
+    def record_usage(self, technique_ids, platform):
+        """Remember which platforms use each technique (feeds the savings report)"""
+        with self._lock:
+            self._db.executemany(
+                'INSERT OR IGNORE INTO usage (technique_id, platform) VALUES (?, ?)',
+                [(tech_id, platform) for tech_id in technique_ids]
+            )
+            self._db.commit()
+
+    def resolve(self, technique_ids, fetch_many, platform=None, refresh=(), details=None, on_pending=None):
+        """Return {technique_id: description}, calling fetch_many(ids) only for IDs no run has fetched yet
+
+        IDs in refresh (e.g. renamed techniques) ignore stored descriptions from earlier runs.
+        IDs are claimed and fetched in the order given; up to CLAIM_PIPELINE_DEPTH
+        claimed chunks are fetched at once, so fetch_many must be thread-safe.
+
+        details ({technique_id: page fields}) is the dict fetch_many fills with
+        the rest of each page; it is stored with the descriptions and filled
+        from the store for IDs fetched by earlier or concurrent runs.
+
+        on_pending(ids) is called once, before anything is claimed, with the
+        IDs no run has fetched yet (this run fetches them unless a concurrent
+        run gets there first).
+        """
+        details = {} if details is None else details
+        order = list(dict.fromkeys(technique_ids))
+        technique_ids = set(order)
+        refresh = set(refresh)
+        run_started = time.time()
+        self.stats['requested'] += len(technique_ids)
+        if platform:
+            self.record_usage(technique_ids, platform)
+
+        results, failed = self._settled(technique_ids, run_started, refresh, details)
+        self.stats['from_store'] += len(results)
+        fetched_here = set()
+        pending = technique_ids - set(results) - failed
+        if on_pending:
+            on_pending([tech_id for tech_id in order if tech_id in pending])
+
+        in_flight = {}  # future -> IDs it is fetching
+        with ThreadPoolExecutor(max_workers=CLAIM_PIPELINE_DEPTH, thread_name_prefix='description-claim') as executor:
+            while pending:
+                # Claim the next chunk while earlier ones are still fetching, so the fetcher
+                # never sits idle waiting for the slowest page of a chunk
+                claimed = []
+                if len(in_flight) < CLAIM_PIPELINE_DEPTH:
+                    fetching = {tech_id for ids in in_flight.values() for tech_id in ids}
+                    claimable = [tech_id for tech_id in order if tech_id in pending and tech_id not in fetching]
+                    claimed = self._claim(claimable, run_started, refresh)
+                if claimed:
+                    in_flight[executor.submit(fetch_many, claimed)] = claimed
+                    continue
+
+                if in_flight:
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        ids = in_flight.pop(future)
+                        self._complete(ids, future.result(), details)
+                        fetched_here.update(ids)
+                        self.stats['fetched'] += len(ids)
+                else:
+                    # Everything left is being fetched by another run; wait for it to land
+                    time.sleep(POLL_INTERVAL)
+
+                done, failed_now = self._settled(pending, run_started, refresh, details)
+                self.stats['from_other_runs'] += len(set(done) - fetched_here)
+                results.update(done)
+                failed |= failed_now
+                pending -= set(done) | failed_now
+
+        self.stats['failed'] += len(failed)
+        return results
+
+    def summary(self):
+        """One-line counter summary for the end of a run"""
+        s = self.stats
+        saved = s['requested'] - s['fetched']
+        return (f"📚 Description store: {s['requested']} requested, {s['from_store']} already stored, "
+                f"{s['from_other_runs']} from concurrent runs, {s['fetched']} fetched, {s['failed']} failed "
+                f"→ {saved} network fetches saved")
+
+    def savings_report(self):
+        """Cumulative cross-platform report: technique lookups versus actual network fetches"""
+        with self._lock:
+            lookups = self._db.execute('SELECT COUNT(*) FROM usage').fetchone()[0]
+            fetches = self._db.execute('SELECT COALESCE(SUM(fetch_count), 0) FROM descriptions').fetchone()[0]
+            stored = self._db.execute("SELECT COUNT(*) FROM descriptions WHERE status = 'done'").fetchone()[0]
+            per_platform = self._db.execute(
+                'SELECT platform, COUNT(*) FROM usage GROUP BY platform ORDER BY platform'
+            ).fetchall()
+            shared = self._db.execute(
+                'SELECT COUNT(*) FROM (SELECT technique_id FROM usage GROUP BY technique_id HAVING COUNT(*) > 1)'
+            ).fetchone()[0]
+        return {
+            'platform_lookups': lookups,
+            'network_fetches': fetches,
+            'fetches_saved': max(lookups - fetches, 0),
+            'stored_descriptions': stored,
+            'shared_techniques': shared,
+            'per_platform': dict(per_platform),
+        }
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_description_store():
+    """Return the process-wide store, creating it on first use"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = DescriptionStore()
+        return _default_store
+
+
+def print_store_stats():
+    """Print the store counters if the store was used in this run"""
+    if _default_store is not None:
+        print(_default_store.summary())
+
+
+def main():
+    if not os.path.exists(DEFAULT_STORE_PATH):
+        print(f"❌ No description store at {DEFAULT_STORE_PATH}")
+        return
+
+    report = DescriptionStore().savings_report()
+    print("📚 DESCRIPTION STORE REPORT")
+    print("=" * 60)
+    for platform, count in report['per_platform'].items():
+        print(f"  {platform:<20} {count:>5} techniques")
+    print("-" * 60)
+    print(f"  Stored descriptions:        {report['stored_descriptions']}")
+    print(f"  Techniques on 2+ platforms: {report['shared_techniques']}")
+    print(f"  Per-platform lookups:       {report['platform_lookups']}")
+    print(f"  Network fetches:            {report['network_fetches']}")
+    print(f"  Fetches saved:              {report['fetches_saved']}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
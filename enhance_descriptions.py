@@ -1,79 +1,148 @@
 #!/usr/bin/env python3
 """
 Description Enhancement Script for MitreShiled
-Adds detailed descriptions to existing technique files that lack them
+Adds detailed descriptions to existing technique files that lack them,
+along with the other sections of each technique page (see technique_page.py)
+
+Usage: python3 enhance_descriptions.py [--resume | --retry-failed] [--profile] [--metrics-out FILE]
+       python3 enhance_descriptions.py --batch [--concurrency N] [--resume | --retry-failed]
+
+--batch loads every mitreshire_*_techniques.json at once and fetches each
+technique missing a description a single time, however many platform files
+list it.
 """
 
 import requests
-from bs4 import BeautifulSoup
-import json
-import time
+import glob
 import re
 import sys
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from async_fetcher import fetch_all
+from http_cache import print_cache_stats
+from http_client import pooled_get
+from rate_limiter import print_limiter_stats
+from html_backend import parse_full
+from checkpoint_journal import CheckpointJournal, journal_filename, plan_resume
+from mitreshire_output import copy_atomic, iter_records, write_json_atomic
+from record_fingerprint import RecordFingerprinter, has_per_tactic_rows, previous_fingerprints
+from technique_record import RecordInterner
+from technique_page import apply_page_details, extract_page_details, parse_page_sections
+from run_metrics import enable_metrics, phase, report_metrics_at_exit, timed
+from page_archive import archive_response, print_archive_stats
+from parse_pool import in_parse_pool
 
-def fetch_technique_description(technique_id, max_retries=3):
-    """Fetch description for a specific technique from MITRE ATT&CK website"""
+# Concurrent technique page fetches in --batch mode (see async_fetcher.py)
+BATCH_CONCURRENCY = 8
+
+# Technique files --batch leaves alone: ATLAS techniques have no attack.mitre.org page
+BATCH_EXCLUDED_PLATFORMS = ('ai',)
+
+def technique_url(technique_id):
+    """attack.mitre.org page URL for a technique or sub-technique ID"""
     if '.' in technique_id:
         # Sub-technique URL format
         base_id, sub_id = technique_id.split('.')
-        url = f"https://attack.mitre.org/techniques/{base_id}/{sub_id}/"
-    else:
-        # Parent technique URL format
-        url = f"https://attack.mitre.org/techniques/{technique_id}/"
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
-    for attempt in range(max_retries):
-        try:
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find description using the working selector
-            description_element = soup.find('div', class_='description-body')
-            if description_element:
-                description = description_element.get_text(strip=True)
-                if description and len(description) > 50:
-                    return description
-            
-            # Fallback to first substantial paragraph
-            paragraphs = soup.find_all('p')
-            for p in paragraphs:
-                text = p.get_text(strip=True)
-                if len(text) > 100 and not text.startswith('ID:'):
-                    return text
-                    
-            return ""
-            
-        except requests.RequestException as e:
-            print(f"  ⚠️ Attempt {attempt + 1} failed for {technique_id}: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(2 ** attempt)  # Exponential backoff
-            continue
+        return f"https://attack.mitre.org/techniques/{base_id}/{sub_id}/"
+    # Parent technique URL format
+    return f"https://attack.mitre.org/techniques/{technique_id}/"
+
+def fetch_technique_page(technique_id, max_retries=3):
+    """Fetch a technique page from MITRE ATT&CK website: its description plus the page details ({} on failure)"""
+    url = technique_url(technique_id)
     
-    print(f"  ❌ Failed to fetch description for {technique_id} after {max_retries} attempts")
+    try:
+        # Pacing and retries are handled by the shared client's adaptive limiter
+        response = pooled_get(url, max_retries=max_retries)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"  ❌ Failed to fetch description for {technique_id} after {max_retries} attempts: {e}")
+        return {}
+    archive_response('technique', technique_id, response)
+    
+    with phase('parse_description'):
+        return parse_technique_page(response.text)
+
+def parse_technique_page(html_content):
+    """Description plus page details from one partial parse of a technique page ({} when there is no description)"""
+    sections = parse_page_sections(html_content)
+    description = parse_description(html_content, sections)
+    if not description:
+        return {}
+    page = extract_page_details(sections)
+    page['description'] = description
+    return page
+
+def fetch_technique_description(technique_id, max_retries=3):
+    """Fetch description for a specific technique from MITRE ATT&CK website"""
+    return fetch_technique_page(technique_id, max_retries).get('description', '')
+
+def parse_description(html_content, sections=None):
+    """Extract the description text from a technique page (sections: an existing parse_page_sections tree)"""
+    # Find description using the working selector (fast path parses only that div)
+    if sections is None:
+        sections = parse_page_sections(html_content)
+    description_element = sections.find('div', class_='description-body')
+    if description_element:
+        description = description_element.get_text(strip=True)
+        if description and len(description) > 50:
+            return description
+    
+    # Fallback to first substantial paragraph
+    soup = parse_full(html_content)
+    paragraphs = soup.find_all('p')
+    for p in paragraphs:
+        text = p.get_text(strip=True)
+        if len(text) > 100 and not text.startswith('ID:'):
+            return text
+            
     return ""
 
-def enhance_platform_descriptions(platform):
-    """Enhance descriptions for a specific platform"""
+def apply_description(technique, description, interner, details=None):
+    """Fill a technique record with a fetched description (and page details), stamped with the run's shared timestamp"""
+    technique['description'] = interner.value(description)
+    if details:
+        apply_page_details(technique, details, interner)
+    technique['sync_source'] = interner.value('mitre_extractor_enhanced')
+    technique['last_updated'] = interner.timestamp
+
+def needs_description(technique):
+    return not technique.get('description') or technique.get('description').strip() == ''
+
+def backup_and_save(filename, techniques, platform):
+    """Snapshot the untouched file to <filename>.backup, then atomically replace it with techniques
+    
+    Records are stamped with content hashes and the platform manifest is
+    rewritten, so importers only see the records this run changed.
+    """
+    per_tactic_rows = has_per_tactic_rows(techniques)
+    # Read the previous fingerprints before the file is replaced
+    fingerprinter = RecordFingerprinter(previous_fingerprints(platform, per_tactic_rows), per_tactic_rows)
+    backup_filename = f"{filename}.backup"
+    copy_atomic(filename, backup_filename)
+    print(f"💾 Created backup: {backup_filename}")
+    write_json_atomic(filename, list(fingerprinter.stamp_all(techniques)))
+    fingerprinter.save_manifest(platform, filename)
+    print(fingerprinter.summary())
+
+def enhance_platform_descriptions(platform, resume_mode=None, interner=None):
+    """Enhance descriptions for a specific platform
+    
+    Every fetch is checkpointed to the platform journal as it completes;
+    resume_mode ('resume' or 'retry-failed') replays that journal first.
+    Records are loaded as compact TechniqueRecords through interner.
+    """
     filename = f"mitreshire_{platform}_techniques.json"
+    interner = interner or RecordInterner()
     
     try:
-        # Load existing techniques
-        with open(filename, 'r', encoding='utf-8') as f:
-            techniques = json.load(f)
+        # Load existing techniques one record at a time into compact records
+        with phase('load'):
+            techniques = [interner.record(t) for t in iter_records(filename)]
         
         print(f"📚 Loaded {len(techniques)} techniques for {platform}")
         
         # Find techniques without descriptions
-        techniques_needing_descriptions = [
-            t for t in techniques 
-            if not t.get('description') or t.get('description').strip() == ''
-        ]
+        techniques_needing_descriptions = [t for t in techniques if needs_description(t)]
         
         print(f"📝 Found {len(techniques_needing_descriptions)} techniques without descriptions")
         
@@ -81,39 +150,49 @@ def enhance_platform_descriptions(platform):
             print(f"✅ All {platform} techniques already have descriptions!")
             return True
         
-        # Fetch descriptions
-        print(f"🔄 Fetching descriptions (this may take several minutes)...")
         successful_fetches = 0
+        journal_path = journal_filename(platform)
         
-        for i, technique in enumerate(techniques_needing_descriptions):
-            tech_id = technique['technique_id']
-            print(f"📖 [{i+1}/{len(techniques_needing_descriptions)}] Fetching {tech_id}...")
-            
-            description = fetch_technique_description(tech_id)
-            if description:
-                technique['description'] = description
-                technique['sync_source'] = 'mitre_extractor_enhanced'
-                technique['last_updated'] = datetime.now().isoformat()
-                successful_fetches += 1
-                print(f"  ✅ Got description ({len(description)} chars)")
-            else:
-                print(f"  ⚠️ No description found")
-            
-            # Add delay to be respectful to MITRE's servers
-            if i < len(techniques_needing_descriptions) - 1:
-                time.sleep(3)
+        # Replay the journal of an interrupted run before touching the network
+        if resume_mode:
+            carried_details = {}
+            carried, ids_to_fetch = plan_resume(
+                journal_path, {t['technique_id'] for t in techniques_needing_descriptions}, resume_mode,
+                carried_details
+            )
+            for technique in techniques_needing_descriptions:
+                tech_id = technique['technique_id']
+                if tech_id in carried:
+                    apply_description(technique, carried[tech_id], interner, carried_details.get(tech_id))
+                    successful_fetches += 1
+            techniques_needing_descriptions = [
+                t for t in techniques_needing_descriptions if t['technique_id'] in ids_to_fetch
+            ]
         
-        # Save enhanced techniques
-        backup_filename = f"{filename}.backup"
+        # Fetch descriptions
+        print(f"🔄 Fetching descriptions (this may take several minutes)...")
         
-        # Create backup
-        with open(backup_filename, 'w', encoding='utf-8') as f:
-            json.dump(techniques, f, indent=2, ensure_ascii=False)
-        print(f"💾 Created backup: {backup_filename}")
+        with CheckpointJournal(journal_path, resume=bool(resume_mode)) as journal:
+            journal.queued(techniques_needing_descriptions)
+            for i, technique in enumerate(techniques_needing_descriptions):
+                tech_id = technique['technique_id']
+                print(f"📖 [{i+1}/{len(techniques_needing_descriptions)}] Fetching {tech_id}...")
+                
+                with phase('fetch_descriptions'):
+                    details = fetch_technique_page(tech_id)
+                description = details.pop('description', '')
+                journal.record(tech_id, description, details if description else None)
+                if description:
+                    apply_description(technique, description, interner, details)
+                    successful_fetches += 1
+                    print(f"  ✅ Got description ({len(description)} chars)")
+                else:
+                    print(f"  ⚠️ No description found")
+            journal.finish()
         
-        # Save enhanced version
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(techniques, f, indent=2, ensure_ascii=False)
+        # Save enhanced techniques (the backup is a copy of the file as it was before this run)
+        with phase('write_records'):
+            backup_and_save(filename, techniques, platform)
         
         print(f"✅ Enhanced {platform} techniques:")
         print(f"  📊 Total techniques: {len(techniques)}")
@@ -129,7 +208,130 @@ def enhance_platform_descriptions(platform):
         print(f"❌ Error enhancing {platform}: {e}")
         return False
 
+def find_technique_files():
+    """{platform: filename} for every mitreshire_*_techniques.json the batch mode enhances"""
+    files = {}
+    for filename in sorted(glob.glob("mitreshire_*_techniques.json")):
+        platform = filename[len("mitreshire_"):-len("_techniques.json")]
+        if platform not in BATCH_EXCLUDED_PLATFORMS:
+            files[platform] = filename
+    return files
+
+def load_technique_file(filename, interner):
+    """Load one technique file as compact TechniqueRecords"""
+    return [interner.record(t) for t in iter_records(filename)]
+
+def enhance_all_descriptions(resume_mode=None, concurrency=BATCH_CONCURRENCY):
+    """Enhance every technique file in one pass
+    
+    All files are loaded concurrently through one interner, the technique IDs
+    missing a description are de-duplicated across files and each is fetched
+    once with the concurrent fetcher, then every file that gained a
+    description is snapshotted to .backup and atomically rewritten.
+    Returns (successful platforms, failed platforms).
+    """
+    interner = RecordInterner()
+    files = find_technique_files()
+    if not files:
+        print("❌ No mitreshire_*_techniques.json files found")
+        return [], []
+    
+    # Load every platform file at once; one interner shares names and descriptions between them
+    loaded, failed_platforms = {}, []
+    with phase('load'), ThreadPoolExecutor(max_workers=len(files)) as pool:
+        futures = {platform: pool.submit(load_technique_file, filename, interner) for platform, filename in files.items()}
+        for platform, future in futures.items():
+            try:
+                loaded[platform] = future.result()
+                print(f"📚 Loaded {len(loaded[platform])} techniques for {platform}")
+            except (OSError, ValueError, EOFError) as e:
+                print(f"❌ Could not load {files[platform]}: {e}")
+                failed_platforms.append(platform)
+    
+    # Union of missing technique IDs, in first-seen order, with every record waiting on each
+    missing = {}
+    for platform, techniques in loaded.items():
+        for technique in techniques:
+            if needs_description(technique):
+                missing.setdefault(technique['technique_id'], []).append((platform, technique))
+    missing_records = sum(len(records) for records in missing.values())
+    print(f"\n📝 {missing_records} records across {len(loaded)} files lack descriptions "
+          f"→ {len(missing)} unique techniques to fetch")
+    
+    pages = {}
+    ids_to_fetch = list(missing)
+    journal_path = journal_filename('batch')
+    if resume_mode:
+        carried_details = {}
+        carried, to_fetch = plan_resume(journal_path, ids_to_fetch, resume_mode, carried_details)
+        pages.update((tech_id, dict(carried_details.get(tech_id, {}), description=description))
+                     for tech_id, description in carried.items())
+        ids_to_fetch = [tech_id for tech_id in ids_to_fetch if tech_id in to_fetch]
+    
+    if ids_to_fetch:
+        print(f"🔄 Fetching {len(ids_to_fetch)} technique pages with concurrency {concurrency}...")
+        with CheckpointJournal(journal_path, resume=bool(resume_mode)) as journal:
+            journal.queued(ids_to_fetch)
+            
+            def on_result(tech_id, page):
+                page = dict(page or {})
+                description = page.pop('description', '')
+                journal.record(tech_id, description, page if description else None)
+            
+            with phase('fetch_descriptions'):
+                pages.update(fetch_all(
+                    ids_to_fetch,
+                    technique_url,
+                    timed('parse_description', in_parse_pool(parse_technique_page)),
+                    concurrency=concurrency,
+                    on_result=on_result,
+                    on_page=lambda tech_id, response: archive_response('technique', tech_id, response)
+                ))
+            journal.finish()
+    
+    # Fill every waiting record from the single fetch of its technique
+    affected = {}
+    for tech_id, records in missing.items():
+        page = pages.get(tech_id)
+        if not page:
+            continue
+        details = {field: value for field, value in page.items() if field != 'description'}
+        for platform, technique in records:
+            apply_description(technique, page['description'], interner, details)
+            affected[platform] = affected.get(platform, 0) + 1
+    
+    successful_platforms = [platform for platform in loaded if platform not in affected]
+    with phase('write_records'):
+        for platform, count in affected.items():
+            try:
+                backup_and_save(files[platform], loaded[platform], platform)
+                print(f"✅ {platform}: added {count} descriptions → {files[platform]}")
+                successful_platforms.append(platform)
+            except OSError as e:
+                print(f"❌ Could not write {files[platform]}: {e}")
+                failed_platforms.append(platform)
+    
+    print(f"\n📊 {len(pages)}/{len(missing)} techniques fetched for {missing_records} records "
+          f"({missing_records - len(missing)} duplicate fetches avoided), {len(affected)} files rewritten")
+    return successful_platforms, failed_platforms
+
 def main():
+    resume_mode = 'retry-failed' if '--retry-failed' in sys.argv else 'resume' if '--resume' in sys.argv else None
+    profile = '--profile' in sys.argv
+    metrics_out = sys.argv[sys.argv.index('--metrics-out') + 1] if '--metrics-out' in sys.argv else None
+    if profile or metrics_out:
+        # Per-phase times, request latency percentiles and retries (JSON plus a Prometheus textfile)
+        enable_metrics('enhance_descriptions', profile)
+        report_metrics_at_exit(metrics_out)
+    
+    if '--batch' in sys.argv:
+        concurrency = int(sys.argv[sys.argv.index('--concurrency') + 1]) if '--concurrency' in sys.argv else BATCH_CONCURRENCY
+        print("🚀 MITRE Technique Description Enhancement (batch: all platform files at once)")
+        print("=" * 60)
+        successful_platforms, failed_platforms = enhance_all_descriptions(resume_mode, concurrency)
+        print_enhancement_summary(successful_platforms, failed_platforms)
+        return
+    
     platforms_to_enhance = [
         'windows', 'macos', 'linux', 'cloud', 
         'officesuite', 'identity_provider', 'saas', 'iaas', 'network_devices'
@@ -143,6 +345,10 @@ def main():
         print(f"  • {platform}")
     print("")
     print("⚠️ Note: Skipping 'containers' and 'ai' platforms (already have descriptions)")
+    if resume_mode == 'resume':
+        print("🔁 Resuming from checkpoint journals (settled techniques are skipped)")
+    elif resume_mode == 'retry-failed':
+        print("🔁 Retrying only techniques that failed in the journaled run")
     print("=" * 60)
     print("")
     
@@ -153,16 +359,14 @@ def main():
         print(f"\n🎯 [{i+1}/{len(platforms_to_enhance)}] Processing {platform.upper()} platform...")
         print("-" * 50)
         
-        if enhance_platform_descriptions(platform):
+        if enhance_platform_descriptions(platform, resume_mode):
             successful_platforms.append(platform)
         else:
             failed_platforms.append(platform)
-        
-        # Add delay between platforms
-        if i < len(platforms_to_enhance) - 1:
-            print("⏳ Waiting 30 seconds before next platform...")
-            time.sleep(30)
     
+    print_enhancement_summary(successful_platforms, failed_platforms)
+
+def print_enhancement_summary(successful_platforms, failed_platforms):
     # Final summary
     print("\n" + "=" * 60)
     print("📊 DESCRIPTION ENHANCEMENT SUMMARY")
@@ -180,4 +384,7 @@ def main():
     print("📝 Next step: Import enhanced files using: node import_all_fresh.cjs")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
+    print_cache_stats()
+    print_limiter_stats()
+    print_archive_stats()
@@ -102,6 +102,10 @@ else
     echo "🎉 All platforms extracted successfully!"
 fi
 
+# Report how many technique page fetches the shared description store saved
+echo ""
+python3 description_store.py
+
 echo ""
 echo "📝 Next steps:"
 echo "1. Review the generated JSON files"
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Pipelined Description Enrichment for MitreShiled
+Overlaps the three extraction stages instead of running them back to back:
+the parser hands each tactic's technique IDs to a background enrich stage
+as soon as the tactic is parsed, the enrich stage fetches descriptions
+while parsing continues, and the writer stage streams each record to the
+output file the moment its description has settled.
+"""
+
+import queue
+import threading
+import time
+
+
+class DescriptionPipeline:
+    """Background enrich stage fed with batches of technique IDs
+
+    fetch_batch(ids, on_result) must return {technique_id: description} and
+    may call on_result(technique_id, description) as each page completes, so
+    waiting writers are released before the whole batch is done.
+    """
+
+    def __init__(self, fetch_batch):
+        self._fetch_batch = fetch_batch
+        self._queue = queue.Queue()
+        self._condition = threading.Condition()
+        self._results = {}
+        self._expected = set()
+        self._thread = threading.Thread(target=self._run, name='description-enrich', daemon=True)
+        self._thread.start()
+
+    def submit(self, technique_ids):
+        """Queue IDs for fetching in the given order (output order, so early records settle first)
+
+        IDs already submitted are ignored.
+        """
+        with self._condition:
+            new_ids = [tech_id for tech_id in dict.fromkeys(technique_ids) if tech_id not in self._expected]
+            self._expected.update(new_ids)
+        if new_ids:
+            self._queue.put(new_ids)
+
+    def settle(self, technique_id, description):
+        """Record a description (from a fetch, or carried over without one) and wake waiting writers"""
+        with self._condition:
+            self._expected.add(technique_id)
+            if technique_id not in self._results or description:
+                self._results[technique_id] = description or ''
+            self._condition.notify_all()
+
+    def expects(self, technique_id):
+        with self._condition:
+            return technique_id in self._expected
+
+    def wait_for(self, technique_id):
+        """Block until technique_id has settled and return its description ('' when the fetch failed)"""
+        with self._condition:
+            self._condition.wait_for(lambda: technique_id in self._results)
+            return self._results[technique_id]
+
+    def close(self):
+        """No more IDs will be submitted; the enrich thread exits once the queue drains"""
+        self._queue.put(None)
+
+    def join(self):
+        self._thread.join()
+
+    def _run(self):
+        closed = False
+        while not closed:
+            batch = self._queue.get()
+            if batch is None:
+                return
+            # Coalesce everything queued meanwhile so the fetcher keeps its full concurrency
+            while True:
+                try:
+                    more = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if more is None:
+                    closed = True
+                    break
+                batch.extend(more)
+
+            try:
+                results = self._fetch_batch(batch, self.settle)
+            except Exception as e:
+                print(f"❌ Description fetch failed for a batch of {len(batch)} techniques: {e}")
+                results = {}
+            for technique_id in batch:
+                self.settle(technique_id, results.get(technique_id, ''))
+
+
+class StageTimer:
+    """Records when the first and last record left the writer stage"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.first_record = None
+        self.records = 0
+
+    def record_written(self):
+        if self.first_record is None:
+            self.first_record = time.perf_counter() - self.started
+        self.records += 1
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        first = f"{self.first_record:.2f}s" if self.first_record is not None else "n/a"
+        return f"⏱️ Pipeline: first record after {first}, {self.records} records in {elapsed:.2f}s"
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+HTML Parser Backends for MitreShiled
+The extractors only ever read one subtree of each page (the matrix table
+or the technique description), so the fast path builds just that subtree
+with a SoupStrainer instead of a tree for the whole document. When the
+fast path finds nothing, callers fall back to the original full parse.
+
+Backend selection (MITRE_HTML_BACKEND environment variable):
+  strainer  - html.parser restricted to the wanted subtree (default)
+  lxml      - lxml restricted to the wanted subtree (requires lxml; output may differ slightly)
+  full      - always build the full document tree (original behaviour)
+"""
+
+import os
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+
+def _strained(tree_builder):
+    def parse(html_content, name, class_):
+        return BeautifulSoup(html_content, tree_builder, parse_only=SoupStrainer(name, class_=class_))
+    return parse
+
+
+# Registry of subtree parsers; 'full' has no fast path
+BACKENDS = {
+    'strainer': _strained('html.parser'),
+    'full': None,
+}
+if LXML_AVAILABLE:
+    BACKENDS['lxml'] = _strained('lxml')
+
+DEFAULT_BACKEND = os.environ.get('MITRE_HTML_BACKEND', 'strainer')
+if DEFAULT_BACKEND not in BACKENDS:
+    print(f"⚠️ HTML backend '{DEFAULT_BACKEND}' unavailable, using 'strainer'")
+    DEFAULT_BACKEND = 'strainer'
+
+
+def parse_full(html_content):
+    """Build the full document tree (the original parsing path)"""
+    return BeautifulSoup(html_content, 'html.parser')
+
+
+def find_subtree(html_content, name=None, class_=None, backend=None):
+    """Return the first element matching name/class_ using only a partial parse, or None"""
+    parse = BACKENDS[backend or DEFAULT_BACKEND]
+    if parse is None:
+        return None
+    return parse(html_content, name, class_).find(name, class_=class_)
+
+
+def find_first(html_content, name, classes, backend=None):
+    """Return the first element of tag name matching the first class in classes that exists
+
+    Tries each class through the fast path, then repeats the search on the
+    full document so a page the fast path cannot handle still parses.
+    """
+    for class_ in classes:
+        element = find_subtree(html_content, name, class_, backend)
+        if element is not None:
+            return element
+
+    soup = parse_full(html_content)
+    for class_ in classes:
+        element = soup.find(name, class_=class_)
+        if element is not None:
+            return element
+    return None
+
+
+def parse_sections(html_content, name, classes, backend=None):
+    """Return a tree holding only the name elements of the given classes (one partial parse for several sections)
+
+    Falls back to the full document when the backend has no fast path or
+    none of the sections were found, so callers can search the result the
+    same way either way.
+    """
+    parse = BACKENDS[backend or DEFAULT_BACKEND]
+    if parse is not None:
+        soup = parse(html_content, name, list(classes))
+        if soup.find(name) is not None:
+            return soup
+    return parse_full(html_content)
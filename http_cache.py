@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Persistent HTTP Response Cache for MitreShiled
+On-disk, URL-keyed cache shared by every fetcher script
+Bodies are stored zlib-compressed with their ETag/Last-Modified validators,
+stale entries are revalidated with If-None-Match/If-Modified-Since and the
+cache is kept under a size budget by evicting least-recently-used entries
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Configuration (override with environment variables)
+DEFAULT_CACHE_PATH = os.environ.get('MITRE_HTTP_CACHE_PATH', os.path.join('.http_cache', 'responses.sqlite3'))
+DEFAULT_TTL = int(os.environ.get('MITRE_HTTP_CACHE_TTL', 6 * 3600))  # seconds before revalidation
+DEFAULT_MAX_BYTES = int(os.environ.get('MITRE_HTTP_CACHE_MAX_MB', 512)) * 1024 * 1024
+CACHE_ENABLED = os.environ.get('MITRE_HTTP_CACHE', 'on').lower() not in ('0', 'off', 'false', 'no')
+
+
+class HttpCache:
+    """URL-keyed conditional-GET cache backed by a SQLite file"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stored': 0, 'evicted': 0}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        ''')
+        self._db.execute('CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)')
+        self._db.commit()
+
+    def _lookup(self, url):
+        with self._lock:
+            return self._db.execute(
+                'SELECT body, headers, etag, last_modified, fetched_at FROM responses WHERE url = ?', (url,)
+            ).fetchone()
+
+    def _touch(self, url, refreshed=False):
+        now = time.time()
+        with self._lock:
+            if refreshed:
+                self._db.execute('UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE url = ?', (now, now, url))
+            else:
+                self._db.execute('UPDATE responses SET accessed_at = ? WHERE url = ?', (now, url))
+            self._db.commit()
+
+    def _store(self, url, response):
+        body = zlib.compress(response.content)
+        headers = json.dumps(dict(response.headers))
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, body, len(body), headers, response.headers.get('ETag'),
+                 response.headers.get('Last-Modified'), now, now)
+            )
+            self.stats['stored'] += 1
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        """Drop least-recently-used entries until the cache fits in max_bytes (caller holds the lock)"""
+        total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in self._db.execute('SELECT url, size FROM responses ORDER BY accessed_at').fetchall():
+            self._db.execute('DELETE FROM responses WHERE url = ?', (url,))
+            self.stats['evicted'] += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    @staticmethod
+    def _build_response(url, body, headers):
+        """Rebuild a requests.Response from a cached entry so callers can treat it like a live one"""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = zlib.decompress(body)
+        response.headers = CaseInsensitiveDict(json.loads(headers))
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers) or 'utf-8'
+        return response
+
+    def get(self, url, headers=None, http_get=requests.get, **kwargs):
+        """GET url, answering from the cache when fresh and revalidating when stale"""
+        entry = self._lookup(url)
+        request_headers = dict(headers or {})
+
+        if entry:
+            body, cached_headers, etag, last_modified, fetched_at = entry
+            if time.time() - fetched_at < self.ttl:
+                self.stats['hits'] += 1
+                self._touch(url)
+                return self._build_response(url, body, cached_headers)
+            if etag:
+                request_headers['If-None-Match'] = etag
+            if last_modified:
+                request_headers['If-Modified-Since'] = last_modified
+
+        response = http_get(url, headers=request_headers, **kwargs)
+
+        if entry and response.status_code == 304:
+            self.stats['revalidated'] += 1
+            self._touch(url, refreshed=True)
+            return self._build_response(url, entry[0], entry[1])
+
+        self.stats['misses'] += 1
+        if response.status_code == 200:
+            self._store(url, response)
+        return response
+
+    def summary(self):
+        """One-line counter summary for the end of a run"""
+        s = self.stats
+        return (f"🗄️ HTTP cache: {s['hits']} hits, {s['revalidated']} revalidated (304), "
+                f"{s['misses']} misses, {s['stored']} stored, {s['evicted']} evicted")
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache():
+    """Return the process-wide cache, creating it on first use"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = HttpCache()
+        return _default_cache
+
+
+def cached_get(url, http_get=requests.get, **kwargs):
+    """Drop-in replacement for requests.get that goes through the shared cache
+
+    http_get performs the network request (http_client passes its pooled session).
+    """
+    if not CACHE_ENABLED:
+        return http_get(url, **kwargs)
+    return get_default_cache().get(url, http_get=http_get, **kwargs)
+
+
+def print_cache_stats():
+    """Print the shared cache counters if the cache was used in this run"""
+    if _default_cache is not None:
+        print(_default_cache.summary())
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Client for MitreShiled
+One pooled keep-alive session per process for every scraper, so repeated
+requests to attack.mitre.org or GitHub reuse open TCP/TLS connections
+instead of handshaking per page. The client also owns the default
+headers, separate connect/read timeouts, TLS verification and the retry
+policy (retryable statuses, backoff honoring Retry-After).
+
+pooled_get() is the drop-in replacement for requests.get used by the
+scripts; responses still go through the shared response cache.
+
+Environment:
+  MITRE_HTTP_CONNECT_TIMEOUT / MITRE_HTTP_READ_TIMEOUT  seconds (default 10 / 30)
+  MITRE_HTTP_POOL_SIZE     connections kept per host (default 16)
+  MITRE_HTTP_VERIFY=off    skip TLS certificate checks (e.g. behind an intercepting proxy)
+  MITRE_HTTP2=on           multiplex over HTTP/2 (requires httpx with the h2 extra)
+"""
+
+import os
+import random
+import threading
+import time
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from http_cache import cached_get
+import rate_limiter
+from rate_limiter import CircuitOpenError, limited_call, parse_retry_after
+from run_metrics import record_request, record_retry
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+CONNECT_TIMEOUT = float(os.environ.get('MITRE_HTTP_CONNECT_TIMEOUT', 10))
+READ_TIMEOUT = float(os.environ.get('MITRE_HTTP_READ_TIMEOUT', 30))
+POOL_SIZE = int(os.environ.get('MITRE_HTTP_POOL_SIZE', 16))
+VERIFY_TLS = os.environ.get('MITRE_HTTP_VERIFY', 'on').lower() not in ('0', 'off', 'false', 'no')
+HTTP2_ENABLED = os.environ.get('MITRE_HTTP2', 'off').lower() in ('1', 'on', 'true', 'yes')
+
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 1.0
+
+# Status codes worth retrying (throttling and transient server errors)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+if not VERIFY_TLS:
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+
+def retry_delay(attempt, response=None, backoff_base=DEFAULT_BACKOFF_BASE):
+    """Backoff before a retry when the adaptive limiter is off, honoring Retry-After
+
+    With the limiter on, retries need no extra sleep: the failure already
+    lowered the host's rate (and paused it for any Retry-After).
+    """
+    if rate_limiter.LIMITER_ENABLED:
+        return 0.0
+    retry_after = parse_retry_after(response)
+    if retry_after is not None:
+        return retry_after
+    return backoff_base * (2 ** attempt) + random.uniform(0, backoff_base)
+
+
+class _Http2Session:
+    """Minimal requests-compatible wrapper over an httpx HTTP/2 client"""
+
+    def __init__(self):
+        self._client = httpx.Client(http2=True, headers=DEFAULT_HEADERS, verify=VERIFY_TLS,
+                                    limits=httpx.Limits(max_keepalive_connections=POOL_SIZE))
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        try:
+            reply = self._client.get(url, headers=headers, timeout=httpx.Timeout(read, connect=connect))
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(str(e))
+        except httpx.HTTPError as e:
+            raise requests.ConnectionError(str(e))
+        response = requests.Response()
+        response.status_code = reply.status_code
+        response.url = str(reply.url)
+        response._content = reply.content
+        response.headers = CaseInsensitiveDict(reply.headers)
+        response.encoding = reply.encoding
+        response.reason = reply.reason_phrase
+        return response
+
+
+def _create_session():
+    if HTTP2_ENABLED:
+        if httpx is not None:
+            return _Http2Session()
+        print("⚠️ MITRE_HTTP2=on but httpx is not installed (pip install 'httpx[http2]'), using HTTP/1.1")
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    session.verify = VERIFY_TLS
+    return session
+
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the process-wide pooled session (a forked worker gets its own)"""
+    global _session, _session_pid
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            _session = _create_session()
+            _session_pid = os.getpid()
+        return _session
+
+
+def _measured_get(url, headers, timeout, kwargs):
+    """One GET on the pooled session, reported to the run metrics (network time only, not pacing)"""
+    start = time.perf_counter()
+    try:
+        response = get_session().get(url, headers=headers, timeout=timeout, **kwargs)
+    except requests.RequestException:
+        record_request(time.perf_counter() - start, 0, 'error')
+        raise
+    record_request(time.perf_counter() - start, len(response.content), response.status_code)
+    return response
+
+
+def session_get(url, headers=None, timeout=None, **kwargs):
+    """Single GET over the pooled session, paced by the host's adaptive limiter"""
+    timeout = timeout or (CONNECT_TIMEOUT, READ_TIMEOUT)
+    return limited_call(url, lambda: _measured_get(url, headers, timeout, kwargs))
+
+
+def pooled_get(url, headers=None, max_retries=DEFAULT_MAX_RETRIES, backoff_base=DEFAULT_BACKOFF_BASE, **kwargs):
+    """Drop-in replacement for requests.get: cached, pooled, with timeouts and retries
+
+    Connection errors, timeouts and RETRY_STATUS_CODES are retried up to
+    max_retries attempts in total; the last response (or exception) is
+    returned to the caller as requests.get would. An open circuit fails
+    immediately with CircuitOpenError.
+    """
+    max_retries = max(max_retries, 1)
+    for attempt in range(max_retries):
+        response = None
+        try:
+            response = cached_get(url, headers=headers, http_get=session_get, **kwargs)
+            if response.status_code not in RETRY_STATUS_CODES or attempt == max_retries - 1:
+                return response
+            print(f"⚠️ Attempt {attempt + 1}/{max_retries} for {url}: HTTP {response.status_code}")
+        except CircuitOpenError:
+            raise
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt == max_retries - 1:
+                raise
+            print(f"⚠️ Attempt {attempt + 1}/{max_retries} failed for {url}: {e}")
+        record_retry()
+        delay = retry_delay(attempt, response, backoff_base)
+        if delay:
+            time.sleep(delay)
+    return response
@@ -8,13 +8,37 @@ Enhanced with description extraction capability
 """
 
 import requests
-from bs4 import BeautifulSoup
-import json
+import os
 import re
 import sys
-from datetime import datetime
 import time
-import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from async_fetcher import fetch_all
+from http_cache import print_cache_stats
+from http_client import pooled_get
+from rate_limiter import print_limiter_stats
+from description_store import STORE_ENABLED, get_description_store, print_store_stats
+from stix_source import STIX_PLATFORMS, read_attack_bundle
+from extraction_pipeline import DescriptionPipeline, StageTimer
+from technique_merge import merge_technique_records, merge_tactic_techniques
+from technique_record import RecordInterner
+from technique_page import apply_page_details, extract_page_details, parse_page_sections
+from mitreshire_output import (COMPRESSION_SUFFIXES, OUTPUT_FORMATS, output_filename, record_writer, write_json_atomic,
+                               write_records)
+from html_backend import find_first, find_subtree, parse_full
+from checkpoint_journal import CheckpointJournal, journal_filename, plan_resume
+from record_fingerprint import RecordFingerprinter, manifest_filename, previous_fingerprints
+from technique_delta import (build_change_manifest, diff_techniques, index_techniques, load_previous_techniques,
+                             plan_description_fetches, save_change_manifest)
+from request_budget import RequestBudget, set_request_budget
+from run_metrics import enable_metrics, get_metrics, phase, report_metrics_at_exit, timed
+from page_archive import archive_response, get_page_archive, print_archive_stats, read_page
+from parse_pool import disable_parse_pool, in_parse_pool
+
+MITRE_BASE_URL = "https://attack.mitre.org"
+
+# Concurrent technique page fetches used by --descriptions (see async_fetcher.py)
+DEFAULT_CONCURRENCY = 8
 
 # MitreShiled tactic mapping (exact names used in the application)
 MITRE_SHIELD_TACTICS = {
@@ -49,112 +73,207 @@ PLATFORM_MAPPING = {
     "network_devices": "Network Devices"
 }
 
-def fetch_technique_description(technique_id, max_retries=3):
-    """Fetch technique description from individual technique page"""
+# Matrix page for each extractable platform
+MATRIX_URLS = {
+    "windows": "https://attack.mitre.org/matrices/enterprise/windows/",
+    "macos": "https://attack.mitre.org/matrices/enterprise/macos/",
+    "linux": "https://attack.mitre.org/matrices/enterprise/linux/",
+    "cloud": "https://attack.mitre.org/matrices/enterprise/cloud/",
+    "containers": "https://attack.mitre.org/matrices/enterprise/containers/",
+    "officesuite": "https://attack.mitre.org/matrices/enterprise/cloud/officesuite/",
+    "identity_provider": "https://attack.mitre.org/matrices/enterprise/cloud/identityprovider/",
+    "saas": "https://attack.mitre.org/matrices/enterprise/cloud/saas/",
+    "iaas": "https://attack.mitre.org/matrices/enterprise/cloud/iaas/",
+    "network_devices": "https://attack.mitre.org/matrices/enterprise/network-devices/"
+}
+
+# Platforms processed by `mitre_data_extractor.py all`
+ALL_PLATFORMS = list(MATRIX_URLS)
+
+# Global request budget shared by every worker of an `all` run
+ALL_PLATFORMS_MAX_IN_FLIGHT = 8
+ALL_PLATFORMS_MIN_INTERVAL = 0.1
+
+def get_technique_url(technique_id, base_url=None):
+    """Build the technique page URL for a technique or sub-technique ID"""
+    base_url = base_url or MITRE_BASE_URL
     if '.' in technique_id:
         # Sub-technique URL format
         base_id, sub_id = technique_id.split('.')
-        url = f"https://attack.mitre.org/techniques/{base_id}/{sub_id}/"
-    else:
-        # Parent technique URL format
-        url = f"https://attack.mitre.org/techniques/{technique_id}/"
+        return f"{base_url}/techniques/{base_id}/{sub_id}/"
+    # Parent technique URL format
+    return f"{base_url}/techniques/{technique_id}/"
+
+def clean_description(description):
+    """Normalize whitespace and strip citation markers from description text"""
+    if description:
+        # Remove extra whitespace and normalize
+        description = re.sub(r'\s+', ' ', description)
+        description = description.strip()
+        
+        # Remove citation markers like (Citation: something)
+        description = re.sub(r'\(Citation:[^)]+\)', '', description)
+        description = re.sub(r'\s+', ' ', description).strip()
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+    return description if description else ""
+
+def parse_technique_description(html_content):
+    """Extract the cleaned description text from a technique page"""
+    # Fast path: build only the description subtree
+    desc_element = find_subtree(html_content, class_='description-body')
+    if desc_element is not None:
+        description = desc_element.get_text(strip=True)
+        if description:
+            return clean_description(description)
     
-    for attempt in range(max_retries):
-        try:
-            # Add random delay to be respectful to the server
-            time.sleep(random.uniform(0.5, 1.5))
-            
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find the description section
-            description = ""
-            
-            # Try multiple selectors to find the description
-            description_selectors = [
-                '.description-body',
-                '.technique-description',
-                '[data-description]',
-                '.card-data p'
-            ]
-            
-            for selector in description_selectors:
-                desc_element = soup.select_one(selector)
-                if desc_element:
-                    # Get text content and clean it up
-                    description = desc_element.get_text(strip=True)
-                    break
-            
-            # If no specific selector works, try to find description in card-data
-            if not description:
-                card_data = soup.find('div', class_='card-data')
-                if card_data and hasattr(card_data, 'find_all'):
-                    # Look for the first substantial paragraph
-                    paragraphs = card_data.find_all('p')
-                    for p in paragraphs:
-                        if hasattr(p, 'get_text'):
-                            text = p.get_text(strip=True)
-                            if len(text) > 50:  # Only consider substantial paragraphs
-                                description = text
-                                break
-            
-            # Clean up the description
-            if description:
-                # Remove extra whitespace and normalize
-                description = re.sub(r'\s+', ' ', description)
-                description = description.strip()
-                
-                # Remove citation markers like (Citation: something)
-                description = re.sub(r'\(Citation:[^)]+\)', '', description)
-                description = re.sub(r'\s+', ' ', description).strip()
-            
-            return description if description else ""
-            
-        except requests.RequestException as e:
-            print(f"⚠️ Attempt {attempt + 1}/{max_retries} failed for {technique_id}: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(random.uniform(2, 5))  # Longer delay between retries
-            else:
-                print(f"❌ Failed to fetch description for {technique_id} after {max_retries} attempts")
-                return ""
-        except Exception as e:
-            print(f"❌ Error parsing description for {technique_id}: {e}")
-            return ""
+    return parse_technique_description_full(html_content)
+
+def parse_technique_description_full(html_content):
+    """Extract the description from a full parse of the page (selector fallbacks included)"""
+    soup = parse_full(html_content)
+    
+    # Find the description section
+    description = ""
+    
+    # Try multiple selectors to find the description
+    description_selectors = [
+        '.description-body',
+        '.technique-description',
+        '[data-description]',
+        '.card-data p'
+    ]
     
-    return ""
+    for selector in description_selectors:
+        desc_element = soup.select_one(selector)
+        if desc_element:
+            # Get text content and clean it up
+            description = desc_element.get_text(strip=True)
+            break
+    
+    # If no specific selector works, try to find description in card-data
+    if not description:
+        card_data = soup.find('div', class_='card-data')
+        if card_data and hasattr(card_data, 'find_all'):
+            # Look for the first substantial paragraph
+            paragraphs = card_data.find_all('p')
+            for p in paragraphs:
+                if hasattr(p, 'get_text'):
+                    text = p.get_text(strip=True)
+                    if len(text) > 50:  # Only consider substantial paragraphs
+                        description = text
+                        break
+    
+    return clean_description(description)
 
-def fetch_matrix_page(platform="windows"):
-    """Fetch the MITRE ATT&CK Matrix webpage for specified platform"""
-    platform_urls = {
-        "windows": "https://attack.mitre.org/matrices/enterprise/windows/",
-        "macos": "https://attack.mitre.org/matrices/enterprise/macos/",
-        "linux": "https://attack.mitre.org/matrices/enterprise/linux/",
-        "cloud": "https://attack.mitre.org/matrices/enterprise/cloud/",
-        "containers": "https://attack.mitre.org/matrices/enterprise/containers/",
-        "officesuite": "https://attack.mitre.org/matrices/enterprise/cloud/officesuite/",
-        "identity_provider": "https://attack.mitre.org/matrices/enterprise/cloud/identityprovider/",
-        "saas": "https://attack.mitre.org/matrices/enterprise/cloud/saas/",
-        "iaas": "https://attack.mitre.org/matrices/enterprise/cloud/iaas/",
-        "network_devices": "https://attack.mitre.org/matrices/enterprise/network-devices/"
-    }
+def parse_technique_page(html_content):
+    """Extract the cleaned description and every structured section (see technique_page.py) from one parse
     
-    url = platform_urls.get(platform.lower(), f"https://attack.mitre.org/matrices/enterprise/{platform.lower()}/")
+    Returns {'description': ..., 'data_sources': [...], ...}; the description is
+    empty when the page has none.
+    """
+    sections = parse_page_sections(html_content)
+    page = extract_page_details(sections)
+    desc_element = sections.find(class_='description-body')
+    description = clean_description(desc_element.get_text(strip=True)) if desc_element is not None else ''
+    page['description'] = description or parse_technique_description_full(html_content)
+    return page
+
+def parse_technique_page_or_empty(html_content):
+    """parse_technique_page, but a page without a description counts as a failed fetch ({})"""
+    page = parse_technique_page(html_content)
+    return page if page['description'] else {}
+
+def fetch_technique_page(technique_id, max_retries=3):
+    """Fetch a technique page and return everything parse_technique_page extracts ({} on failure)"""
+    url = get_technique_url(technique_id)
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+    try:
+        # Pacing and retries are handled by the shared client's adaptive limiter
+        response = pooled_get(url, max_retries=max_retries)
+        response.raise_for_status()
+        archive_response('technique', technique_id, response)
+        
+        return parse_technique_page(response.text)
+        
+    except requests.RequestException as e:
+        print(f"❌ Failed to fetch description for {technique_id} after {max_retries} attempts: {e}")
+        return {}
+    except Exception as e:
+        print(f"❌ Error parsing description for {technique_id}: {e}")
+        return {}
+
+def fetch_technique_description(technique_id, max_retries=3):
+    """Fetch technique description from individual technique page"""
+    return fetch_technique_page(technique_id, max_retries).get('description', '')
+
+def fetch_technique_descriptions(technique_ids, concurrency=DEFAULT_CONCURRENCY, platform=None, refresh=(),
+                                 on_result=None, details=None, on_fetch=None):
+    """Fetch descriptions for many techniques concurrently, returning {technique_id: description}
+    
+    Descriptions come from the shared cross-platform store when another platform
+    run already fetched them; only the remaining IDs hit the network.
+    
+    Each page is parsed once for all of its sections, in the parse pool
+    (parse_pool.py) so parsing runs across cores: when details is given it
+    is filled with {technique_id: page fields} (data sources, detection,
+    mitigations, ...) before on_result(technique_id, description) is called.
+    on_fetch(ids) is called once, before fetching starts, with the IDs that will hit the network.
+    """
+    details = {} if details is None else details
+    
+    def on_page_result(tech_id, page):
+        if page:
+            details[tech_id] = {field: value for field, value in page.items() if field != 'description'}
+        if on_result:
+            on_result(tech_id, page['description'] if page else '')
+    
+    def fetch_many(ids):
+        pages = fetch_all(
+            list(ids),
+            get_technique_url,
+            timed('parse_description', in_parse_pool(parse_technique_page_or_empty)),
+            concurrency=concurrency,
+            on_result=on_page_result,
+            on_page=lambda tech_id, response: archive_response('technique', tech_id, response)
+        )
+        return {tech_id: page['description'] for tech_id, page in pages.items()}
+    
+    if not STORE_ENABLED:
+        if on_fetch:
+            on_fetch(technique_ids)
+        return fetch_many(technique_ids)
+    return get_description_store().resolve(technique_ids, fetch_many, platform=platform, refresh=refresh,
+                                           details=details, on_pending=on_fetch)
+
+def start_description_pipeline(platform, concurrency=DEFAULT_CONCURRENCY, refresh=(), resume=False, details=None):
+    """Start a background enrich stage that journals every fetched page; returns (journal, pipeline)
+    
+    Page details of every settled technique are collected in details.
+    """
+    journal = CheckpointJournal(journal_filename(platform), resume=resume)
+    details = {} if details is None else details
+    
+    def fetch_batch(technique_ids, on_settled):
+        def on_result(tech_id, description):
+            journal.record(tech_id, description, details.get(tech_id) if description else None)
+            on_settled(tech_id, description)
+        with phase('fetch_descriptions'):
+            return fetch_technique_descriptions(technique_ids, concurrency, platform.lower(), refresh=refresh,
+                                                on_result=on_result, details=details, on_fetch=journal.queued)
+    
+    return journal, DescriptionPipeline(fetch_batch)
+
+def fetch_matrix_page(platform="windows"):
+    """Fetch the MITRE ATT&CK Matrix webpage for specified platform"""
+    url = MATRIX_URLS.get(platform.lower(), f"https://attack.mitre.org/matrices/enterprise/{platform.lower()}/")
     
     print(f"🔍 Fetching {platform.upper()} matrix from {url}")
     
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        with phase('fetch_matrix'):
+            response = pooled_get(url)
         response.raise_for_status()
+        archive_response('matrix', platform.lower(), response)
         return response.text
     except requests.RequestException as e:
         print(f"❌ Error fetching page: {e}")
@@ -194,18 +313,45 @@ def get_platform_list(platform):
     else:
         return [PLATFORM_MAPPING.get(platform.lower(), platform.title())]
 
-def parse_matrix_data(html_content, platform="windows", fetch_descriptions=False):
-    """Parse the HTML content to extract tactics and techniques for MitreShiled schema"""
-    soup = BeautifulSoup(html_content, 'html.parser')
+def parse_matrix_data(html_content, platform="windows", fetch_descriptions=False, concurrency=DEFAULT_CONCURRENCY,
+                      previous_techniques=None, resume_mode=None, per_tactic_rows=False, record_sink=None,
+                      interner=None, descriptions=None, page_details=None):
+    """Parse the HTML content to extract tactics and techniques for MitreShiled schema
+    
+    Techniques listed under several tactics are merged into one record per
+    technique_id with the full tactics array; per_tactic_rows=True keeps the
+    historical one-row-per-tactic output for consumers that group on 'tactic'.
     
+    When previous_techniques (the last run's records) is given, the run is
+    incremental: descriptions of unchanged techniques are carried over, only
+    new or renamed techniques are fetched, and a change manifest is returned.
+    
+    Fetched descriptions are checkpointed to the platform journal as they
+    arrive; resume_mode ('resume' or 'retry-failed') replays it first.
+    
+    Parsing, description fetching and writing are pipelined: in a full run
+    each tactic's techniques are queued for fetching as soon as the tactic is
+    parsed, and every finished record is passed to record_sink (e.g. a
+    streaming writer) as soon as its description has settled.
+    
+    Records are TechniqueRecords built through interner (a fresh
+    RecordInterner by default), so repeated values are stored once.
+    
+    descriptions ({technique_id: description}, e.g. parsed from the page
+    archive) supplies descriptions up front; nothing is fetched for them.
+    
+    The other fields of each technique page (data sources, detection,
+    mitigations, procedure examples, platforms, version) come from the same
+    fetch and parse as its description; page_details supplies them up front
+    like descriptions.
+    """
     print(f"🔍 Parsing {platform.upper()} matrix data for MitreShiled...")
     if fetch_descriptions:
         print("📖 Description fetching enabled - this will take longer but provide full technique descriptions")
     
-    # Find the main matrix table
-    matrix_table = soup.find('table', class_='matrix side')
-    if not matrix_table:
-        matrix_table = soup.find('table', class_='side')
+    # Find the main matrix table (only that subtree is parsed on the fast path)
+    with phase('parse_matrix'):
+        matrix_table = find_first(html_content, 'table', ['matrix side', 'side'])
     
     if not matrix_table:
         print("❌ Could not find matrix table!")
@@ -298,12 +444,26 @@ def parse_matrix_data(html_content, platform="windows", fetch_descriptions=False
     if len(tactic_cells) != len(tactics_data):
         print(f"⚠️ Warning: Found {len(tactic_cells)} tactic cells but {len(tactics_data)} tactics")
 
-    # Get platform list for techniques
+    # Walking the tactic columns is timed as more parse_matrix (the enrich stage runs meanwhile)
+    parse_phase = phase('parse_matrix').start()
+    
+    # Records share one platform list, timestamp and set of interned strings
+    interner = interner or RecordInterner()
+    new_record = interner.new_record
     technique_platforms = get_platform_list(platform)
+    sync_source = 'mitre_extractor_enhanced' if fetch_descriptions or descriptions else 'mitre_extractor'
     
     # Track unique techniques for description fetching
     unique_techniques = set()
-    description_cache = {}
+    description_cache = dict(descriptions or {})
+    details_cache = dict(page_details or {})
+    
+    # Enrich stage: a full run fetches each tactic's descriptions while later tactics are parsed;
+    # incremental and resumed runs need the whole matrix to plan their fetches first
+    pipeline = None
+    journal = None
+    if fetch_descriptions and previous_techniques is None and not resume_mode:
+        journal, pipeline = start_description_pipeline(platform, concurrency, details=details_cache)
     
     # Process each tactic
     all_techniques = []
@@ -321,6 +481,7 @@ def parse_matrix_data(html_content, platform="windows", fetch_descriptions=False
         tech_links = tactic_cell.find_all('a', href=lambda href: href and '/techniques/' in href)
         
         techniques_dict = {}
+        subtechnique_index = {}  # parent_id -> sub-technique IDs already in its subtechniques list
         
         for link in tech_links:
             href = link.get('href', '')
@@ -339,23 +500,9 @@ def parse_matrix_data(html_content, platform="windows", fetch_descriptions=False
             if '.' not in tech_id:
                 # Parent technique - create MitreShiled document
                 if tech_id not in techniques_dict:
-                    technique_doc = {
-                        'technique_id': tech_id,
-                        'name': clean_name,
-                        'description': '',  # Will be populated if fetch_descriptions is enabled
-                        'tactic': tactic['name'],  # Primary tactic
-                        'tactics': [tactic['name']],  # Array of all applicable tactics
-                        'platforms': technique_platforms.copy(),
-                        'data_sources': [],
-                        'is_subtechnique': False,
-                        'parent_technique': '',
-                        'parent_technique_id': '',
-                        'mitre_version': '1.0',
-                        'sync_source': 'mitre_extractor_enhanced' if fetch_descriptions else 'mitre_extractor',
-                        'last_updated': datetime.now().isoformat(),
-                        'subtechniques': []
-                    }
-                    techniques_dict[tech_id] = technique_doc
+                    # Description is populated later if fetch_descriptions is enabled
+                    techniques_dict[tech_id] = new_record(tech_id, clean_name, tactic['name'], technique_platforms,
+                                                          sync_source)
                 else:
                     # Update name if we have a cleaner version
                     if clean_name and not clean_name.startswith("Parent of"):
@@ -367,46 +514,22 @@ def parse_matrix_data(html_content, platform="windows", fetch_descriptions=False
                 # Ensure parent exists
                 if parent_id not in techniques_dict:
                     unique_techniques.add(parent_id)
-                    parent_doc = {
-                        'technique_id': parent_id,
-                        'name': f"Parent of {tech_id}",
-                        'description': '',
-                        'tactic': tactic['name'],
-                        'tactics': [tactic['name']],
-                        'platforms': technique_platforms.copy(),
-                        'data_sources': [],
-                        'is_subtechnique': False,
-                        'parent_technique': '',
-                        'parent_technique_id': '',
-                        'mitre_version': '1.0',
-                        'sync_source': 'mitre_extractor_enhanced' if fetch_descriptions else 'mitre_extractor',
-                        'last_updated': datetime.now().isoformat(),
-                        'subtechniques': []
-                    }
-                    techniques_dict[parent_id] = parent_doc
+                    techniques_dict[parent_id] = new_record(parent_id, f"Parent of {tech_id}", tactic['name'],
+                                                            technique_platforms, sync_source)
                 
                 # Create sub-technique document
-                sub_technique_doc = {
-                    'technique_id': tech_id,
-                    'name': clean_name,
-                    'description': '',
-                    'tactic': tactic['name'],
-                    'tactics': [tactic['name']],
-                    'platforms': technique_platforms.copy(),
-                    'data_sources': [],
-                    'is_subtechnique': True,
-                    'parent_technique': techniques_dict[parent_id]['name'],
-                    'parent_technique_id': parent_id,
-                    'mitre_version': '1.0',
-                    'sync_source': 'mitre_extractor_enhanced' if fetch_descriptions else 'mitre_extractor',
-                    'last_updated': datetime.now().isoformat()
-                }
+                sub_technique_doc = new_record(tech_id, clean_name, tactic['name'], technique_platforms, sync_source,
+                                               is_subtechnique=True,
+                                               parent_technique=techniques_dict[parent_id]['name'],
+                                               parent_technique_id=parent_id)
                 
                 # Add to subtechniques list for parent
-                techniques_dict[parent_id]['subtechniques'].append({
-                    'id': tech_id,
-                    'name': clean_name
-                })
+                if tech_id not in subtechnique_index.setdefault(parent_id, set()):
+                    subtechnique_index[parent_id].add(tech_id)
+                    techniques_dict[parent_id]['subtechniques'].append({
+                        'id': tech_id,
+                        'name': clean_name
+                    })
                 
                 # Add as separate document
                 techniques_dict[tech_id] = sub_technique_doc
@@ -440,45 +563,19 @@ def parse_matrix_data(html_content, platform="windows", fetch_descriptions=False
                     
                     # Ensure parent exists
                     if parent_id not in techniques_dict:
-                        parent_doc = {
-                            'technique_id': parent_id,
-                            'name': f"Parent of {tech_id}",
-                            'description': '',
-                            'tactic': tactic['name'],
-                            'tactics': [tactic['name']],
-                            'platforms': technique_platforms.copy(),
-                            'data_sources': [],
-                            'is_subtechnique': False,
-                            'parent_technique': '',
-                            'parent_technique_id': '',
-                            'mitre_version': '1.0',
-                            'sync_source': 'mitre_extractor_enhanced' if fetch_descriptions else 'mitre_extractor',
-                            'last_updated': datetime.now().isoformat(),
-                            'subtechniques': []
-                        }
-                        techniques_dict[parent_id] = parent_doc
+                        techniques_dict[parent_id] = new_record(parent_id, f"Parent of {tech_id}", tactic['name'],
+                                                                technique_platforms, sync_source)
                     
                     # Create sub-technique if not exists
                     if tech_id not in techniques_dict:
-                        sub_technique_doc = {
-                            'technique_id': tech_id,
-                            'name': clean_name,
-                            'description': '',
-                            'tactic': tactic['name'],
-                            'tactics': [tactic['name']],
-                            'platforms': technique_platforms.copy(),
-                            'data_sources': [],
-                            'is_subtechnique': True,
-                            'parent_technique': techniques_dict[parent_id]['name'],
-                            'parent_technique_id': parent_id,
-                            'mitre_version': '1.0',
-                            'sync_source': 'mitre_extractor_enhanced' if fetch_descriptions else 'mitre_extractor',
-                            'last_updated': datetime.now().isoformat()
-                        }
-                        techniques_dict[tech_id] = sub_technique_doc
+                        techniques_dict[tech_id] = new_record(tech_id, clean_name, tactic['name'], technique_platforms,
+                                                              sync_source, is_subtechnique=True,
+                                                              parent_technique=techniques_dict[parent_id]['name'],
+                                                              parent_technique_id=parent_id)
                         
                         # Add to parent's subtechniques
-                        if not any(sub['id'] == tech_id for sub in techniques_dict[parent_id]['subtechniques']):
+                        if tech_id not in subtechnique_index.setdefault(parent_id, set()):
+                            subtechnique_index[parent_id].add(tech_id)
                             techniques_dict[parent_id]['subtechniques'].append({
                                 'id': tech_id,
                                 'name': clean_name
@@ -488,6 +585,8 @@ def parse_matrix_data(html_content, platform="windows", fetch_descriptions=False
         tactic_techniques = list(techniques_dict.values())
         tactic['techniques'] = tactic_techniques
         all_techniques.extend(tactic_techniques)
+        if pipeline is not None:
+            pipeline.submit(t['technique_id'] for t in tactic_techniques)
         
         # Count techniques and sub-techniques
         parent_techniques = [t for t in tactic_techniques if not t['is_subtechnique']]
@@ -502,58 +601,125 @@ def parse_matrix_data(html_content, platform="windows", fetch_descriptions=False
             else:
                 print(f"  ⚠️ Technique count mismatch: found {len(parent_techniques)}, expected {expected_counts[tactic_idx]}")
     
+    parse_phase.stop()
+    
+    # Merge the per-tactic rows into one record per technique
+    per_tactic_count = len(all_techniques)
+    if not per_tactic_rows:
+        with phase('merge_records'):
+            all_techniques = merge_technique_records(all_techniques)
+            merge_tactic_techniques(tactics_data, all_techniques)
+        print(f"\n🔗 Merged {per_tactic_count} per-tactic rows into {len(all_techniques)} technique records")
+    
+    # Incremental mode: diff against the previous output and carry unchanged descriptions over
+    techniques_to_fetch = unique_techniques
+    renamed_techniques = set()
+    change_manifest = None
+    if previous_techniques is not None:
+        with phase('plan_incremental'):
+            previous_index = index_techniques(previous_techniques)
+            current_index = index_techniques(all_techniques)
+            delta = diff_techniques(previous_index, current_index)
+            description_cache, techniques_to_fetch, renamed_techniques = plan_description_fetches(previous_index, current_index, delta)
+            details_cache.update((tech_id, previous_index[tech_id]['details']) for tech_id in description_cache)
+            change_manifest = build_change_manifest(platform.lower(), delta, description_cache, techniques_to_fetch)
+        
+        print(f"\n🔁 Incremental run against previous output ({len(previous_index)} techniques):")
+        print(f"  ➕ Added: {len(delta['added'])}  ➖ Removed: {len(delta['removed'])}  ✏️ Changed: {len(delta['changed'])}")
+        print(f"  📋 Carrying over {len(description_cache)} descriptions, {len(techniques_to_fetch)} to fetch")
+    
     # Fetch descriptions if enabled
     if fetch_descriptions and unique_techniques:
-        print(f"\n📖 Fetching descriptions for {len(unique_techniques)} unique techniques...")
-        print("⏳ This may take several minutes to be respectful to MITRE's servers...")
-        
-        for i, tech_id in enumerate(unique_techniques):
-            print(f"📖 Fetching description {i+1}/{len(unique_techniques)}: {tech_id}")
-            description = fetch_technique_description(tech_id)
-            if description:
-                description_cache[tech_id] = description
-                print(f"  ✅ Got description ({len(description)} chars)")
-            else:
-                print(f"  ⚠️ No description found")
+        if pipeline is None:
+            if resume_mode:
+                carried, techniques_to_fetch = plan_resume(journal_filename(platform), techniques_to_fetch, resume_mode,
+                                                           details_cache)
+                description_cache.update(carried)
+            if techniques_to_fetch:
+                journal, pipeline = start_description_pipeline(platform, concurrency, renamed_techniques,
+                                                               bool(resume_mode), details_cache)
+                pipeline.submit(t['technique_id'] for t in all_techniques if t['technique_id'] in techniques_to_fetch)
         
-        # Apply descriptions to all techniques
-        print("🔄 Applying descriptions to technique records...")
+        if pipeline is not None:
+            print(f"\n📖 Fetching descriptions for {len(techniques_to_fetch)} unique techniques...")
+            print(f"⏳ Fetching with concurrency {concurrency} (adaptive per-host pacing applies)...")
+            pipeline.close()
+    
+    # Writer stage: records leave in output order as soon as their descriptions settle
+    timer = StageTimer()
+    try:
         for technique in all_techniques:
             tech_id = technique['technique_id']
-            if tech_id in description_cache:
-                technique['description'] = description_cache[tech_id]
-                
+            if pipeline is not None and pipeline.expects(tech_id):
+                with phase('wait_descriptions'):
+                    description = pipeline.wait_for(tech_id)
+            else:
+                description = description_cache.get(tech_id, '')
+            if description:
+                technique['description'] = interner.value(description)
+                if details_cache.get(tech_id):
+                    apply_page_details(technique, details_cache[tech_id], interner)
+            if record_sink is not None:
+                with phase('write_records'):
+                    record_sink(technique)
+                timer.record_written()
+        if pipeline is not None:
+            with phase('wait_descriptions'):
+                pipeline.join()
+            journal.finish()
+    finally:
+        if journal is not None:
+            journal.close()
+    
+    if fetch_descriptions or descriptions:
         print(f"✅ Applied descriptions to {len([t for t in all_techniques if t['description']])} techniques")
+    if record_sink is not None:
+        print(timer.summary())
     
     return {
         'platform': PLATFORM_MAPPING.get(platform.lower(), platform.title()),
-        'extraction_date': datetime.now().isoformat(),
+        'extraction_date': interner.timestamp,
         'tactics': tactics_data,
         'techniques': all_techniques,  # Flat list of all techniques for easy database import
+        'changes': change_manifest,
         'summary': {
             'total_tactics': len(tactics_data),
             'total_techniques': len([t for t in all_techniques if not t['is_subtechnique']]),
             'total_subtechniques': len([t for t in all_techniques if t['is_subtechnique']]),
             'total_items': len(all_techniques),
-            'techniques_with_descriptions': len([t for t in all_techniques if t['description']]) if fetch_descriptions else 0
+            'per_tactic_rows': per_tactic_count,
+            'techniques_with_descriptions': (len([t for t in all_techniques if t['description']])
+                                             if fetch_descriptions or descriptions else 0)
         }
     }
 
-def save_matrix_data(data, platform="windows", format_type="mitreshire"):
-    """Save the extracted matrix data to JSON file"""
+def save_matrix_data(data, platform="windows", format_type="mitreshire", output_format="json", compression=None,
+                     techniques_saved=None, fingerprinter=None, per_tactic_rows=False):
+    """Save the extracted matrix data to JSON file
+    
+    In mitreshire format the technique file can also be streamed as NDJSON
+    (output_format="ndjson") and gzip/zstd compressed. techniques_saved names
+    a technique file the pipeline already streamed (stamped by fingerprinter),
+    which is then not rewritten. Every record gets a content hash and the
+    file a manifest (see record_fingerprint.py).
+    """
     if not data:
         print("❌ No data to save!")
         return False
     
     if format_type == "mitreshire":
         # Save in MitreShiled format (ready for database import)
-        techniques_filename = f"mitreshire_{platform.lower()}_techniques.json"
+        techniques_filename = output_filename(platform, 'techniques', output_format, compression)
         tactics_filename = f"mitreshire_{platform.lower()}_tactics.json"
         
         try:
-            # Save techniques for database import
-            with open(techniques_filename, 'w', encoding='utf-8') as f:
-                json.dump(data['techniques'], f, indent=2, ensure_ascii=False)
+            # Save techniques for database import, streamed record by record
+            if techniques_saved != techniques_filename:
+                fingerprinter = RecordFingerprinter(previous_fingerprints(platform, per_tactic_rows), per_tactic_rows)
+                with phase('write_records'):
+                    write_records(techniques_filename, fingerprinter.stamp_all(data['techniques']))
+            with phase('write_summary'):
+                fingerprinter.save_manifest(platform, techniques_filename)
             
             # Save tactics summary
             tactics_summary = {
@@ -563,12 +729,16 @@ def save_matrix_data(data, platform="windows", format_type="mitreshire"):
                 'summary': data['summary']
             }
             
-            with open(tactics_filename, 'w', encoding='utf-8') as f:
-                json.dump(tactics_summary, f, indent=2, ensure_ascii=False)
+            with phase('write_summary'):
+                write_json_atomic(tactics_filename, tactics_summary)
             
             print(f"\n💾 Saved MitreShiled format:")
-            print(f"  📄 Techniques: {techniques_filename}")
+            print(f"  📄 Techniques: {techniques_filename} ({os.path.getsize(techniques_filename) / 1024:.0f} KB)")
             print(f"  📄 Tactics Summary: {tactics_filename}")
+            print(f"  📄 Record manifest: {manifest_filename(platform)}")
+            print(f"  {fingerprinter.summary()}")
+            if data.get('changes'):
+                save_change_manifest(platform, data['changes'])
             return True
         except Exception as e:
             print(f"❌ Error saving MitreShiled format: {e}")
@@ -577,8 +747,8 @@ def save_matrix_data(data, platform="windows", format_type="mitreshire"):
         # Save complete data structure
         filename = f"mitre_{platform.lower()}_matrix_complete.json"
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            with phase('write_records'):
+                write_json_atomic(filename, data)
             
             print(f"\n💾 Saved complete matrix data to {filename}")
             return True
@@ -614,21 +784,385 @@ def print_summary(data):
     print("3. Verify tactic cards display correctly")
     print("4. Check platform filtering works as expected")
 
+class _ParseFailed(Exception):
+    """Aborts a streamed technique file so the previous output stays in place"""
+
+def parse_and_save(html_content, platform, format_type="mitreshire", fetch_descriptions=False,
+                   concurrency=DEFAULT_CONCURRENCY, previous_techniques=None, resume_mode=None, per_tactic_rows=False,
+                   output_format="json", compression=None, descriptions=None, page_details=None):
+    """Parse a matrix page and save it, streaming technique records to disk as they complete
+    
+    Returns the parsed data, or None if parsing or saving failed.
+    """
+    parse_args = (html_content, platform, fetch_descriptions, concurrency, previous_techniques, resume_mode,
+                  per_tactic_rows)
+    if format_type != "mitreshire":
+        matrix_data = parse_matrix_data(*parse_args, descriptions=descriptions, page_details=page_details)
+        return matrix_data if matrix_data and save_matrix_data(matrix_data, platform, format_type) else None
+    
+    techniques_filename = output_filename(platform, 'techniques', output_format, compression)
+    # Fingerprints of the current output, read before the writer replaces it
+    fingerprinter = RecordFingerprinter(previous_fingerprints(platform, per_tactic_rows), per_tactic_rows)
+    try:
+        with record_writer(techniques_filename) as writer:
+            def write_stamped(record):
+                writer.write(fingerprinter.stamp(record))
+            
+            matrix_data = parse_matrix_data(*parse_args, record_sink=write_stamped, descriptions=descriptions,
+                                            page_details=page_details)
+            if not matrix_data:
+                raise _ParseFailed()
+    except _ParseFailed:
+        return None
+    
+    if not save_matrix_data(matrix_data, platform, format_type, output_format, compression, techniques_filename,
+                            fingerprinter, per_tactic_rows):
+        return None
+    return matrix_data
+
+def build_stix_platform_data(bundle, platform, per_tactic_rows=False, interner=None):
+    """Build the same structure parse_matrix_data returns from a read_attack_bundle() result
+    
+    Passing one interner for every platform shares names and descriptions between them.
+    """
+    interner = interner or RecordInterner()
+    stix_platforms = STIX_PLATFORMS[platform.lower()]
+    technique_platforms = get_platform_list(platform)
+    names = {t['technique_id']: t['name'] for t in bundle['techniques']}
+    
+    on_platform = [t for t in bundle['techniques'] if stix_platforms & set(t['platforms'])]
+    # A parent always appears on the matrix next to its sub-techniques
+    listed = {t['technique_id'] for t in on_platform}
+    parents_needed = {t['technique_id'].split('.')[0] for t in on_platform if t['is_subtechnique']} - listed
+    on_platform += [t for t in bundle['techniques'] if t['technique_id'] in parents_needed]
+    
+    tactics_data = []
+    all_techniques = []
+    for tactic in bundle['tactics']:
+        members = [t for t in on_platform if tactic['shortname'] in t['phases']]
+        if not members:
+            continue
+        tactic_name = MITRE_SHIELD_TACTICS.get(tactic['shortname'], tactic['name'])
+        subtechniques = {}
+        for technique in members:
+            if technique['is_subtechnique']:
+                subtechniques.setdefault(technique['technique_id'].split('.')[0], []).append(technique)
+        
+        # Matrix layout: parents alphabetically, each followed by its sub-techniques
+        for subs in subtechniques.values():
+            subs.sort(key=lambda t: t['technique_id'])
+        rows = []
+        for parent in sorted((t for t in members if not t['is_subtechnique']), key=lambda t: t['name']):
+            rows.append(parent)
+            rows.extend(subtechniques.get(parent['technique_id'], []))
+        # Sub-techniques whose parent is not under this tactic still get a row
+        placed = {t['technique_id'] for t in rows}
+        rows.extend(t for subs in subtechniques.values() for t in subs if t['technique_id'] not in placed)
+        
+        tactic_techniques = []
+        for technique in rows:
+            tech_id = technique['technique_id']
+            parent_id = tech_id.split('.')[0] if technique['is_subtechnique'] else ''
+            doc = interner.new_record(tech_id, technique['name'], tactic_name, technique_platforms, 'mitre_stix',
+                                      is_subtechnique=technique['is_subtechnique'],
+                                      parent_technique=names.get(parent_id, '') if parent_id else '',
+                                      parent_technique_id=parent_id, description=technique['description'],
+                                      mitre_version=technique['version'])
+            doc['data_sources'] = interner.value(technique['data_sources'])
+            if not technique['is_subtechnique']:
+                doc['subtechniques'] = interner.subtechniques(
+                    {'id': sub['technique_id'], 'name': sub['name']} for sub in subtechniques.get(tech_id, []))
+            tactic_techniques.append(doc)
+        
+        tactics_data.append({
+            'id': tactic['id'],
+            'name': tactic_name,
+            'original_name': tactic['name'],
+            'techniques': tactic_techniques
+        })
+        all_techniques.extend(tactic_techniques)
+    
+    per_tactic_count = len(all_techniques)
+    if not per_tactic_rows:
+        all_techniques = merge_technique_records(all_techniques)
+        merge_tactic_techniques(tactics_data, all_techniques)
+    
+    return {
+        'platform': PLATFORM_MAPPING.get(platform.lower(), platform.title()),
+        'extraction_date': interner.timestamp,
+        'tactics': tactics_data,
+        'techniques': all_techniques,
+        'changes': None,
+        'summary': {
+            'total_tactics': len(tactics_data),
+            'total_techniques': len([t for t in all_techniques if not t['is_subtechnique']]),
+            'total_subtechniques': len([t for t in all_techniques if t['is_subtechnique']]),
+            'total_items': len(all_techniques),
+            'per_tactic_rows': per_tactic_count,
+            'techniques_with_descriptions': len([t for t in all_techniques if t['description']])
+        }
+    }
+
+def extract_from_stix(bundle_path, platforms, format_type="mitreshire", output_format="json", compression=None,
+                      per_tactic_rows=False):
+    """Produce every requested platform's output from one pass over a local STIX bundle (no HTTP requests)"""
+    print(f"📦 Reading STIX bundle {bundle_path}...")
+    start = time.time()
+    with phase('read_bundle'):
+        bundle = read_attack_bundle(bundle_path)
+    print(f"✅ Streamed {bundle['objects']} objects: {len(bundle['techniques'])} techniques, "
+          f"{len(bundle['tactics'])} tactics in {time.time() - start:.1f}s")
+    
+    results = []
+    interner = RecordInterner()
+    for platform in platforms:
+        with phase('build_records'):
+            matrix_data = build_stix_platform_data(bundle, platform, per_tactic_rows, interner)
+        saved = save_matrix_data(matrix_data, platform, format_type, output_format, compression,
+                                 per_tactic_rows=per_tactic_rows)
+        results.append((platform, saved, matrix_data['summary']))
+    
+    print("\n" + "=" * 70)
+    print("📊 STIX EXTRACTION SUMMARY")
+    print("=" * 70)
+    for platform, saved, summary in results:
+        status = "✅" if saved else "❌"
+        print(f"{status} {platform:<20} {summary['total_items']:>5} records  "
+              f"{summary['techniques_with_descriptions']:>5} with descriptions")
+    print("=" * 70)
+    print(f"⏱️ {len(platforms)} platforms in {time.time() - start:.1f}s with 0 HTTP requests")
+    return all(saved for _, saved, _ in results)
+
+def _parse_archived_page(item):
+    """Worker: parse one archived technique page ((technique_id, ref) -> (technique_id, page fields))"""
+    tech_id, ref = item
+    try:
+        return tech_id, parse_technique_page_or_empty(read_page(ref))
+    except Exception as e:
+        print(f"❌ Error parsing archived page for {tech_id}: {e}")
+        return tech_id, {}
+
+def _reextract_platform(platform, matrix_ref, descriptions, page_details, format_type, output_format, compression,
+                        per_tactic_rows):
+    """Worker: re-parse one archived matrix page and save it with the archived technique pages' fields"""
+    matrix_data = parse_and_save(read_page(matrix_ref), platform, format_type, per_tactic_rows=per_tactic_rows,
+                                 output_format=output_format, compression=compression, descriptions=descriptions,
+                                 page_details=page_details)
+    return matrix_data['summary'] if matrix_data else None
+
+def reextract_from_archive(platforms, format_type="mitreshire", output_format="json", compression=None,
+                           per_tactic_rows=False, workers=None):
+    """Rebuild platform outputs from the latest archived pages with no network traffic
+    
+    Technique pages are parsed across a process pool (one worker per CPU by
+    default), then every platform's matrix page is re-parsed and saved with
+    those descriptions and page fields.
+    """
+    archive = get_page_archive()
+    matrix_refs = archive.latest('matrix', platforms)
+    page_refs = archive.latest('technique')
+    missing = [p for p in platforms if p not in matrix_refs]
+    if missing:
+        print(f"⚠️ No archived matrix page for: {', '.join(missing)}")
+    if not matrix_refs:
+        print("❌ Nothing to re-extract - run an extraction first so pages get archived")
+        return False
+    
+    workers = workers or os.cpu_count() or 1
+    print(f"♻️ Re-extracting {len(matrix_refs)} platforms from {len(page_refs)} archived technique pages "
+          f"with {workers} worker processes")
+    start = time.time()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        with phase('parse_description'):
+            parsed = pool.map(_parse_archived_page, page_refs.items(),
+                              chunksize=max(1, len(page_refs) // (workers * 4)))
+            pages = {tech_id: page for tech_id, page in parsed if page}
+            descriptions = {tech_id: page.pop('description') for tech_id, page in pages.items()}
+        print(f"📖 Parsed {len(descriptions)}/{len(page_refs)} descriptions in {time.time() - start:.1f}s")
+        
+        with phase('parse_matrix'):
+            futures = {
+                pool.submit(_reextract_platform, platform, matrix_refs[platform], descriptions, pages, format_type,
+                            output_format, compression, per_tactic_rows): platform
+                for platform in platforms if platform in matrix_refs
+            }
+            results = {futures[future]: future.result() for future in as_completed(futures)}
+    
+    print("\n" + "=" * 70)
+    print("📊 RE-EXTRACTION SUMMARY")
+    print("=" * 70)
+    for platform in platforms:
+        summary = results.get(platform)
+        if summary:
+            print(f"✅ {platform:<20} {summary['total_items']:>5} records  "
+                  f"{summary['techniques_with_descriptions']:>5} with descriptions")
+        else:
+            print(f"❌ {platform:<20} {'not archived' if platform in missing else 'failed'}")
+    print("=" * 70)
+    print(f"⏱️ {len(results)} platforms in {time.time() - start:.1f}s with 0 HTTP requests")
+    return not missing and all(results.values())
+
+def extract_platform(platform, format_type="mitreshire", fetch_descriptions=False, concurrency=DEFAULT_CONCURRENCY,
+                     incremental=False, resume_mode=None, output_format="json", compression=None,
+                     per_tactic_rows=False):
+    """Fetch, parse and save a single platform; returns a small result summary"""
+    start = time.time()
+    result = {'platform': platform, 'success': False, 'items': 0, 'elapsed': 0.0}
+    
+    html_content = fetch_matrix_page(platform)
+    if html_content:
+        previous_techniques = load_previous_techniques(platform) if incremental else None
+        matrix_data = parse_and_save(html_content, platform, format_type, fetch_descriptions, concurrency,
+                                     previous_techniques, resume_mode, per_tactic_rows, output_format, compression)
+        if matrix_data:
+            result['success'] = True
+            result['items'] = matrix_data['summary']['total_items']
+    
+    print_cache_stats()
+    print_limiter_stats()
+    print_store_stats()
+    print_archive_stats()
+    result['elapsed'] = time.time() - start
+    if get_metrics() is not None:
+        result['metrics'] = get_metrics().snapshot()
+    return result
+
+def init_platform_worker(budget, metrics_config=None):
+    """Worker process initializer: join the shared request budget and collect this worker's metrics"""
+    set_request_budget(budget)
+    # Platforms already run one per process; a parse pool in each would oversubscribe the CPUs
+    disable_parse_pool()
+    if metrics_config:
+        enable_metrics(**metrics_config)
+
+def extract_all_platforms(format_type="mitreshire", fetch_descriptions=False, concurrency=DEFAULT_CONCURRENCY, workers=None,
+                          incremental=False, resume_mode=None, output_format="json", compression=None,
+                          per_tactic_rows=False):
+    """Extract every platform in parallel worker processes sharing one request budget"""
+    workers = workers or len(ALL_PLATFORMS)
+    budget = RequestBudget(ALL_PLATFORMS_MAX_IN_FLIGHT, ALL_PLATFORMS_MIN_INTERVAL)
+    
+    print(f"🚀 Extracting {len(ALL_PLATFORMS)} platforms with {workers} worker processes")
+    print(f"📊 Shared request budget: {ALL_PLATFORMS_MAX_IN_FLIGHT} in flight, {ALL_PLATFORMS_MIN_INTERVAL}s spacing")
+    
+    start = time.time()
+    results = []
+    metrics = get_metrics()
+    worker_args = (budget, metrics.config() if metrics is not None else None)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_platform_worker, initargs=worker_args) as pool:
+        futures = {
+            pool.submit(extract_platform, platform, format_type, fetch_descriptions, concurrency, incremental,
+                        resume_mode, output_format, compression, per_tactic_rows): platform
+            for platform in ALL_PLATFORMS
+        }
+        for future in as_completed(futures):
+            platform = futures[future]
+            try:
+                result = future.result()
+                if metrics is not None and 'metrics' in result:
+                    metrics.merge(result.pop('metrics'))
+                results.append(result)
+            except Exception as e:
+                print(f"❌ Worker for {platform} crashed: {e}")
+                results.append({'platform': platform, 'success': False, 'items': 0, 'elapsed': 0.0})
+    wall_clock = time.time() - start
+    
+    print("\n" + "=" * 70)
+    print("📊 ALL-PLATFORM EXTRACTION SUMMARY")
+    print("=" * 70)
+    for result in sorted(results, key=lambda r: ALL_PLATFORMS.index(r['platform'])):
+        status = "✅" if result['success'] else "❌"
+        print(f"{status} {result['platform']:<20} {result['items']:>5} records  {result['elapsed']:>8.1f}s")
+    print("=" * 70)
+    print(f"Wall clock: {wall_clock:.1f}s (serial total would be {sum(r['elapsed'] for r in results):.1f}s)")
+    
+    failed = [r['platform'] for r in results if not r['success']]
+    if failed:
+        print(f"❌ Failed platforms: {', '.join(failed)}")
+    return not failed
+
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python3 mitre_data_extractor.py <platform> [format] [--descriptions]")
+        print("Usage: python3 mitre_data_extractor.py <platform|all> [format] [--descriptions]")
         print("Platforms: windows, macos, linux, cloud, containers, officesuite, identity_provider, saas, iaas, network_devices")
+        print("           all (every platform above, in parallel worker processes)")
         print("Format: mitreshire (default) | complete")
         print("Options: --descriptions (fetch individual technique descriptions - takes longer)")
+        print(f"         --concurrency N (parallel description fetches, default {DEFAULT_CONCURRENCY})")
+        print("         --workers N (worker processes for 'all', default one per platform)")
+        print("         --incremental (reuse descriptions from the previous output, fetch only new/renamed techniques;")
+        print("                        implies --descriptions and writes mitreshire_<platform>_changes.json)")
+        print("         --resume (replay the checkpoint journal of an interrupted run and skip settled techniques)")
+        print("         --retry-failed (fetch only the techniques that failed in the journaled run)")
+        print("         --output-format json|ndjson (technique file layout, default json)")
+        print("         --compress gzip|zstd (stream-compress the technique file)")
+        print("         --per-tactic-rows (one technique record per tactic, as older importers expect;")
+        print("                            by default each technique is one record with a full tactics array)")
+        print("         --source stix <path> (build the output from a local ATT&CK STIX bundle such as")
+        print("                               enterprise-attack.json instead of scraping attack.mitre.org)")
+        print("         --profile (print per-phase wall/CPU time, request latency percentiles and tracemalloc peaks;")
+        print("                    tracemalloc slows the run down, --metrics-out alone is cheap)")
+        print("         --metrics-out <file.json> (write run metrics as JSON plus a Prometheus textfile <file>.prom)")
+        print("\nRe-extraction (no network, parsers re-run over the page archive on all CPU cores):")
+        print("  python3 mitre_data_extractor.py reextract [platform|all] [format] [--workers N] [output options]")
         print("\nExample:")
         print("  python3 mitre_data_extractor.py windows")
         print("  python3 mitre_data_extractor.py cloud mitreshire")
         print("  python3 mitre_data_extractor.py windows mitreshire --descriptions")
+        print("  python3 mitre_data_extractor.py all mitreshire --descriptions")
+        print("  python3 mitre_data_extractor.py all --source stix enterprise-attack.json")
+        print("  python3 mitre_data_extractor.py reextract all")
         sys.exit(1)
     
     platform = sys.argv[1].lower()
     format_type = sys.argv[2] if len(sys.argv) > 2 and not sys.argv[2].startswith('--') else "mitreshire"
-    fetch_descriptions = '--descriptions' in sys.argv
+    incremental = '--incremental' in sys.argv
+    resume_mode = 'retry-failed' if '--retry-failed' in sys.argv else 'resume' if '--resume' in sys.argv else None
+    fetch_descriptions = '--descriptions' in sys.argv or incremental or resume_mode is not None
+    output_format = sys.argv[sys.argv.index('--output-format') + 1] if '--output-format' in sys.argv else "json"
+    compression = sys.argv[sys.argv.index('--compress') + 1] if '--compress' in sys.argv else None
+    per_tactic_rows = '--per-tactic-rows' in sys.argv
+    if output_format not in OUTPUT_FORMATS or compression not in COMPRESSION_SUFFIXES:
+        print(f"❌ Unknown output format '{output_format}' or compression '{compression}'")
+        sys.exit(1)
+    concurrency = DEFAULT_CONCURRENCY
+    if '--concurrency' in sys.argv:
+        concurrency = int(sys.argv[sys.argv.index('--concurrency') + 1])
+    profile = '--profile' in sys.argv
+    metrics_out = sys.argv[sys.argv.index('--metrics-out') + 1] if '--metrics-out' in sys.argv else None
+    if profile or metrics_out:
+        enable_metrics('mitre_data_extractor', profile, {'platform': platform})
+        report_metrics_at_exit(metrics_out)
+    
+    if platform == "reextract":
+        positional = [arg for arg in sys.argv[2:4] if not arg.startswith('--')]
+        target = positional[0].lower() if positional else "all"
+        format_type = positional[1] if len(positional) > 1 else "mitreshire"
+        platforms = ALL_PLATFORMS if target == "all" else [target]
+        workers = int(sys.argv[sys.argv.index('--workers') + 1]) if '--workers' in sys.argv else None
+        if not reextract_from_archive(platforms, format_type, output_format, compression, per_tactic_rows, workers):
+            sys.exit(1)
+        return
+    
+    if '--source' in sys.argv:
+        source = sys.argv[sys.argv.index('--source') + 1:sys.argv.index('--source') + 3]
+        if len(source) != 2 or source[0] != 'stix':
+            print("❌ Usage: --source stix <path to STIX bundle>")
+            sys.exit(1)
+        platforms = ALL_PLATFORMS if platform == "all" else [platform]
+        if not all(p in STIX_PLATFORMS for p in platforms):
+            print(f"❌ Unknown platform '{platform}'")
+            sys.exit(1)
+        if not extract_from_stix(source[1], platforms, format_type, output_format, compression, per_tactic_rows):
+            sys.exit(1)
+        return
+    
+    if platform == "all":
+        workers = int(sys.argv[sys.argv.index('--workers') + 1]) if '--workers' in sys.argv else None
+        if not extract_all_platforms(format_type, fetch_descriptions, concurrency, workers, incremental, resume_mode,
+                                     output_format, compression, per_tactic_rows):
+            sys.exit(1)
+        return
     
     print(f"🚀 Starting MITRE ATT&CK {platform.upper()} matrix extraction for MitreShiled...")
     print(f"📋 Output format: {format_type}")
@@ -642,20 +1176,25 @@ def main():
         sys.exit(1)
     
     # Parse the matrix data
-    matrix_data = parse_matrix_data(html_content, platform, fetch_descriptions)
+    previous_techniques = None
+    if incremental:
+        previous_techniques = load_previous_techniques(platform)
+        if previous_techniques is None:
+            print("⚠️ No previous output found - running a full extraction")
+    # Parse and save the data (technique records are written as they complete)
+    matrix_data = parse_and_save(html_content, platform, format_type, fetch_descriptions, concurrency,
+                                 previous_techniques, resume_mode, per_tactic_rows, output_format, compression)
     if not matrix_data:
-        print("❌ Failed to parse matrix data")
-        sys.exit(1)
-    
-    # Save the data
-    if save_matrix_data(matrix_data, platform, format_type):
-        print("✅ Extraction completed successfully!")
-    else:
-        print("❌ Failed to save matrix data")
+        print("❌ Failed to extract matrix data")
         sys.exit(1)
+    print("✅ Extraction completed successfully!")
     
     # Print summary
     print_summary(matrix_data)
+    print_cache_stats()
+    print_limiter_stats()
+    print_store_stats()
+    print_archive_stats()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+MitreShiled Output Writers
+Helpers shared by the extractors for writing mitreshire_*.json files
+Files are written to a temporary sibling and renamed into place, so a
+reader (or a parallel writer) never sees a half-written output file
+
+Technique files can be written as an indented JSON array (the historical
+layout) or as NDJSON (one record per line), optionally gzip or zstd
+compressed (.gz / .zst suffix). iter_records reads any of these back one
+record at a time in constant memory.
+"""
+
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import textwrap
+from contextlib import contextmanager
+
+from technique_record import json_default
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+OUTPUT_FORMATS = {'json': '.json', 'ndjson': '.ndjson'}
+COMPRESSION_SUFFIXES = {None: '', 'gzip': '.gz', 'zstd': '.zst'}
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+@contextmanager
+def atomic_write(filename, mode='w', encoding='utf-8'):
+    """Open a temp file next to filename and atomically rename it over filename on success"""
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(filename)}.", suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, mode, encoding=None if 'b' in mode else encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates 0600 files; keep the permissions of the file being replaced
+        os.chmod(temp_path, os.stat(filename).st_mode & 0o777 if os.path.exists(filename) else 0o644)
+        os.replace(temp_path, filename)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def write_json_atomic(filename, data):
+    """Write data as indented JSON (the historical mitreshire layout) atomically"""
+    with atomic_write(filename) as f:
+        json.dump(data, f, indent=2, ensure_ascii=False, default=json_default)
+
+
+def copy_atomic(source, destination):
+    """Copy source byte for byte to destination, replacing it atomically (e.g. a pre-change backup)"""
+    with open(source, 'rb') as src, atomic_write(destination, 'wb') as dst:
+        shutil.copyfileobj(src, dst, READ_CHUNK_SIZE)
+
+
+def output_filename(platform, kind, output_format='json', compression=None):
+    """Build e.g. mitreshire_windows_techniques.ndjson.gz"""
+    return f"mitreshire_{platform.lower()}_{kind}{OUTPUT_FORMATS[output_format]}{COMPRESSION_SUFFIXES[compression]}"
+
+
+def _require_zstandard():
+    if zstandard is None:
+        raise RuntimeError("zstd compression requires the 'zstandard' package (pip install zstandard)")
+
+
+@contextmanager
+def open_output(filename):
+    """Atomically write text to filename, compressing according to its suffix"""
+    with atomic_write(filename, 'wb') as raw:
+        if filename.endswith('.gz'):
+            # mtime=0 keeps the compressed bytes reproducible between identical runs
+            stream = gzip.GzipFile(fileobj=raw, mode='wb', mtime=0)
+        elif filename.endswith('.zst'):
+            _require_zstandard()
+            stream = zstandard.ZstdCompressor().stream_writer(raw, closefd=False)
+        else:
+            stream = raw
+        text = io.TextIOWrapper(stream, encoding='utf-8', newline='\n')
+        yield text
+        text.flush()
+        text.detach()
+        if stream is not raw:
+            stream.close()
+
+
+@contextmanager
+def open_input(filename):
+    """Open a possibly compressed text file for reading"""
+    if filename.endswith('.gz'):
+        f = gzip.open(filename, 'rt', encoding='utf-8')
+    elif filename.endswith('.zst'):
+        _require_zstandard()
+        f = io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(filename, 'rb'), closefd=True),
+                             encoding='utf-8')
+    else:
+        f = open(filename, 'r', encoding='utf-8')
+    with f:
+        yield f
+
+
+class NdjsonWriter:
+    """Write records one JSON document per line as they are produced"""
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.count = 0
+        self._context = open_output(filename)
+        self._file = None
+
+    def __enter__(self):
+        self._file = self._context.__enter__()
+        return self
+
+    def write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False, default=json_default))
+        self._file.write('\n')
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._context.__exit__(exc_type, exc, tb)
+
+
+class JsonArrayWriter:
+    """Write records as an indented JSON array, one record at a time
+
+    The bytes match json.dump(records, f, indent=2, ensure_ascii=False).
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.count = 0
+        self._context = open_output(filename)
+        self._file = None
+
+    def __enter__(self):
+        self._file = self._context.__enter__()
+        return self
+
+    def write(self, record):
+        self._file.write('[\n' if self.count == 0 else ',\n')
+        self._file.write(textwrap.indent(json.dumps(record, indent=2, ensure_ascii=False, default=json_default), '  '))
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self._file.write('\n]' if self.count else '[]')
+        return self._context.__exit__(exc_type, exc, tb)
+
+
+def record_writer(filename):
+    """Pick the streaming writer matching the file's format suffix"""
+    base = filename[:-len('.gz')] if filename.endswith('.gz') else filename[:-len('.zst')] if filename.endswith('.zst') else filename
+    return NdjsonWriter(filename) if base.endswith('.ndjson') else JsonArrayWriter(filename)
+
+
+def write_records(filename, records):
+    """Stream an iterable of records to filename; returns the number written"""
+    with record_writer(filename) as writer:
+        for record in records:
+            writer.write(record)
+    return writer.count
+
+
+class _JsonStreamDecoder:
+    """Decode JSON values one at a time from a text stream read in READ_CHUNK_SIZE chunks"""
+
+    WHITESPACE = ' \t\r\n'
+
+    def __init__(self, f):
+        self._f = f
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        chunk = self._f.read(READ_CHUNK_SIZE)
+        if not chunk:
+            self._eof = True
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+
+    def peek(self, skip_chars=WHITESPACE):
+        """Skip skip_chars and return the next character without consuming it ('' at end of stream)"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in skip_chars:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if self._eof:
+                return ''
+            self._fill()
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' in JSON stream")
+        self._pos += 1
+
+    def decode(self):
+        """Decode and consume the next complete JSON value"""
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # A scalar that ends exactly at the buffer edge may continue in the next chunk
+                if end == len(self._buffer) and not self._eof and not isinstance(value, (dict, list)):
+                    raise json.JSONDecodeError("Possibly truncated value", self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+    def iter_array(self):
+        """Yield the elements of the array starting at the current position"""
+        self.expect('[')
+        while True:
+            char = self.peek(self.WHITESPACE + ',')
+            if not char:
+                raise ValueError("Unterminated JSON array")
+            if char == ']':
+                self._pos += 1
+                return
+            yield self.decode()
+
+
+def iter_json_array(f):
+    """Yield the elements of a top-level JSON array from a text stream without loading it whole"""
+    yield from _JsonStreamDecoder(f).iter_array()
+
+
+def iter_json_member_array(f, member):
+    """Yield the elements of the array stored under member of a top-level JSON object
+
+    Other members are decoded and discarded one at a time, so only one
+    element is held in memory (e.g. the objects array of a STIX bundle).
+    """
+    stream = _JsonStreamDecoder(f)
+    stream.expect('{')
+    while True:
+        char = stream.peek(stream.WHITESPACE + ',')
+        if char in ('}', ''):
+            return
+        key = stream.decode()
+        stream.expect(':')
+        if key == member:
+            yield from stream.iter_array()
+            return
+        stream.peek()
+        stream.decode()
+
+
+def iter_records(filename):
+    """Yield technique records from a JSON-array or NDJSON file (optionally compressed)"""
+    with open_input(filename) as f:
+        first = ''
+        while first.isspace() or first == '':
+            first = f.read(1)
+            if first == '':
+                return
+        if first == '[':
+            # Re-attach the consumed bracket in front of the remaining stream
+            yield from iter_json_array(_Prepend('[', f))
+        else:
+            line = first + f.readline()
+            while line:
+                if line.strip():
+                    yield json.loads(line)
+                line = f.readline()
+
+
+class _Prepend:
+    """Minimal read() wrapper that replays a consumed prefix before the underlying stream"""
+
+    def __init__(self, prefix, stream):
+        self._prefix = prefix
+        self._stream = stream
+
+    def read(self, size=-1):
+        if self._prefix:
+            data, self._prefix = self._prefix, ''
+            return data + self._stream.read(size - len(data) if size > 0 else size)
+        return self._stream.read(size)
+
+
+def find_output_file(platform, kind='techniques'):
+    """Return the most recently written mitreshire_<platform>_<kind> file in any format, or None"""
+    candidates = [
+        output_filename(platform, kind, output_format, compression)
+        for output_format in OUTPUT_FORMATS
+        for compression in COMPRESSION_SUFFIXES
+    ]
+    existing = [name for name in candidates if os.path.exists(name)]
+    return max(existing, key=os.path.getmtime) if existing else None
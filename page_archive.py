@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Offline Page Archive for MitreShiled
+Every technique and matrix page the scrapers download is appended to a
+gzip-compressed WARC-style segment file (one gzip member per record, as in
+.warc.gz) and indexed in SQLite by page kind, key (technique ID or
+platform) and fetch time. A page is only stored again when its content
+changes, so the archive holds the history of each page at little cost.
+
+When MITRE changes its markup, `mitre_data_extractor.py reextract` re-runs
+the parsers over the latest archived pages instead of re-scraping.
+
+Usage: python3 page_archive.py                      (archive summary)
+       python3 page_archive.py history <key>        (captures of one page)
+       python3 page_archive.py show <key> [matrix]  (print the latest archived page)
+"""
+
+import gzip
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+DEFAULT_ARCHIVE_DIR = os.environ.get('MITRE_PAGE_ARCHIVE_DIR', '.page_archive')
+ARCHIVE_ENABLED = os.environ.get('MITRE_PAGE_ARCHIVE', 'on').lower() not in ('0', 'off', 'false', 'no')
+
+PAGE_KINDS = ('technique', 'matrix')
+
+
+def build_warc_record(url, body, fetched_at, key, content_type='text/html; charset=utf-8'):
+    """Serialize one WARC/1.1 response record (uncompressed)"""
+    http_block = (f"HTTP/1.1 200 OK\r\nContent-Type: {content_type}\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode('utf-8') + body
+    date = datetime.fromtimestamp(fetched_at, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    headers = (
+        "WARC/1.1\r\n"
+        "WARC-Type: response\r\n"
+        f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+        f"WARC-Date: {date}\r\n"
+        f"WARC-Target-URI: {url}\r\n"
+        f"WARC-Payload-Digest: sha256:{hashlib.sha256(body).hexdigest()}\r\n"
+        f"X-MitreShiled-Key: {key}\r\n"
+        "Content-Type: application/http; msgtype=response\r\n"
+        f"Content-Length: {len(http_block)}\r\n\r\n"
+    ).encode('utf-8')
+    return headers + http_block + b"\r\n\r\n"
+
+
+def read_page(ref):
+    """Return the archived page body for an index reference (segment path, offset, length) as text
+
+    Only the page's own gzip member is read, so this is cheap to call from
+    worker processes.
+    """
+    segment, offset, length = ref[:3]
+    with open(segment, 'rb') as f:
+        f.seek(offset)
+        record = gzip.decompress(f.read(length))
+    # WARC headers, then the HTTP headers, then the payload
+    _, _, http_block = record.partition(b"\r\n\r\n")
+    _, _, body = http_block.partition(b"\r\n\r\n")
+    if body.endswith(b"\r\n\r\n"):
+        body = body[:-4]
+    return body.decode('utf-8', errors='replace')
+
+
+class PageArchive:
+    """Append-only WARC-style page archive with a SQLite index
+
+    Each process appends to its own segment file, so concurrent platform
+    workers never interleave writes; the index is shared.
+    """
+
+    def __init__(self, directory=DEFAULT_ARCHIVE_DIR):
+        self.directory = directory
+        self.stats = {'archived': 0, 'unchanged': 0, 'bytes': 0}
+        self._lock = threading.Lock()
+        self._segment = None
+        self._segment_path = None
+
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(directory, 'index.sqlite3'), timeout=60, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript('''
+            CREATE TABLE IF NOT EXISTS captures (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                url TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                segment TEXT NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                sha256 TEXT NOT NULL,
+                PRIMARY KEY (kind, key, fetched_at)
+            );
+        ''')
+        self._db.commit()
+
+    def _append(self, member):
+        """Append a gzip member to this process's segment; returns (segment path, offset)"""
+        if self._segment is None:
+            name = f"pages-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.warc.gz"
+            self._segment_path = os.path.join(self.directory, name)
+            self._segment = open(self._segment_path, 'ab')
+        offset = self._segment.tell()
+        self._segment.write(member)
+        self._segment.flush()
+        return self._segment_path, offset
+
+    def record(self, kind, key, url, body):
+        """Archive a fetched page body (bytes); an unchanged page only refreshes its last_seen time"""
+        now = time.time()
+        digest = hashlib.sha256(body).hexdigest()
+        with self._lock:
+            latest = self._db.execute(
+                'SELECT sha256, fetched_at FROM captures WHERE kind = ? AND key = ? ORDER BY fetched_at DESC LIMIT 1',
+                (kind, key)
+            ).fetchone()
+            if latest and latest[0] == digest:
+                self._db.execute('UPDATE captures SET last_seen = ? WHERE kind = ? AND key = ? AND fetched_at = ?',
+                                 (now, kind, key, latest[1]))
+                self._db.commit()
+                self.stats['unchanged'] += 1
+                return
+
+            # mtime=0 keeps identical records byte-identical
+            member = gzip.compress(build_warc_record(url, body, now, f"{kind}/{key}"), mtime=0)
+            segment, offset = self._append(member)
+            self._db.execute('INSERT OR REPLACE INTO captures VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                             (kind, key, url, now, now, segment, offset, len(member), len(body), digest))
+            self._db.commit()
+            self.stats['archived'] += 1
+            self.stats['bytes'] += len(member)
+
+    def latest(self, kind, keys=None):
+        """Return {key: (segment, offset, length, url, fetched_at)} for the newest capture of each page"""
+        with self._lock:
+            rows = self._db.execute('''
+                SELECT key, segment, offset, length, url, MAX(fetched_at) FROM captures
+                WHERE kind = ? GROUP BY key
+            ''', (kind,)).fetchall()
+        wanted = set(keys) if keys is not None else None
+        return {row[0]: tuple(row[1:]) for row in rows if wanted is None or row[0] in wanted}
+
+    def history(self, kind, key):
+        """Every capture of one page, oldest first: [(fetched_at, last_seen, size, sha256, ref)]"""
+        with self._lock:
+            rows = self._db.execute('''
+                SELECT fetched_at, last_seen, size, sha256, segment, offset, length FROM captures
+                WHERE kind = ? AND key = ? ORDER BY fetched_at
+            ''', (kind, key)).fetchall()
+        return [(row[0], row[1], row[2], row[3], tuple(row[4:])) for row in rows]
+
+    def totals(self):
+        """{kind: (pages, captures, compressed bytes)} over the whole archive"""
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT kind, COUNT(DISTINCT key), COUNT(*), SUM(length) FROM captures GROUP BY kind'
+            ).fetchall()
+        return {row[0]: (row[1], row[2], row[3] or 0) for row in rows}
+
+    def summary(self):
+        s = self.stats
+        return (f"🗃️ Page archive: {s['archived']} pages archived ({s['bytes'] / 1024:.0f} KB compressed), "
+                f"{s['unchanged']} unchanged")
+
+    def close(self):
+        with self._lock:
+            if self._segment is not None:
+                self._segment.close()
+                self._segment = None
+            self._db.close()
+
+
+_default_archive = None
+_default_archive_lock = threading.Lock()
+
+
+def get_page_archive():
+    """Return the process-wide archive, creating it on first use"""
+    global _default_archive
+    with _default_archive_lock:
+        if _default_archive is None:
+            _default_archive = PageArchive()
+        return _default_archive
+
+
+def archive_response(kind, key, response):
+    """Archive a successful response for kind/key if archiving is on; never raises"""
+    if not ARCHIVE_ENABLED or response is None or response.status_code != 200:
+        return
+    try:
+        get_page_archive().record(kind, key, response.url, response.content)
+    except (OSError, sqlite3.Error) as e:
+        print(f"⚠️ Could not archive {kind} page {key}: {e}")
+
+
+def print_archive_stats():
+    """Print the archive counters if a page was archived in this run"""
+    if _default_archive is not None:
+        print(_default_archive.summary())
+
+
+def main():
+    archive = PageArchive()
+    if len(sys.argv) >= 3 and sys.argv[1] in ('history', 'show'):
+        key = sys.argv[2]
+        kind = sys.argv[3] if len(sys.argv) > 3 else 'technique'
+        captures = archive.history(kind, key)
+        if not captures:
+            print(f"❌ No archived {kind} page for {key}")
+            sys.exit(1)
+        if sys.argv[1] == 'show':
+            print(read_page(captures[-1][4]))
+            return
+        print(f"📜 {kind} {key}: {len(captures)} captures")
+        for fetched_at, last_seen, size, digest, _ in captures:
+            print(f"  {datetime.fromtimestamp(fetched_at):%Y-%m-%d %H:%M}  last seen "
+                  f"{datetime.fromtimestamp(last_seen):%Y-%m-%d %H:%M}  {size / 1024:6.0f} KB  {digest[:12]}")
+        return
+
+    totals = archive.totals()
+    print(f"🗃️ Page archive in {archive.directory}")
+    for kind in PAGE_KINDS:
+        pages, captures, size = totals.get(kind, (0, 0, 0))
+        print(f"  {kind:<10} {pages:>5} pages  {captures:>6} captures  {size / 1024 / 1024:7.1f} MB compressed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Page Parse Pool for MitreShiled
+BeautifulSoup parsing is pure Python and holds the GIL, so technique pages
+parsed on the fetcher's threads never run in parallel with each other or
+with the matrix parser and record writer. The fetch stage hands each page
+to a process pool instead: its threads only wait on the result, and
+parsing scales across cores.
+
+Environment:
+  MITRE_PARSE_WORKERS   worker processes (default: one per CPU; 1 parses on the fetch threads)
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+PARSE_WORKERS = int(os.environ.get('MITRE_PARSE_WORKERS', os.cpu_count() or 1))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_parse_pool():
+    """The process-wide parse pool, created on first use (None when PARSE_WORKERS is 1)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None and PARSE_WORKERS > 1:
+            # Spawned rather than forked: the fetch and enrich threads are already running
+            _pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+
+def in_parse_pool(parse):
+    """Wrap a module-level page parser so each call runs in the parse pool (same signature and result)"""
+    def parse_in_pool(html_content):
+        pool = get_parse_pool()
+        if pool is None:
+            return parse(html_content)
+        return pool.submit(parse, html_content).result()
+    return parse_in_pool
+
+
+def disable_parse_pool():
+    """Parse on the calling threads (e.g. in `all` workers, which already run one process per platform)"""
+    global PARSE_WORKERS
+    PARSE_WORKERS = 1
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Adaptive Per-Host Rate Limiter for MitreShiled
+Replaces the fixed politeness sleeps with a token bucket per host whose
+rate follows AIMD: every fast, healthy response adds a little rate,
+throttling (429/503) or errors halve it, and a Retry-After header pauses
+the host for as long as the server asks. After repeated consecutive
+failures the host's circuit opens and requests fail fast until a
+cooldown has passed; one trial request then decides whether it closes.
+
+Every network request made through http_client passes through here, and
+holds a slot of the cross-process request budget while it is on the wire.
+
+Environment:
+  MITRE_RATE_LIMIT=off          disable pacing (local benchmarks)
+  MITRE_RATE_INITIAL / MITRE_RATE_MAX   requests per second per host (default 2 / 20)
+"""
+
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+
+from request_budget import request_slot
+
+LIMITER_ENABLED = os.environ.get('MITRE_RATE_LIMIT', 'on').lower() not in ('0', 'off', 'false', 'no')
+
+INITIAL_RATE = float(os.environ.get('MITRE_RATE_INITIAL', 2.0))
+MIN_RATE = 0.2
+MAX_RATE = float(os.environ.get('MITRE_RATE_MAX', 20.0))
+ADDITIVE_INCREASE = 0.25        # requests/sec gained per healthy response
+MULTIPLICATIVE_DECREASE = 0.5   # rate factor applied on throttling or errors
+BURST = 2                       # tokens a host may bank while idle
+SLOW_RESPONSE = 2.0             # seconds; slower responses do not raise the rate
+
+FAILURE_THRESHOLD = 5           # consecutive failures that open the circuit
+CIRCUIT_COOLDOWN = 30.0         # seconds the circuit stays open
+MAX_RETRY_AFTER = 300.0         # cap on a server-requested pause
+
+THROTTLE_STATUS_CODES = {429, 503}
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of sending a request while a host's circuit is open"""
+
+
+def parse_retry_after(response):
+    """Seconds requested by a Retry-After header (delta-seconds or HTTP date), or None"""
+    value = response.headers.get('Retry-After', '') if response is not None else ''
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return min(float(value), MAX_RETRY_AFTER)
+    try:
+        return min(max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0), MAX_RETRY_AFTER)
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateLimiter:
+    """AIMD token bucket with a circuit breaker for a single host"""
+
+    def __init__(self, host, rate=INITIAL_RATE, min_rate=MIN_RATE, max_rate=MAX_RATE):
+        self.host = host
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.stats = {'requests': 0, 'throttled': 0, 'failures': 0, 'circuit_opened': 0, 'waited': 0.0,
+                      'peak_rate': rate}
+        self._lock = threading.Lock()
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._consecutive_failures = 0
+        self._circuit_open_until = 0.0
+        self._trial_in_flight = False
+
+    def _refill(self, now):
+        self._tokens = min(BURST, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self):
+        """Take a token and return how long the caller must wait before sending (raises if the circuit is open)"""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._circuit_open_until:
+                raise CircuitOpenError(f"Circuit open for {self.host} "
+                                       f"({self._circuit_open_until - now:.0f}s left after repeated failures)")
+            if self._circuit_open_until and self._consecutive_failures >= FAILURE_THRESHOLD:
+                # Half-open: let exactly one trial request through
+                if self._trial_in_flight:
+                    raise CircuitOpenError(f"Circuit half-open for {self.host}, trial request in flight")
+                self._trial_in_flight = True
+
+            self._refill(now)
+            self._tokens -= 1
+            wait = max(-self._tokens / self.rate, self._paused_until - now, 0.0)
+            self.stats['requests'] += 1
+            self.stats['waited'] += wait
+            return wait
+
+    def acquire(self):
+        """Block until this host may send another request"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def record(self, response=None, latency=0.0, error=None):
+        """Feed back the outcome of a request"""
+        with self._lock:
+            self._trial_in_flight = False
+            status = response.status_code if response is not None else None
+
+            if error is None and status not in THROTTLE_STATUS_CODES and (status is None or status < 500):
+                self._consecutive_failures = 0
+                self._circuit_open_until = 0.0
+                if latency < SLOW_RESPONSE:
+                    self.rate = min(self.max_rate, self.rate + ADDITIVE_INCREASE)
+                    self.stats['peak_rate'] = max(self.stats['peak_rate'], self.rate)
+                return
+
+            self.rate = max(self.min_rate, self.rate * MULTIPLICATIVE_DECREASE)
+            self._tokens = min(self._tokens, 0.0)
+            self._consecutive_failures += 1
+            if status in THROTTLE_STATUS_CODES:
+                self.stats['throttled'] += 1
+            else:
+                self.stats['failures'] += 1
+
+            retry_after = parse_retry_after(response)
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+            if self._consecutive_failures >= FAILURE_THRESHOLD:
+                self._circuit_open_until = time.monotonic() + CIRCUIT_COOLDOWN
+                self.stats['circuit_opened'] += 1
+                print(f"🔌 Circuit opened for {self.host} after {self._consecutive_failures} consecutive failures "
+                      f"(cooling down {CIRCUIT_COOLDOWN:.0f}s)")
+
+    def summary(self):
+        s = self.stats
+        return (f"🚦 {self.host}: {s['requests']} requests, rate {self.rate:.1f}/s (peak {s['peak_rate']:.1f}/s), "
+                f"{s['throttled']} throttled, {s['failures']} failures, {s['circuit_opened']} circuit opens, "
+                f"{s['waited']:.1f}s paced")
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_host_limiter(url):
+    """Return the limiter for url's host, creating it on first use"""
+    host = urlparse(url).netloc
+    with _limiters_lock:
+        if host not in _limiters:
+            _limiters[host] = AdaptiveRateLimiter(host)
+        return _limiters[host]
+
+
+def limited_call(url, send):
+    """Run send() under url's host limiter and feed the outcome back; returns send()'s response
+
+    The cross-process request budget slot is only taken once the limiter lets
+    the request go, so pacing waits never hold a slot other workers could use.
+    """
+    if not LIMITER_ENABLED:
+        with request_slot():
+            return send()
+    limiter = get_host_limiter(url)
+    limiter.acquire()
+    start = time.monotonic()
+    try:
+        with request_slot():
+            response = send()
+    except Exception as e:
+        limiter.record(latency=time.monotonic() - start, error=e)
+        raise
+    limiter.record(response, time.monotonic() - start)
+    return response
+
+
+def print_limiter_stats():
+    """Print per-host limiter counters if any request went through a limiter"""
+    for limiter in list(_limiters.values()):
+        print(limiter.summary())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Record Fingerprints for MitreShiled
+Every technique record gets a content hash over its semantic fields - all
+fields except the timestamps and the hash itself - so a re-sync can tell
+which records actually changed without comparing them field by field.
+A record whose hash matches the previous run keeps its previous
+last_updated, so timestamps only move when the content does.
+
+Next to each technique file, mitreshire_<platform>_manifest.json lists
+every record's key and hash (plus one hash over the whole file), so an
+importer can diff two manifests and upsert only the changed documents.
+"""
+
+import hashlib
+import json
+import os
+
+from mitreshire_output import find_output_file, iter_records, write_json_atomic
+from technique_record import json_default
+
+CONTENT_HASH_FIELD = 'content_hash'
+
+# Fields that change on every run without the technique changing
+VOLATILE_FIELDS = frozenset({'last_updated', CONTENT_HASH_FIELD})
+
+# Bump when content_hash or the manifest layout changes
+MANIFEST_VERSION = 1
+
+
+def content_hash(record):
+    """Stable SHA-256 of a record's semantic fields (key order and tuple/list differences do not matter)"""
+    fields = {key: value for key, value in record.items() if key not in VOLATILE_FIELDS}
+    canonical = json.dumps(fields, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=json_default)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def record_key(record, per_tactic_rows=False):
+    """Identity of a record across runs; per-tactic rows repeat a technique once per tactic"""
+    if per_tactic_rows:
+        return f"{record['technique_id']}@{record.get('tactic', '')}"
+    return record['technique_id']
+
+
+def has_per_tactic_rows(records):
+    """Whether a loaded technique file repeats technique IDs (one row per tactic)"""
+    seen = set()
+    for record in records:
+        if record['technique_id'] in seen:
+            return True
+        seen.add(record['technique_id'])
+    return False
+
+
+def manifest_filename(platform):
+    return f"mitreshire_{platform.lower()}_manifest.json"
+
+
+def load_manifest(platform):
+    """The platform's current manifest, or None"""
+    try:
+        with open(manifest_filename(platform), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get('version') == MANIFEST_VERSION else None
+
+
+def previous_fingerprints(platform, per_tactic_rows=False):
+    """{key: (content_hash, last_updated)} of the platform's current output
+
+    Read from its manifest, or - for files written before manifests
+    existed - by hashing the technique file itself.
+    """
+    manifest = load_manifest(platform)
+    if manifest is not None and manifest.get('per_tactic_rows') == per_tactic_rows:
+        return {key: (entry['content_hash'], entry.get('last_updated')) for key, entry in manifest['records'].items()}
+
+    filename = find_output_file(platform)
+    if filename is None:
+        return {}
+    try:
+        return {
+            record_key(record, per_tactic_rows): (record.get(CONTENT_HASH_FIELD) or content_hash(record),
+                                                  record.get('last_updated'))
+            for record in iter_records(filename)
+        }
+    except (OSError, ValueError, EOFError) as e:
+        print(f"⚠️ Could not read previous output {filename}: {e}")
+        return {}
+
+
+class RecordFingerprinter:
+    """Stamps records with their content hash as they are written and collects the file's manifest"""
+
+    def __init__(self, previous=None, per_tactic_rows=False):
+        self.previous = previous or {}
+        self.per_tactic_rows = per_tactic_rows
+        self.entries = {}
+        self.added = []
+        self.changed = []
+        self.unchanged = 0
+
+    def stamp(self, record):
+        """Set the record's content hash (keeping its previous last_updated if unchanged); returns the record"""
+        key = record_key(record, self.per_tactic_rows)
+        digest = content_hash(record)
+        record[CONTENT_HASH_FIELD] = digest
+        if key not in self.previous:
+            self.added.append(key)
+        elif self.previous[key][0] != digest:
+            self.changed.append(key)
+        else:
+            self.unchanged += 1
+            if self.previous[key][1]:
+                record['last_updated'] = self.previous[key][1]
+        self.entries[key] = {CONTENT_HASH_FIELD: digest, 'last_updated': record.get('last_updated')}
+        return record
+
+    def stamp_all(self, records):
+        for record in records:
+            yield self.stamp(record)
+
+    def removed(self):
+        return sorted(set(self.previous) - set(self.entries))
+
+    def manifest(self, platform, filename):
+        """Manifest of the records stamped so far; identical content gives a byte-identical manifest"""
+        file_hash = hashlib.sha256()
+        for key, entry in self.entries.items():
+            file_hash.update(f"{key}\0{entry[CONTENT_HASH_FIELD]}\n".encode('utf-8'))
+        return {
+            'version': MANIFEST_VERSION,
+            'platform': platform.lower(),
+            'file': os.path.basename(filename),
+            'per_tactic_rows': self.per_tactic_rows,
+            'record_count': len(self.entries),
+            'content_hash': file_hash.hexdigest(),
+            'records': self.entries,
+        }
+
+    def save_manifest(self, platform, filename):
+        write_json_atomic(manifest_filename(platform), self.manifest(platform, filename))
+
+    def summary(self):
+        return (f"🧾 Fingerprints: ➕ {len(self.added)}  ✏️ {len(self.changed)}  ➖ {len(self.removed())}  "
+                f"unchanged {self.unchanged}")
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Global Request Budget for MitreShiled
+Caps in-flight requests and request start spacing across every worker
+process of a parallel extraction, so fanning platforms out does not
+multiply the load placed on MITRE's servers
+"""
+
+import multiprocessing
+import time
+from contextlib import contextmanager
+
+
+class RequestBudget:
+    """Process-shared limit on concurrent network requests and their start rate"""
+
+    def __init__(self, max_in_flight=8, min_interval=0.1):
+        self.min_interval = min_interval
+        self._slots = multiprocessing.BoundedSemaphore(max_in_flight)
+        self._next_start = multiprocessing.Value('d', 0.0)
+
+    @contextmanager
+    def slot(self):
+        """Hold one request slot, waiting for the shared start spacing first"""
+        with self._slots:
+            with self._next_start.get_lock():
+                now = time.monotonic()
+                wait = self._next_start.value - now
+                self._next_start.value = max(now, self._next_start.value) + self.min_interval
+            if wait > 0:
+                time.sleep(wait)
+            yield
+
+
+_budget = None
+
+
+def set_request_budget(budget):
+    """Install the budget for this process (used as a process pool initializer)"""
+    global _budget
+    _budget = budget
+
+
+@contextmanager
+def request_slot():
+    """Hold a slot of the installed budget, or do nothing when no budget is installed"""
+    if _budget is None:
+        yield
+    else:
+        with _budget.slot():
+            yield
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Run Metrics and Profiling for MitreShiled
+Collects what a long --descriptions run spends its time on: wall and CPU
+time per phase (matrix fetch, parsing, description fetching, writing...),
+per-request latency percentiles and histogram, bytes downloaded, retry
+counts and, with --profile, tracemalloc peaks per phase.
+
+Collection is off unless a script calls enable_metrics() (the --profile and
+--metrics-out options); every hook is then a no-op. write_metrics() writes
+a JSON report plus a Prometheus textfile next to it (metrics.json ->
+metrics.prom), so a node_exporter textfile collector on the scheduler host
+can alert on regressions.
+"""
+
+import atexit
+import math
+import os
+import threading
+import time
+import tracemalloc
+from mitreshire_output import atomic_write, write_json_atomic
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list (0.0 when empty)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class RunMetrics:
+    """Thread-safe phase timers and request counters for one script run"""
+
+    def __init__(self, script, profile=False, labels=None):
+        self.script = script
+        self.profile = profile
+        self.labels = dict(labels or {})
+        self.started_at = time.time()
+        self.phases = {}
+        self.latencies = []
+        self.status_codes = {}
+        self.counters = {'requests': 0, 'bytes_downloaded': 0, 'retries': 0, 'request_errors': 0}
+        self.tracemalloc_peak = 0
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self._lock = threading.Lock()
+        self._memory_stack = []  # running tracemalloc peaks of the open main-thread phases
+        if profile and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def config(self):
+        """Arguments that recreate an empty collector in a worker process"""
+        return {'script': self.script, 'profile': self.profile, 'labels': self.labels}
+
+    def phase(self, name):
+        return Phase(self, name)
+
+    def _add_phase(self, name, wall, cpu, peak):
+        with self._lock:
+            stats = self.phases.setdefault(name, {'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0,
+                                                  'tracemalloc_peak_bytes': 0})
+            stats['calls'] += 1
+            stats['wall_seconds'] += wall
+            stats['cpu_seconds'] += cpu
+            stats['tracemalloc_peak_bytes'] = max(stats['tracemalloc_peak_bytes'], peak)
+
+    def _propagate_peak(self, peak):
+        self.tracemalloc_peak = max(self.tracemalloc_peak, peak)
+        self._memory_stack[:] = [max(running, peak) for running in self._memory_stack]
+
+    def record_request(self, latency, size, status):
+        """Count one network request (status is the HTTP code, or 'error' when it raised)"""
+        with self._lock:
+            self.counters['requests'] += 1
+            self.counters['bytes_downloaded'] += size
+            if status == 'error':
+                self.counters['request_errors'] += 1
+            self.status_codes[str(status)] = self.status_codes.get(str(status), 0) + 1
+            self.latencies.append(latency)
+
+    def record_retry(self):
+        with self._lock:
+            self.counters['retries'] += 1
+
+    def snapshot(self):
+        """Raw, picklable state for merging a worker process's metrics into the parent's"""
+        with self._lock:
+            if tracemalloc.is_tracing():
+                self.tracemalloc_peak = max(self.tracemalloc_peak, tracemalloc.get_traced_memory()[1])
+            return {
+                'phases': {name: dict(stats) for name, stats in self.phases.items()},
+                'latencies': list(self.latencies),
+                'status_codes': dict(self.status_codes),
+                'counters': dict(self.counters),
+                'tracemalloc_peak': self.tracemalloc_peak,
+                'cpu_seconds': time.process_time() - self._cpu_start
+            }
+
+    def merge(self, snapshot):
+        """Add a worker's snapshot(); worker CPU time is reported under the phase 'worker_processes'"""
+        with self._lock:
+            for name, other in snapshot['phases'].items():
+                stats = self.phases.setdefault(name, {'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0,
+                                                      'tracemalloc_peak_bytes': 0})
+                stats['calls'] += other['calls']
+                stats['wall_seconds'] += other['wall_seconds']
+                stats['cpu_seconds'] += other['cpu_seconds']
+                stats['tracemalloc_peak_bytes'] = max(stats['tracemalloc_peak_bytes'], other['tracemalloc_peak_bytes'])
+            self.latencies.extend(snapshot['latencies'])
+            for status, count in snapshot['status_codes'].items():
+                self.status_codes[status] = self.status_codes.get(status, 0) + count
+            for name, value in snapshot['counters'].items():
+                self.counters[name] += value
+            self.tracemalloc_peak = max(self.tracemalloc_peak, snapshot['tracemalloc_peak'])
+            workers = self.phases.setdefault('worker_processes', {'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0,
+                                                                  'tracemalloc_peak_bytes': 0})
+            workers['calls'] += 1
+            workers['cpu_seconds'] += snapshot['cpu_seconds']
+
+    def report(self):
+        """JSON-ready summary of the run so far"""
+        snapshot = self.snapshot()
+        latencies = sorted(snapshot['latencies'])
+        return {
+            'script': self.script,
+            'labels': self.labels,
+            'started_at': self.started_at,
+            'wall_seconds': time.perf_counter() - self._wall_start,
+            'cpu_seconds': snapshot['cpu_seconds'],
+            'phases': snapshot['phases'],
+            'requests': {
+                **snapshot['counters'],
+                'status_codes': snapshot['status_codes'],
+                'latency_seconds': {
+                    **{f"p{pct}": percentile(latencies, pct) for pct in PERCENTILES},
+                    'mean': sum(latencies) / len(latencies) if latencies else 0.0,
+                    'max': latencies[-1] if latencies else 0.0,
+                    'sum': sum(latencies)
+                },
+                'latency_histogram': {
+                    **{str(bound): sum(1 for latency in latencies if latency <= bound) for bound in LATENCY_BUCKETS},
+                    '+Inf': len(latencies)
+                }
+            },
+            'tracemalloc_peak_bytes': snapshot['tracemalloc_peak'] if self.profile else None
+        }
+
+    def prometheus(self, report=None):
+        """Render the report in the Prometheus text exposition format"""
+        report = report or self.report()
+        base_labels = {'script': self.script, **self.labels}
+
+        def labels(**extra):
+            merged = {**base_labels, **extra}
+            return '{' + ','.join(f'{key}="{value}"' for key, value in merged.items()) + '}'
+
+        lines = []
+
+        def metric(name, metric_type, help_text, samples):
+            lines.append(f"# HELP mitreshire_{name} {help_text}")
+            lines.append(f"# TYPE mitreshire_{name} {metric_type}")
+            for suffix, sample_labels, value in samples:
+                lines.append(f"mitreshire_{name}{suffix}{sample_labels} {value}")
+
+        phases = report['phases']
+        metric('run_wall_seconds', 'gauge', 'Wall-clock duration of the run', [('', labels(), report['wall_seconds'])])
+        metric('run_cpu_seconds', 'gauge', 'CPU time of the run', [('', labels(), report['cpu_seconds'])])
+        metric('run_started_timestamp_seconds', 'gauge', 'Unix time the run started',
+               [('', labels(), report['started_at'])])
+        metric('phase_wall_seconds', 'gauge', 'Wall-clock seconds spent per phase',
+               [('', labels(phase=name), stats['wall_seconds']) for name, stats in phases.items()])
+        metric('phase_cpu_seconds', 'gauge', 'Thread CPU seconds spent per phase',
+               [('', labels(phase=name), stats['cpu_seconds']) for name, stats in phases.items()])
+        metric('phase_calls', 'gauge', 'Times each phase ran',
+               [('', labels(phase=name), stats['calls']) for name, stats in phases.items()])
+
+        requests = report['requests']
+        metric('http_requests_total', 'counter', 'Network requests by HTTP status',
+               [('', labels(status=status), count) for status, count in requests['status_codes'].items()])
+        metric('http_response_bytes_total', 'counter', 'Response bytes downloaded',
+               [('', labels(), requests['bytes_downloaded'])])
+        metric('http_retries_total', 'counter', 'Request retries', [('', labels(), requests['retries'])])
+        metric('http_request_duration_seconds', 'histogram', 'Network request latency',
+               [('_bucket', labels(le=bound), count) for bound, count in requests['latency_histogram'].items()]
+               + [('_sum', labels(), requests['latency_seconds']['sum']),
+                  ('_count', labels(), requests['latency_histogram']['+Inf'])])
+        metric('http_request_duration_quantile_seconds', 'gauge', 'Network request latency percentiles',
+               [('', labels(quantile=pct / 100), requests['latency_seconds'][f"p{pct}"]) for pct in PERCENTILES])
+
+        if report['tracemalloc_peak_bytes'] is not None:
+            metric('tracemalloc_peak_bytes', 'gauge', 'Peak traced Python memory',
+                   [('', labels(), report['tracemalloc_peak_bytes'])])
+            metric('phase_tracemalloc_peak_bytes', 'gauge', 'Peak traced Python memory per phase',
+                   [('', labels(phase=name), stats['tracemalloc_peak_bytes']) for name, stats in phases.items()
+                    if stats['tracemalloc_peak_bytes']])
+        return '\n'.join(lines) + '\n'
+
+    def print_report(self, report=None):
+        report = report or self.report()
+        print("\n" + "=" * 70)
+        print(f"⏱️ PROFILE: {self.script} ({report['wall_seconds']:.1f}s wall, {report['cpu_seconds']:.1f}s CPU)")
+        print("=" * 70)
+        print(f"{'phase':<24}{'calls':>8}{'wall':>10}{'cpu':>10}{'peak mem':>12}")
+        for name, stats in sorted(report['phases'].items(), key=lambda item: -item[1]['wall_seconds']):
+            peak = f"{stats['tracemalloc_peak_bytes'] / 1024 / 1024:.1f}MB" if stats['tracemalloc_peak_bytes'] else '-'
+            print(f"{name:<24}{stats['calls']:>8}{stats['wall_seconds']:>9.2f}s{stats['cpu_seconds']:>9.2f}s{peak:>12}")
+        requests = report['requests']
+        latency = requests['latency_seconds']
+        print("-" * 70)
+        print(f"🌐 {requests['requests']} requests, {requests['bytes_downloaded'] / 1024 / 1024:.1f}MB downloaded, "
+              f"{requests['retries']} retries, {requests['request_errors']} errors")
+        print(f"📈 Latency p50 {latency['p50'] * 1000:.0f}ms  p95 {latency['p95'] * 1000:.0f}ms  "
+              f"p99 {latency['p99'] * 1000:.0f}ms  (network wait {latency['sum']:.1f}s)")
+        if report['tracemalloc_peak_bytes'] is not None:
+            print(f"🧠 tracemalloc peak {report['tracemalloc_peak_bytes'] / 1024 / 1024:.1f}MB")
+        print("=" * 70)
+
+
+class Phase:
+    """Times one run of a phase; use as a context manager, or start()/stop() around code that can't be indented
+
+    Phases may nest and repeat (times add up, so a phase run concurrently
+    on several threads can exceed the run's wall time). CPU time is that of
+    the thread running the phase; a phase that only waits shows almost
+    none. tracemalloc peaks are tracked for phases entered on the main thread.
+    """
+
+    def __init__(self, metrics, name):
+        self._metrics = metrics
+        self.name = name
+        self._track_memory = False
+
+    def start(self):
+        metrics = self._metrics
+        self._track_memory = tracemalloc.is_tracing() and threading.current_thread() is threading.main_thread()
+        if self._track_memory:
+            metrics._propagate_peak(tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            metrics._memory_stack.append(0)
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+        return self
+
+    def stop(self):
+        wall = time.perf_counter() - self._wall_start
+        cpu = time.thread_time() - self._cpu_start
+        peak = 0
+        if self._track_memory:
+            peak = max(self._metrics._memory_stack.pop(), tracemalloc.get_traced_memory()[1])
+            self._metrics._propagate_peak(peak)
+        self._metrics._add_phase(self.name, wall, cpu, peak)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+class _NoPhase:
+    """Stand-in returned by phase() while metrics are off"""
+
+    def start(self):
+        return self
+
+    def stop(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+_NO_PHASE = _NoPhase()
+_metrics = None
+
+
+def enable_metrics(script, profile=False, labels=None):
+    """Start collecting for this process; returns the collector"""
+    global _metrics
+    _metrics = RunMetrics(script, profile, labels)
+    return _metrics
+
+
+def get_metrics():
+    """The active collector, or None when metrics are off"""
+    return _metrics
+
+
+def phase(name):
+    """A Phase timer for name (does nothing when metrics are off)"""
+    return _metrics.phase(name) if _metrics is not None else _NO_PHASE
+
+
+def timed(name, func):
+    """Wrap func so every call is timed as phase name"""
+    def wrapper(*args, **kwargs):
+        with phase(name):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def record_request(latency, size, status):
+    if _metrics is not None:
+        _metrics.record_request(latency, size, status)
+
+
+def record_retry():
+    if _metrics is not None:
+        _metrics.record_retry()
+
+
+def metrics_filenames(path):
+    """metrics.json -> (metrics.json, metrics.prom); other names get .prom appended"""
+    base = path[:-len('.json')] if path.endswith('.json') else path
+    return path, base + '.prom'
+
+
+def write_metrics(path, report=None):
+    """Atomically write the JSON report and the Prometheus textfile for the active collector"""
+    report = report or _metrics.report()
+    json_path, prom_path = metrics_filenames(path)
+    write_json_atomic(json_path, report)
+    with atomic_write(prom_path) as f:
+        f.write(_metrics.prometheus(report))
+    print(f"📊 Metrics written to {json_path} and {prom_path}")
+
+
+def finish_metrics(metrics_out=None):
+    """Print the profile (with --profile) and write metrics_out, if metrics are on"""
+    if _metrics is None:
+        return
+    report = _metrics.report()
+    if _metrics.profile:
+        _metrics.print_report(report)
+    if metrics_out:
+        directory = os.path.dirname(os.path.abspath(metrics_out))
+        os.makedirs(directory, exist_ok=True)
+        write_metrics(metrics_out, report)
+
+
+def report_metrics_at_exit(metrics_out=None):
+    """Run finish_metrics when the script exits, including early sys.exit(1) failures"""
+    atexit.register(finish_metrics, metrics_out)
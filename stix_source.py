@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+STIX Bundle Source for MitreShiled
+Reads techniques and tactics from a local ATT&CK STIX bundle (e.g.
+enterprise-attack.json from github.com/mitre/cti, the file the Node
+githubMitreService downloads) instead of scraping attack.mitre.org.
+The bundle's objects array is streamed one object at a time and reduced
+to the few fields the extractor needs, so the full object tree is never
+held in memory. Bundles ending in .gz or .zst are decompressed on the fly.
+"""
+
+import re
+
+from mitreshire_output import iter_json_member_array, open_input
+
+# Extractor platform → x_mitre_platforms values that place a technique on that matrix
+# (older bundle releases used the names on the right of each set)
+STIX_PLATFORMS = {
+    "windows": {"Windows"},
+    "macos": {"macOS"},
+    "linux": {"Linux"},
+    "cloud": {"IaaS", "SaaS", "Office Suite", "Identity Provider", "Office 365", "Azure AD", "Google Workspace"},
+    "containers": {"Containers"},
+    "officesuite": {"Office Suite", "Office 365"},
+    "identity_provider": {"Identity Provider", "Azure AD", "Google Workspace"},
+    "saas": {"SaaS"},
+    "iaas": {"IaaS", "AWS", "Azure", "GCP"},
+    "network_devices": {"Network Devices", "Network"},
+}
+
+ATTACK_KILL_CHAIN = 'mitre-attack'
+
+
+def clean_stix_description(description):
+    """Turn STIX markdown into the plain text the website shows (no citations, links or tags)"""
+    if not description:
+        return ""
+    description = re.sub(r'\(Citation:[^)]+\)', '', description)
+    description = re.sub(r'\[([^\]]+)\]\([^)]*\)', r'\1', description)
+    description = re.sub(r'<[^>]+>', '', description)
+    return re.sub(r'\s+', ' ', description).strip()
+
+
+def _attack_id(stix_object):
+    for reference in stix_object.get('external_references', []):
+        if reference.get('source_name') == ATTACK_KILL_CHAIN:
+            return reference.get('external_id')
+    return None
+
+
+def read_attack_bundle(path):
+    """Stream a STIX bundle and return its techniques and tactics in a compact form
+
+    Returns {'techniques': [...], 'tactics': [...], 'objects': N}. Tactics are
+    in matrix order. Revoked and deprecated objects are skipped.
+    """
+    techniques = []
+    tactics_by_ref = {}
+    matrix_tactic_refs = []
+    object_count = 0
+
+    with open_input(path) as f:
+        for stix_object in iter_json_member_array(f, 'objects'):
+            object_count += 1
+            object_type = stix_object.get('type')
+            if stix_object.get('revoked') or stix_object.get('x_mitre_deprecated'):
+                continue
+
+            if object_type == 'attack-pattern':
+                technique_id = _attack_id(stix_object)
+                if not technique_id:
+                    continue
+                techniques.append({
+                    'technique_id': technique_id,
+                    'name': stix_object.get('name', ''),
+                    'description': clean_stix_description(stix_object.get('description', '')),
+                    'is_subtechnique': bool(stix_object.get('x_mitre_is_subtechnique')) or '.' in technique_id,
+                    'phases': [phase['phase_name'] for phase in stix_object.get('kill_chain_phases', [])
+                               if phase.get('kill_chain_name') == ATTACK_KILL_CHAIN],
+                    'platforms': stix_object.get('x_mitre_platforms', []),
+                    'data_sources': stix_object.get('x_mitre_data_sources', []),
+                    'version': stix_object.get('x_mitre_version', '1.0')
+                })
+            elif object_type == 'x-mitre-tactic':
+                tactics_by_ref[stix_object['id']] = {
+                    'id': _attack_id(stix_object) or '',
+                    'shortname': stix_object.get('x_mitre_shortname', ''),
+                    'name': stix_object.get('name', '')
+                }
+            elif object_type == 'x-mitre-matrix' and not matrix_tactic_refs:
+                matrix_tactic_refs = stix_object.get('tactic_refs', [])
+
+    # Matrix order first, then any tactic the matrix object does not list
+    ordered_refs = [ref for ref in matrix_tactic_refs if ref in tactics_by_ref]
+    ordered_refs += [ref for ref in tactics_by_ref if ref not in ordered_refs]
+    return {
+        'techniques': techniques,
+        'tactics': [tactics_by_ref[ref] for ref in ordered_refs],
+        'objects': object_count
+    }
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Incremental Extraction Support for MitreShiled
+Diffs a freshly parsed matrix against the previous mitreshire_<platform>_techniques.json
+so descriptions (and the other technique page fields) can be carried over
+for unchanged techniques and only new or renamed techniques need their
+pages fetched
+"""
+
+from datetime import datetime
+
+from mitreshire_output import find_output_file, iter_records, write_json_atomic
+from technique_page import page_details
+
+
+def changes_filename(platform):
+    return f"mitreshire_{platform.lower()}_changes.json"
+
+
+def load_previous_techniques(platform):
+    """Load the previous technique records for a platform (any output format), or None if there is no usable file"""
+    filename = find_output_file(platform)
+    if filename is None:
+        return None
+    try:
+        return list(iter_records(filename))
+    except (OSError, ValueError, EOFError) as e:
+        print(f"⚠️ Could not read previous output {filename}: {e}")
+        return None
+
+
+def index_techniques(techniques):
+    """Collapse per-tactic rows into one comparable entry per technique_id"""
+    index = {}
+    for technique in techniques:
+        entry = index.setdefault(technique['technique_id'], {
+            'name': technique['name'],
+            'tactics': set(),
+            'subtechniques': set(),
+            'description': '',
+            'details': {}
+        })
+        entry['tactics'].update(technique.get('tactics') or [technique.get('tactic')])
+        entry['subtechniques'].update(sub['id'] for sub in technique.get('subtechniques', []))
+        if technique.get('description') and not entry['description']:
+            entry['description'] = technique['description']
+            entry['details'] = page_details(technique)
+    return index
+
+
+def diff_techniques(previous_index, current_index):
+    """Compare two technique indexes; returns added/removed IDs and {id: [changed fields]}"""
+    added = sorted(set(current_index) - set(previous_index))
+    removed = sorted(set(previous_index) - set(current_index))
+    changed = {}
+    for tech_id in sorted(set(current_index) & set(previous_index)):
+        old, new = previous_index[tech_id], current_index[tech_id]
+        fields = [field for field in ('name', 'tactics', 'subtechniques') if old[field] != new[field]]
+        if fields:
+            changed[tech_id] = fields
+    return {'added': added, 'removed': removed, 'changed': changed}
+
+
+def plan_description_fetches(previous_index, current_index, delta):
+    """Split current techniques into carried-over descriptions and IDs that must be fetched
+
+    Added and renamed techniques are fetched; so are techniques whose previous
+    description is empty, so earlier failures are retried on the next run.
+    Returns (carried, to_fetch, renamed); renamed IDs must bypass stored descriptions.
+    The page details of carried techniques stay in previous_index[id]['details'].
+    """
+    carried = {}
+    to_fetch = set(delta['added'])
+    renamed = {tech_id for tech_id, fields in delta['changed'].items() if 'name' in fields}
+    for tech_id in current_index:
+        if tech_id in to_fetch:
+            continue
+        if tech_id in renamed or not previous_index[tech_id]['description']:
+            to_fetch.add(tech_id)
+        else:
+            carried[tech_id] = previous_index[tech_id]['description']
+    return carried, to_fetch, renamed
+
+
+def build_change_manifest(platform, delta, carried, to_fetch):
+    """Assemble the change manifest written next to the technique file"""
+    return {
+        'platform': platform,
+        'extraction_date': datetime.now().isoformat(),
+        'summary': {
+            'added': len(delta['added']),
+            'removed': len(delta['removed']),
+            'changed': len(delta['changed']),
+            'descriptions_carried_over': len(carried),
+            'descriptions_fetched': len(to_fetch)
+        },
+        'added': delta['added'],
+        'removed': delta['removed'],
+        'changed': [{'technique_id': tech_id, 'fields': fields} for tech_id, fields in delta['changed'].items()]
+    }
+
+
+def save_change_manifest(platform, manifest):
+    filename = changes_filename(platform)
+    write_json_atomic(filename, manifest)
+    print(f"  📄 Change manifest: {filename}")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Technique Record Merging for MitreShiled
+The matrix lists a technique once under every tactic it belongs to, so a
+per-tactic parse yields one full document (description included) per
+tactic. merge_technique_records collapses those rows into one document per
+technique_id carrying the complete tactics array.
+"""
+
+
+def is_placeholder_name(name):
+    """Parents first seen through a sub-technique get a 'Parent of T....' name until their own link is parsed"""
+    return name.startswith("Parent of")
+
+
+def merge_technique_records(rows):
+    """Collapse per-tactic technique rows into one record per technique_id
+
+    Records keep the order in which each technique_id first appears. The
+    primary 'tactic' stays the first tactic seen; 'tactics' lists every tactic
+    in matrix order. Parent 'subtechniques' lists are merged through an ID
+    index, and sub-techniques pick up the final parent name.
+    """
+    merged = {}
+    subtechnique_index = {}  # parent_id -> set of sub-technique IDs already listed
+
+    for row in rows:
+        tech_id = row['technique_id']
+        record = merged.get(tech_id)
+        if record is None:
+            record = row.copy()
+            record['tactics'] = list(row['tactics'])
+            if 'subtechniques' in row:
+                record['subtechniques'] = list(row['subtechniques'])
+                subtechnique_index[tech_id] = {sub['id'] for sub in row['subtechniques']}
+            merged[tech_id] = record
+            continue
+
+        for tactic in row['tactics']:
+            if tactic not in record['tactics']:
+                record['tactics'].append(tactic)
+        if is_placeholder_name(record['name']) and not is_placeholder_name(row['name']):
+            record['name'] = row['name']
+        if not record['description'] and row['description']:
+            record['description'] = row['description']
+        if 'subtechniques' in row:
+            seen = subtechnique_index.setdefault(tech_id, set())
+            for sub in row['subtechniques']:
+                if sub['id'] not in seen:
+                    seen.add(sub['id'])
+                    record.setdefault('subtechniques', []).append(sub)
+
+    for record in merged.values():
+        parent = merged.get(record['parent_technique_id']) if record['is_subtechnique'] else None
+        if parent is not None:
+            record['parent_technique'] = parent['name']
+
+    return list(merged.values())
+
+
+def merge_tactic_techniques(tactics_data, merged_records):
+    """Point each tactic's technique list at the merged records so no document is duplicated"""
+    by_id = {record['technique_id']: record for record in merged_records}
+    for tactic in tactics_data:
+        tactic['techniques'] = [by_id[t['technique_id']] for t in tactic['techniques']]
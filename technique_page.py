@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Technique Page Sections for MitreShiled
+A technique page carries much more than the description: the info card
+(platforms, version), the procedure examples, the mitigations and the
+detection table (data sources and data components). All of them are read
+from the same partial parse that finds the description, so a field added
+here is filled on the next run - or from the page archive with
+`mitre_data_extractor.py reextract` - without another crawl.
+
+Usage: python3 technique_page.py <page.html>   (print what a saved page yields)
+"""
+
+import json
+import re
+import sys
+
+from html_backend import parse_sections
+
+# The divs a technique page keeps its sections in
+PAGE_SECTIONS = ('description-body', 'card', 'tables-mobile')
+
+# Record fields filled from a technique page besides the description
+PAGE_FIELDS = ('data_sources', 'detection', 'mitigations', 'procedure_examples', 'mitre_platforms', 'mitre_version')
+
+_CARD_LABEL = re.compile(r'^(?:ⓘ\s*)?([A-Za-z][A-Za-z -]*?)\s*:\s*(.*)$')
+_REFERENCE_MARKER = re.compile(r'\[\d+\]')
+
+# Every section comes before the references list; the list, search overlay and footer after it are not parsed
+_REFERENCES_HEADING = 'id="references"'
+
+
+def parse_page_sections(html_content, backend=None):
+    """One partial parse holding the description, the info card and the section tables"""
+    end = html_content.find(_REFERENCES_HEADING)
+    if end != -1:
+        html_content = html_content[:html_content.rfind('<', 0, end)]
+    return parse_sections(html_content, 'div', PAGE_SECTIONS, backend)
+
+
+def _text(element):
+    """Cell text with reference markers like [1] removed and whitespace normalized"""
+    text = element.get_text()
+    if '[' in text:
+        text = _REFERENCE_MARKER.sub('', text)
+    return ' '.join(text.split())
+
+
+def _card_fields(sections):
+    """{label: value} from the info card ('Platforms', 'Version', ...)"""
+    fields = {}
+    for card_data in sections.find_all('div', class_='card-data'):
+        match = _CARD_LABEL.match(' '.join(card_data.get_text(' ', strip=True).split()))
+        if match:
+            fields.setdefault(match.group(1), match.group(2))
+    return fields
+
+
+def _table_kind(table):
+    """Which section a table holds, from its header cells alone ('detection', 'mitigations', ... or None)"""
+    headers = [th.get_text(strip=True) for th in table.find_all('th')]
+    if 'Data Component' in headers:
+        return 'detection'
+    if headers[:2] == ['ID', 'Mitigation']:
+        return 'mitigations'
+    if headers[:3] == ['ID', 'Name', 'Description']:
+        return 'procedure_examples'
+    return None
+
+
+def _table_rows(table):
+    """[cell texts] of every body row of a section table"""
+    rows = []
+    for tr in table.find_all('tr'):
+        cells = tr.find_all('td', recursive=False)
+        if cells:
+            rows.append([_text(cell) for cell in cells])
+    return rows
+
+
+def _id_name_description(rows):
+    return [{'id': row[0], 'name': row[1], 'description': row[2]} for row in rows if len(row) >= 3 and row[0]]
+
+
+def _detection(rows):
+    """Data sources ('Data Source: Data Component', as in STIX) and the detection text of each component"""
+    data_sources, detection = [], []
+    source = ''
+    for row in rows:
+        if len(row) < 4:
+            continue
+        # Further components of the same data source leave the ID and source cells empty
+        source = row[1] or source
+        component = f"{source}: {row[2]}" if source else row[2]
+        if component not in data_sources:
+            data_sources.append(component)
+        if row[3]:
+            detection.append(f"{component} - {row[3]}")
+    return data_sources, '\n'.join(detection)
+
+
+def extract_page_details(sections):
+    """Structured fields of a parsed technique page; sections that are missing are left out"""
+    details = {}
+    card = _card_fields(sections)
+    if card.get('Platforms'):
+        details['mitre_platforms'] = [p.strip() for p in card['Platforms'].split(',') if p.strip()]
+    if card.get('Version'):
+        details['mitre_version'] = card['Version']
+
+    # Tables are told apart by their headers; only the rows of the wanted ones are read
+    for table in sections.find_all('table'):
+        kind = _table_kind(table)
+        if kind == 'detection':
+            data_sources, detection = _detection(_table_rows(table))
+            if data_sources:
+                details['data_sources'] = data_sources
+            if detection:
+                details['detection'] = detection
+        elif kind is not None:
+            details[kind] = _id_name_description(_table_rows(table))
+    return details
+
+
+def page_details(record):
+    """The page fields a record already carries (e.g. from the previous run's output)"""
+    return {field: record[field] for field in PAGE_FIELDS if record.get(field)}
+
+
+def apply_page_details(record, details, interner):
+    """Fill a technique record with page fields, sharing repeated strings through interner"""
+    for field, value in details.items():
+        if field in ('mitigations', 'procedure_examples'):
+            value = [{key: interner.value(item) for key, item in entry.items()} for entry in value]
+        else:
+            value = interner.value(value)
+        record[field] = value
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python3 technique_page.py <page.html>")
+        sys.exit(1)
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        details = extract_page_details(parse_page_sections(f.read()))
+    print(json.dumps(details, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
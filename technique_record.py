@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Compact Technique Records for MitreShiled
+A technique document used to be a fresh dict of ~15 keys with its own copy
+of the platform list, its own timestamp string and its own copies of
+repeated literals. TechniqueRecord stores the same fields in __slots__,
+and a RecordInterner shares every repeated value (platform lists, tactic
+names, sync sources, versions, the extraction timestamp and - across
+platforms - identical names and descriptions) between the records of one
+run. Records behave like dicts (record['name'], .get, 'subtechniques' in
+record, dict(record)) and serialize to the existing JSON schema.
+"""
+
+from collections.abc import MutableMapping
+from datetime import datetime
+
+# Schema fields in output order; anything else a file carries is kept per record
+RECORD_FIELDS = (
+    'technique_id', 'name', 'description', 'tactic', 'tactics', 'platforms', 'mitre_platforms', 'data_sources',
+    'detection', 'mitigations', 'procedure_examples', 'is_subtechnique', 'parent_technique', 'parent_technique_id',
+    'mitre_version', 'sync_source', 'last_updated', 'subtechniques'
+)
+_FIELD_SET = frozenset(RECORD_FIELDS)
+
+
+class TechniqueRecord(MutableMapping):
+    """One technique document; a schema field that was never set is simply absent (e.g. a sub-technique's 'subtechniques')"""
+
+    __slots__ = RECORD_FIELDS + ('_extra',)
+
+    def __init__(self, fields=(), **kwargs):
+        self._extra = None
+        self.update(fields, **kwargs)
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        elif self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in _FIELD_SET:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in _FIELD_SET:
+            try:
+                delattr(self, key)
+                return
+            except AttributeError:
+                pass
+        elif self._extra and key in self._extra:
+            del self._extra[key]
+            return
+        raise KeyError(key)
+
+    def __iter__(self):
+        for field in RECORD_FIELDS:
+            if hasattr(self, field):
+                yield field
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"TechniqueRecord({self.to_dict()!r})"
+
+    def copy(self):
+        """Shallow copy, like dict.copy (list values are shared until replaced)"""
+        return TechniqueRecord(self)
+
+    def to_dict(self):
+        """Plain dict in schema order, as written to the technique files"""
+        return {key: self[key] for key in self}
+
+
+class RecordInterner:
+    """Hands out shared instances of the values repeated across one extraction's records
+
+    One interner (and so one timestamp) covers a whole run; building every
+    platform's records through the same interner also shares names and
+    descriptions between platforms.
+    """
+
+    def __init__(self, timestamp=None):
+        self.timestamp = timestamp or datetime.now().isoformat()
+        self._values = {}
+
+    def value(self, value):
+        """Return the shared instance of a string (or tuple of strings) equal to value"""
+        if value is None:
+            return None
+        if isinstance(value, list):
+            value = tuple(value)
+        return self._values.setdefault(value, value)
+
+    def strings(self, values):
+        """A fresh list whose items are shared strings (for fields that get appended to, like 'tactics')"""
+        return [self.value(value) for value in values]
+
+    def subtechniques(self, subtechniques):
+        return [{'id': self.value(sub['id']), 'name': self.value(sub['name'])} for sub in subtechniques]
+
+    def record(self, fields):
+        """Build a TechniqueRecord from a dict (a parsed document or a loaded JSON record)"""
+        record = TechniqueRecord()
+        for key, value in fields.items():
+            if key == 'tactics':
+                value = self.strings(value)
+            elif key == 'subtechniques':
+                value = self.subtechniques(value)
+            elif isinstance(value, str) or (isinstance(value, list) and all(isinstance(item, str) for item in value)):
+                # Strings and never-mutated string lists (platforms, data_sources) are shared outright
+                value = self.value(value)
+            record[key] = value
+        return record
+
+    def new_record(self, technique_id, name, tactic, platforms, sync_source, is_subtechnique=False,
+                   parent_technique='', parent_technique_id='', description='', mitre_version='1.0'):
+        """A freshly parsed technique document stamped with the run's shared timestamp"""
+        record = TechniqueRecord(
+            technique_id=self.value(technique_id),
+            name=self.value(name),
+            description=self.value(description),
+            tactic=self.value(tactic),
+            tactics=[self.value(tactic)],
+            platforms=self.value(platforms),
+            data_sources=(),
+            is_subtechnique=is_subtechnique,
+            parent_technique=self.value(parent_technique),
+            parent_technique_id=self.value(parent_technique_id),
+            mitre_version=self.value(mitre_version),
+            sync_source=self.value(sync_source),
+            last_updated=self.timestamp
+        )
+        if not is_subtechnique:
+            record['subtechniques'] = []
+        return record
+
+    def __len__(self):
+        return len(self._values)
+
+
+def json_default(value):
+    """json.dump default= hook: serialize records in the existing schema"""
+    if isinstance(value, TechniqueRecord):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -3,9 +3,10 @@
 Test script to debug MITRE technique description fetching
 """
 
-import requests
 from bs4 import BeautifulSoup
 import re
+from http_cache import print_cache_stats
+from http_client import pooled_get
 
 def test_fetch_description(technique_id):
     """Test fetching description for a specific technique"""
@@ -21,12 +22,8 @@ def test_fetch_description(technique_id):
     
     print(f"🌐 URL: {url}")
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        response = pooled_get(url)
         response.raise_for_status()
         
         print(f"✅ HTTP {response.status_code}")
@@ -82,4 +79,6 @@ if __name__ == "__main__":
     
     for tech_id in test_techniques:
         print("\n" + "="*60)
-        test_fetch_description(tech_id) 
\ No newline at end of file
+        test_fetch_description(tech_id)
+    
+    print_cache_stats()
\ No newline at end of file